@@ -0,0 +1,401 @@
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlencode
+from curl_cffi import CurlInfo
+from curl_cffi.requests import Headers, exceptions
+from core.session_state import PersistentSession
+
+# Record/replay of HTTP traffic for offline runs and reproducible benchmarks.
+# Each cassette lives in data/cassettes/<name>/: index.json maps "METHOD url" to
+# the responses recorded for it (status, headers, curl timings), and bodies are
+# stored gzipped under bodies/<sha256>.gz. Replayed responses go through the
+# same code paths as live ones: they support raise_for_status, json, content,
+# aiter_content and response.curl.getinfo.
+project_dir = Path(__file__).resolve().parent.parent
+cassettes_dir = project_dir / "data" / "cassettes"
+
+# AI_NEWS_CASSETTE=record|replay, or --record / --replay on the command line
+CASSETTE_ENV_VAR = "AI_NEWS_CASSETTE"
+# Replayed responses wait this multiple of their recorded time (0 = no delay), or --latency=<factor>
+LATENCY_ENV_VAR = "AI_NEWS_REPLAY_LATENCY"
+
+RECORD = "record"
+REPLAY = "replay"
+
+# curl counters stored with every response and served back by the replay handle
+RECORDED_INFOS = [
+    CurlInfo.NAMELOOKUP_TIME,
+    CurlInfo.CONNECT_TIME,
+    CurlInfo.APPCONNECT_TIME,
+    CurlInfo.STARTTRANSFER_TIME,
+    CurlInfo.TOTAL_TIME,
+    CurlInfo.SIZE_DOWNLOAD_T,
+    CurlInfo.HEADER_SIZE,
+]
+
+REPLAY_CHUNK_SIZE = 64 * 1024
+
+_cassettes = {}
+
+
+def apply_cli_flags(argv=None):
+    """
+    Turns --record, --replay and --latency=<factor> arguments into environment settings.
+
+    Setting the environment (rather than a module flag) lets child processes
+    started by the pipeline inherit the mode.
+
+    Args:
+        argv (list): The command line arguments, sys.argv[1:] by default.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    for arg in argv:
+        if arg == "--record":
+            os.environ[CASSETTE_ENV_VAR] = RECORD
+        elif arg == "--replay":
+            os.environ[CASSETTE_ENV_VAR] = REPLAY
+        elif arg.startswith("--latency="):
+            os.environ[LATENCY_ENV_VAR] = arg.split("=", 1)[1]
+
+
+def cassette_mode():
+    """Return RECORD, REPLAY or None"""
+    mode = os.environ.get(CASSETTE_ENV_VAR, "").lower()
+    return mode if mode in (RECORD, REPLAY) else None
+
+
+def _latency_factor():
+    try:
+        return max(0.0, float(os.environ.get(LATENCY_ENV_VAR, "0")))
+    except ValueError:
+        return 0.0
+
+
+def _request_key(method, url, params=None):
+    if params:
+        url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+    return f"{method.upper()} {url}"
+
+
+class Cassette:
+    """The recorded responses of one stage, loaded lazily and saved at exit when recording"""
+
+    def __init__(self, name, mode):
+        self.name = name
+        self.mode = mode
+        self.dir = cassettes_dir / name
+        self.bodies_dir = self.dir / "bodies"
+        self.index_file = self.dir / "index.json"
+        self._cursors = {}
+        if mode == RECORD:
+            # A recording replaces the previous one; unchanged bodies are reused
+            self.index = {}
+            self.bodies_dir.mkdir(parents=True, exist_ok=True)
+            atexit.register(self.save)
+        else:
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except FileNotFoundError:
+                logging.error(f"No cassette recorded for {name} ({self.index_file})")
+                self.index = {}
+
+    def save(self):
+        """Write the index of a recording"""
+        if self.mode != RECORD:
+            return
+        tmp_file = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp_file.replace(self.index_file)
+
+    def record(self, key, status_code=None, reason="", headers=None, body=None, infos=None, error=None):
+        """
+        Appends one response, or the error raised instead of one, to the recording.
+
+        Args:
+            key (str): The request key ("METHOD url").
+            status_code (int): The HTTP status.
+            reason (str): The HTTP reason phrase.
+            headers (Headers): The response headers.
+            body (bytes): The decoded response body.
+            infos (dict): curl counters keyed by CurlInfo.
+            error (Exception): The exception raised by the request, if it failed.
+        """
+        entry = {"recorded_at": time.time()}
+        if error is not None:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        else:
+            digest = hashlib.sha256(body or b"").hexdigest()
+            body_path = self.bodies_dir / f"{digest}.gz"
+            if not body_path.exists():
+                tmp_path = body_path.with_name(body_path.name + ".tmp")
+                tmp_path.write_bytes(gzip.compress(body or b"", mtime=0))
+                tmp_path.replace(body_path)
+            entry.update({
+                "status_code": status_code,
+                "reason": reason,
+                "headers": [list(item) for item in headers.multi_items()] if headers is not None else [],
+                "body": digest,
+            })
+        entry["infos"] = {info.name: value for info, value in (infos or {}).items()}
+        self.index.setdefault(key, []).append(entry)
+
+    def next_entry(self, key):
+        """
+        Returns the next recorded response for a request.
+
+        Repeated requests are served in recording order; once they run out the
+        last response is served again.
+
+        Raises:
+            RequestException: If nothing was recorded for the request.
+        """
+        entries = self.index.get(key)
+        if not entries:
+            raise exceptions.RequestException(f"No recorded response for {key} in cassette {self.name}")
+        position = self._cursors.get(key, 0)
+        self._cursors[key] = position + 1
+        return entries[min(position, len(entries) - 1)]
+
+    def read_body(self, digest):
+        with open(self.bodies_dir / f"{digest}.gz", "rb") as f:
+            return gzip.decompress(f.read())
+
+
+def get_cassette(name):
+    """
+    Returns the cassette for a stage in the current mode.
+
+    Args:
+        name (str): The cassette name, usually the stage ('fetcher', 'hackernews', ...).
+
+    Returns:
+        Cassette: The cassette, or None when neither recording nor replaying.
+    """
+    mode = cassette_mode()
+    if not mode:
+        return None
+    if name not in _cassettes:
+        _cassettes[name] = Cassette(name, mode)
+    return _cassettes[name]
+
+
+def _read_infos(curl):
+    return {info: curl.getinfo(info) for info in RECORDED_INFOS}
+
+
+def _raise_recorded_error(key, entry):
+    error = entry["error"]
+    error_class = getattr(exceptions, error.get("type", ""), None)
+    if not (isinstance(error_class, type) and issubclass(error_class, exceptions.RequestException)):
+        error_class = exceptions.RequestException
+    raise error_class(error.get("message") or f"Recorded failure for {key}")
+
+
+class _ReplayCurl:
+    """Stands in for the curl handle of a replayed response"""
+
+    def __init__(self, infos):
+        self._infos = infos
+
+    def getinfo(self, info):
+        return self._infos.get(info.name, 0)
+
+
+class ReplayResponse:
+    """A recorded response with the parts of the curl_cffi Response API the stages use"""
+
+    def __init__(self, url, entry, body, transfer_delay=0.0):
+        self.url = url
+        self.status_code = entry["status_code"]
+        self.reason = entry.get("reason", "")
+        self.headers = Headers([tuple(item) for item in entry.get("headers", [])])
+        self.content = body
+        self.curl = _ReplayCurl(entry.get("infos", {}))
+        self.infos = {info: self.curl.getinfo(info) for info in RECORDED_INFOS}
+        self._transfer_delay = transfer_delay
+
+    @property
+    def ok(self):
+        return 0 < self.status_code < 400
+
+    @property
+    def text(self):
+        match = re.search(r'charset=([\w-]+)', self.headers.get("content-type", ""))
+        return self.content.decode(match.group(1) if match else "utf-8", errors="replace")
+
+    def json(self, **kwargs):
+        return json.loads(self.content, **kwargs)
+
+    def raise_for_status(self):
+        """Raise an error if status code is not in [200, 400)"""
+        if not self.ok:
+            raise exceptions.HTTPError(f"HTTP Error {self.status_code}: {self.reason}", 0, self)
+
+    async def aiter_content(self, chunk_size=None):
+        if self._transfer_delay:
+            await asyncio.sleep(self._transfer_delay)
+        chunk_size = chunk_size or REPLAY_CHUNK_SIZE
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+class ReplaySession:
+    """Serves recorded responses in place of an AsyncSession"""
+
+    def __init__(self, cassette):
+        self._cassette = cassette
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def _replay(self, method, url, params=None):
+        key = _request_key(method, url, params)
+        entry = self._cassette.next_entry(key)
+        infos = entry.get("infos", {})
+        factor = _latency_factor()
+        first_byte = infos.get(CurlInfo.STARTTRANSFER_TIME.name, 0) * factor
+        total = infos.get(CurlInfo.TOTAL_TIME.name, 0) * factor
+        if "error" in entry:
+            if total:
+                await asyncio.sleep(total)
+            _raise_recorded_error(key, entry)
+        if first_byte:
+            await asyncio.sleep(first_byte)
+        body = self._cassette.read_body(entry["body"])
+        return ReplayResponse(url, entry, body, transfer_delay=max(0.0, total - first_byte))
+
+    async def request(self, method, url, params=None, **kwargs):
+        response = await self._replay(method, url, params)
+        if response._transfer_delay:
+            await asyncio.sleep(response._transfer_delay)
+            response._transfer_delay = 0.0
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method, url, params=None, **kwargs):
+        yield await self._replay(method, url, params)
+
+
+class _RecordingStream:
+    """Wraps a streamed response to capture its body and the final curl counters"""
+
+    def __init__(self, response):
+        self._response = response
+        self.chunks = []
+        self.infos = None
+        self.error = None
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    async def aiter_content(self, chunk_size=None):
+        try:
+            async for chunk in self._response.aiter_content(chunk_size):
+                self.chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            self.error = e
+            raise
+        # The handle is released soon after the last chunk, read it right away
+        self.infos = _read_infos(self._response.curl)
+
+
+class RecordingSession:
+    """Wraps an AsyncSession and records every response it returns"""
+
+    def __init__(self, session, cassette):
+        self._session = session
+        self._cassette = cassette
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        self._cassette.save()
+        return await self._session.__aexit__(*args)
+
+    async def request(self, method, url, params=None, **kwargs):
+        key = _request_key(method, url, params)
+        try:
+            response = await self._session.request(method, url, params=params, **kwargs)
+        except Exception as e:
+            self._cassette.record(key, error=e)
+            raise
+        self._cassette.record(key, response.status_code, response.reason, response.headers,
+                              response.content, response.infos)
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method, url, params=None, **kwargs):
+        key = _request_key(method, url, params)
+        context = self._session.stream(method, url, params=params, **kwargs)
+        try:
+            response = await context.__aenter__()
+        except Exception as e:
+            self._cassette.record(key, error=e)
+            raise
+
+        wrapper = _RecordingStream(response)
+        try:
+            yield wrapper
+        except BaseException as e:
+            self._record_stream(key, wrapper)
+            if not await context.__aexit__(type(e), e, e.__traceback__):
+                raise
+        else:
+            self._record_stream(key, wrapper)
+            await context.__aexit__(None, None, None)
+
+    def _record_stream(self, key, wrapper):
+        if wrapper.error is not None:
+            self._cassette.record(key, error=wrapper.error)
+            return
+        # Bodies that were never read (304, rejected as too large) are recorded empty
+        infos = wrapper.infos or _read_infos(wrapper.curl)
+        self._cassette.record(key, wrapper.status_code, wrapper.reason, wrapper.headers,
+                              b"".join(wrapper.chunks), infos)
+
+
+def open_session(name, **kwargs):
+    """
+    Creates the HTTP session for a stage, honouring the cassette mode.
+
+    Use it exactly like AsyncSession: `async with open_session("fetcher") as session:`.
+    Live and recording sessions start from and save back the persisted cookies
+    and DNS pins (see core/session_state.py).
+
+    Args:
+        name (str): The cassette name.
+        **kwargs: Passed to AsyncSession.
+
+    Returns:
+        PersistentSession, RecordingSession or ReplaySession.
+    """
+    cassette = get_cassette(name)
+    if not cassette:
+        return PersistentSession(**kwargs)
+    if cassette.mode == REPLAY:
+        return ReplaySession(cassette)
+    return RecordingSession(PersistentSession(curl_infos=RECORDED_INFOS, **kwargs), cassette)
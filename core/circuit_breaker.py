@@ -0,0 +1,121 @@
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Per-domain circuit breaker state, persisted across runs.
+# A host opens after FAILURE_THRESHOLD consecutive runs in which it only produced
+# retryable failures. While open it is skipped until its cooldown expires; then a
+# single cheap probe is allowed (half-open). A successful probe closes the
+# breaker, a failed one reopens it with a doubled cooldown.
+project_dir = Path(__file__).resolve().parent.parent
+state_dir = project_dir / "data" / "state"
+breaker_file = state_dir / "circuit_breaker.json"
+
+state_dir.mkdir(parents=True, exist_ok=True)
+
+FAILURE_THRESHOLD = 2
+# Just under the daily schedule, so the first reopening only costs one probe
+BASE_COOLDOWN_SECONDS = 20 * 3600
+MAX_COOLDOWN_SECONDS = 7 * 24 * 3600
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def load_breakers():
+    """
+    Loads the breaker state for all hosts.
+
+    Returns:
+        dict: A mapping of host to its breaker state.
+    """
+    try:
+        with open(breaker_file, "r", encoding="utf-8") as f:
+            breakers = json.load(f)
+        return breakers if isinstance(breakers, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable circuit breaker state {breaker_file}: {e}")
+        return {}
+
+
+def save_breakers(breakers):
+    """
+    Writes the breaker state for all hosts.
+
+    Args:
+        breakers (dict): A mapping of host to its breaker state.
+    """
+    tmp_file = breaker_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(breakers, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_file.replace(breaker_file)
+
+
+def check_host(breakers, host):
+    """
+    Decides whether a request to a host may be sent.
+
+    An open breaker whose cooldown has expired moves to half-open, which lets
+    the caller send one probe.
+
+    Args:
+        breakers (dict): The breaker state, updated in place.
+        host (str): The host to check.
+
+    Returns:
+        str: CLOSED to fetch normally, HALF_OPEN to send a single probe, OPEN to skip.
+    """
+    state = breakers.get(host)
+    if not state or state.get("state", CLOSED) == CLOSED:
+        return CLOSED
+    if state["state"] == HALF_OPEN:
+        # Only one probe per host per run
+        return OPEN
+
+    try:
+        opened_at = datetime.fromisoformat(state["opened_at"])
+    except (KeyError, TypeError, ValueError):
+        return CLOSED
+
+    elapsed = (datetime.now(timezone.utc) - opened_at).total_seconds()
+    if elapsed >= state.get("cooldown", BASE_COOLDOWN_SECONDS):
+        state["state"] = HALF_OPEN
+        return HALF_OPEN
+    return OPEN
+
+
+def record_success(breakers, host):
+    """Close the breaker for a host after a successful request"""
+    if host in breakers:
+        if breakers[host].get("state") != CLOSED:
+            logging.info(f"Circuit closed for {host}")
+        del breakers[host]
+
+
+def record_failure(breakers, host):
+    """
+    Counts a failed run for a host and opens its breaker when needed.
+
+    Args:
+        breakers (dict): The breaker state, updated in place.
+        host (str): The host that failed.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    state = breakers.setdefault(host, {"state": CLOSED, "failures": 0})
+    state["failures"] = state.get("failures", 0) + 1
+    state["last_failure_at"] = now
+
+    if state["state"] == HALF_OPEN:
+        state["state"] = OPEN
+        state["opened_at"] = now
+        state["cooldown"] = min(state.get("cooldown", BASE_COOLDOWN_SECONDS) * 2, MAX_COOLDOWN_SECONDS)
+        logging.warning(f"Probe failed, circuit reopened for {host} ({state['cooldown'] // 3600}h)")
+    elif state["state"] == CLOSED and state["failures"] >= FAILURE_THRESHOLD:
+        state["state"] = OPEN
+        state["opened_at"] = now
+        state["cooldown"] = BASE_COOLDOWN_SECONDS
+        logging.warning(f"Circuit opened for {host} after {state['failures']} consecutive failed runs")
@@ -0,0 +1,182 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from dateutil import parser as date_parser
+
+# Date parsing shared by the scrapers, NewsItem and the generator.
+# A value's shape is sniffed with precompiled patterns and sent to the one
+# parser for that shape (fromisoformat, a month-name table, ...) instead of
+# trying strptime formats until one stops raising; dateutil only sees shapes
+# none of them knows, and only its results with a full year, month and day are
+# kept. Absolute dates are cached by their raw string. Relative
+# ones ("3 小时前", "昨天", "02-13") are resolved against `now` and not cached.
+#
+# A value that does not parse raises DateParseError, unless the caller passes
+# a default; nothing falls back to the current time on its own.
+
+# Passed as default, parse failures raise DateParseError
+RAISE = object()
+
+# Distinct raw strings whose parse result is kept
+CACHE_SIZE = 8192
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10, 'nov': 11, 'november': 11, 'dec': 12, 'december': 12,
+}
+
+# Absolute shapes
+ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?')  # 2026-02-12, 2026-03-06 15:47:00, ...T00:00:00Z
+SLASHED_DATE = re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})')  # 2026/02/12
+MONTH_DAY_YEAR = re.compile(r'([A-Za-z]+)\.? (\d{1,2}),? (\d{4})')  # Jan 16, 2026 / January 16 2026 / Sept. 5, 2025
+MONTH_YEAR = re.compile(r'([A-Za-z]+)\.? (\d{4})')  # Mar. 2026, taken as the 1st
+# Relative shapes (AIBase)
+AGO = re.compile(r'(\d+)\s*(分钟|小时|天)前')  # 8 分钟前 / 3 小时前 / 2 天前
+AGO_UNITS = {'分钟': 'minutes', '小时': 'hours', '天': 'days'}
+AGO_WORDS = {'刚刚': timedelta(0), '前天': timedelta(days=2), '昨天': timedelta(days=1)}  # just now, day before yesterday, yesterday
+MONTH_DAY = re.compile(r'(\d{2})-(\d{2})')  # 02-13, in the current year
+
+WHITESPACE = re.compile(r'\s+')
+
+# dateutil fills fields missing from the text from its default. Parsing with two
+# defaults that differ in year, month and day shows which fields were filled in.
+DATEUTIL_DEFAULTS = (datetime(2000, 1, 1), datetime(2001, 2, 2))
+
+
+class DateParseError(ValueError):
+    """A value matched no known date shape"""
+
+
+def _utc(dt):
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _month_date(month_name, day, year):
+    month = MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+    return datetime(int(year), month, int(day), tzinfo=timezone.utc)
+
+
+def _parse_complete(text):
+    """Parse text with dateutil, None unless it names a year, month and day"""
+    first, second = (date_parser.parse(text, default=default) for default in DATEUTIL_DEFAULTS)
+    if first.date() != second.date():
+        return None
+    return _utc(first)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_absolute(text):
+    """Parse a normalized absolute date, None if no parser accepts it"""
+    try:
+        if ISO_DATE.fullmatch(text):
+            return _utc(datetime.fromisoformat(text))
+        if match := SLASHED_DATE.fullmatch(text):
+            year, month, day = match.groups()
+            return datetime(int(year), int(month), int(day), tzinfo=timezone.utc)
+        if match := MONTH_DAY_YEAR.fullmatch(text):
+            month_name, day, year = match.groups()
+            return _month_date(month_name, day, year)
+        if match := MONTH_YEAR.fullmatch(text):
+            month_name, year = match.groups()
+            return _month_date(month_name, 1, year)
+        return _parse_complete(text)
+    except (ValueError, OverflowError):
+        return None
+
+
+def _parse_relative(text, now):
+    """Resolve a relative date against now, None if text is not one"""
+    if match := AGO.search(text):
+        amount, unit = match.groups()
+        return now - timedelta(**{AGO_UNITS[unit]: int(amount)})
+    for word, delta in AGO_WORDS.items():
+        if word in text:
+            return now - delta
+    if match := MONTH_DAY.match(text):
+        try:
+            return datetime(now.year, int(match.group(1)), int(match.group(2)), tzinfo=timezone.utc)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_date(value, default=RAISE, now=None):
+    """
+    Parses a date in any of the shapes the scraped sites use.
+
+    Args:
+        value: An ISO 8601 string, a written date ("Jan 16, 2026", "Mar. 2026",
+            "2026/02/12", ...), a relative one ("3 小时前", "昨天"), a datetime,
+            or epoch seconds.
+        default: Returned when value is missing or does not parse; RAISE raises instead.
+        now (datetime): What relative dates are resolved against, the current time by default.
+
+    Returns:
+        datetime: The timezone-aware date (naive values are taken as UTC), or default.
+
+    Raises:
+        DateParseError: If the value does not parse and no default was given.
+    """
+    result = None
+    if isinstance(value, datetime):
+        result = _utc(value)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            result = datetime.fromtimestamp(value, tz=timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            result = None
+    elif isinstance(value, str):
+        text = WHITESPACE.sub(' ', value.strip())
+        if text:
+            result = _parse_absolute(text) if text.isascii() else None
+            if result is None:
+                result = _parse_relative(text, now or datetime.now(timezone.utc))
+
+    if result is not None:
+        return result
+    if default is RAISE:
+        raise DateParseError(f"Could not parse date: {value!r}")
+    if value not in (None, ''):
+        logging.warning(f"Could not parse date: '{value}'")
+    return default
+
+
+def iso_date(value, default=RAISE, now=None):
+    """Like parse_date, returning the date as an ISO 8601 string"""
+    result = parse_date(value, RAISE if default is RAISE else None, now)
+    return default if result is None else result.isoformat()
+
+
+def parse_dates(values, default=RAISE, now=None):
+    """
+    Parses a column of dates at once.
+
+    Each distinct value is parsed once and relative dates share one `now`, so a
+    column of repeated or relative values costs one parse per distinct value.
+
+    Args:
+        values (iterable): The values, as accepted by parse_date.
+        default: Used for values that do not parse; RAISE raises on the first one.
+        now (datetime): What relative dates are resolved against.
+
+    Returns:
+        list: The parsed datetimes (or default), in the order of values.
+    """
+    values = list(values)
+    now = now or datetime.now(timezone.utc)
+    parsed = {}
+    results = []
+    for value in values:
+        try:
+            if value not in parsed:
+                parsed[value] = parse_date(value, default, now)
+            results.append(parsed[value])
+        except TypeError:
+            # Unhashable value, parse it on its own
+            results.append(parse_date(value, default, now))
+    return results
@@ -0,0 +1,104 @@
+import json
+import logging
+from core.snapshots import open_snapshot
+
+# Reads the JSON state that client-rendered pages embed in a script tag,
+# straight from the page bytes: the marker is located with a byte search and
+# only the JSON blob after it is decoded, no DOM is built. Pages are read from
+# the snapshot store in decompressed chunks, and only the blob is kept in
+# memory. Scrapers fall back to parsing the HTML when the marker is missing.
+
+# Byte markers preceding the state object
+ROUTER_DATA = b"window._ROUTER_DATA"  # Modern.js (ByteDance Seed): window._ROUTER_DATA = {...}
+NEXT_DATA = b'id="__NEXT_DATA__"'  # Next.js pages router: <script id="__NEXT_DATA__" type="application/json">{...}</script>
+
+SCRIPT_END = b"</script>"
+
+# Decompressed bytes read from a page at a time
+CHUNK_SIZE = 64 * 1024
+
+
+def find_state(data, marker):
+    """
+    Decodes the JSON object following a marker.
+
+    The blob ends at the closing </script>, which cannot occur unescaped
+    inside the JSON of a working page; anything after the object itself
+    (e.g. a trailing semicolon) is ignored.
+
+    Args:
+        data (bytes): The raw page, or the part of it from the marker on.
+        marker (bytes): One of the markers above.
+
+    Returns:
+        The decoded object, or None if the marker or a valid object is missing.
+    """
+    position = data.find(marker)
+    if position < 0:
+        return None
+    start = data.find(b"{", position + len(marker))
+    end = data.find(SCRIPT_END, position)
+    if start < 0 or (0 <= end < start):
+        return None
+    blob = data[start:end if end >= 0 else len(data)]
+    try:
+        state, _ = json.JSONDecoder().raw_decode(blob.decode("utf-8", errors="replace"))
+    except json.JSONDecodeError as e:
+        logging.warning(f"Invalid embedded state after {marker.decode()}: {e}")
+        return None
+    return state
+
+
+def scan_state(stream, marker, chunk_size=CHUNK_SIZE):
+    """
+    Decodes the JSON object following a marker, reading the page in chunks.
+
+    Bytes before the marker are dropped as they are read, and reading stops
+    at the </script> closing the state, so only the state blob is held.
+
+    Args:
+        stream: A binary file object with read(size).
+        marker (bytes): One of the markers above.
+        chunk_size (int): Bytes to read at a time.
+
+    Returns:
+        The decoded object, or None if the marker or a valid object is missing.
+    """
+    window = b""
+    blob = None
+    searched = 0
+    while chunk := stream.read(chunk_size):
+        if blob is None:
+            window += chunk
+            position = window.find(marker)
+            if position < 0:
+                # Keep enough bytes to find a marker split across two chunks
+                window = window[-(len(marker) - 1):]
+                continue
+            blob = bytearray(window[position:])
+        else:
+            blob += chunk
+        if blob.find(SCRIPT_END, searched) >= 0:
+            break
+        searched = max(0, len(blob) - len(SCRIPT_END) + 1)
+    if blob is None:
+        return None
+    return find_state(bytes(blob), marker)
+
+
+def extract_state(cache_filename, marker, run_id=None):
+    """
+    Reads the embedded state of a cached page.
+
+    Args:
+        cache_filename (str): The configured cache filename.
+        marker (bytes): The marker preceding the state object.
+        run_id (str): A past run to read instead of the latest snapshot.
+
+    Returns:
+        The decoded object, or None if the page or its state is missing.
+    """
+    with open_snapshot(cache_filename, run_id) as stream:
+        if stream is None:
+            return None
+        return scan_state(stream, marker)
@@ -0,0 +1,113 @@
+import logging
+import math
+from curl_cffi import CurlInfo
+
+# curl reports these as seconds elapsed since the start of the request
+TIMING_INFOS = {
+    "namelookup": CurlInfo.NAMELOOKUP_TIME,
+    "connect": CurlInfo.CONNECT_TIME,
+    "appconnect": CurlInfo.APPCONNECT_TIME,
+    "starttransfer": CurlInfo.STARTTRANSFER_TIME,
+    "total": CurlInfo.TOTAL_TIME,
+}
+
+# Timing phases reported in the per-host summary
+SUMMARY_PHASES = ["dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "transfer_ms", "total_ms"]
+
+
+def transfer_stats(curl, decoded_bytes=None):
+    """
+    Reads the timing breakdown and byte counts of a transfer from its curl handle.
+
+    Must be called before the handle is released back to the session, i.e. right
+    after the body was consumed and before awaiting anything else. Reused
+    connections report zero DNS, connect and TLS time.
+
+    Args:
+        curl (Curl): The handle of the response (response.curl).
+        decoded_bytes (int): The body size after content decoding, if known.
+
+    Returns:
+        dict: Phase durations in milliseconds ('dns_ms', 'connect_ms', 'tls_ms',
+        'ttfb_ms', 'transfer_ms', 'total_ms') plus 'wire_bytes', 'header_bytes'
+        and 'decoded_bytes'.
+    """
+    t = {name: curl.getinfo(info) or 0.0 for name, info in TIMING_INFOS.items()}
+    handshake_done = max(t["appconnect"], t["connect"])
+    stats = {
+        "dns_ms": t["namelookup"],
+        "connect_ms": max(0.0, t["connect"] - t["namelookup"]) if t["connect"] else 0.0,
+        "tls_ms": max(0.0, t["appconnect"] - t["connect"]) if t["appconnect"] else 0.0,
+        "ttfb_ms": max(0.0, t["starttransfer"] - handshake_done) if t["starttransfer"] else 0.0,
+        "transfer_ms": max(0.0, t["total"] - t["starttransfer"]) if t["starttransfer"] else 0.0,
+        "total_ms": t["total"],
+    }
+    stats = {key: round(value * 1000, 1) for key, value in stats.items()}
+    stats["wire_bytes"] = curl.getinfo(CurlInfo.SIZE_DOWNLOAD_T)
+    stats["header_bytes"] = curl.getinfo(CurlInfo.HEADER_SIZE)
+    stats["decoded_bytes"] = decoded_bytes
+    return stats
+
+
+def percentile(values, pct):
+    """
+    Computes a nearest-rank percentile.
+
+    Args:
+        values (list): The sample values.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or None for an empty sample.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_timings(results):
+    """
+    Aggregates per-request timings into p50/p95 values per host.
+
+    Args:
+        results (list): Fetch results carrying 'host' and 'timing'.
+
+    Returns:
+        dict: A mapping of host to {'requests', 'wire_bytes', 'decoded_bytes', '<phase>': {'p50', 'p95'}}.
+    """
+    by_host = {}
+    for result in results:
+        if not isinstance(result, dict) or not result.get("timing") or not result.get("host"):
+            continue
+        by_host.setdefault(result["host"], []).append(result["timing"])
+
+    summary = {}
+    for host, timings in sorted(by_host.items()):
+        host_summary = {
+            "requests": len(timings),
+            "wire_bytes": sum(timing.get("wire_bytes") or 0 for timing in timings),
+            "decoded_bytes": sum(timing.get("decoded_bytes") or 0 for timing in timings),
+        }
+        for phase in SUMMARY_PHASES:
+            values = [timing[phase] for timing in timings if timing.get(phase) is not None]
+            if values:
+                host_summary[phase] = {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+        summary[host] = host_summary
+    return summary
+
+
+def log_timing_summary(summary):
+    """Log one p50/p95 line per host, slowest hosts first"""
+    if not summary:
+        return
+    logging.info("Timing per host (p50/p95 ms):")
+    ordered = sorted(summary.items(), key=lambda item: -(item[1].get("total_ms", {}).get("p95") or 0))
+    for host, stats in ordered:
+        phases = ", ".join(
+            f"{phase[:-3]} {stats[phase]['p50']:.0f}/{stats[phase]['p95']:.0f}"
+            for phase in SUMMARY_PHASES if phase in stats
+        )
+        logging.info(f"  - {host} ({stats['requests']} req, {stats['wire_bytes'] / 1024:.0f} KB wire, "
+                     f"{stats['decoded_bytes'] / 1024:.0f} KB decoded): {phases}")
@@ -1,64 +1,217 @@
 import asyncio
-from curl_cffi.requests import AsyncSession
+import hashlib
+import os
+import random
+import tempfile
+import time
 import json
 from pathlib import Path
 import re
 from datetime import datetime, timezone
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 import logging
+from core.http_cache import load_http_cache, save_http_cache, build_entry, is_fresh, conditional_headers
+from core.host_scheduler import HostScheduler
+from core.manifest import load_manifest, save_manifest, ContentHasher, record_hash, touch_content
+from core.snapshots import store_blob_file, snapshot_exists, load_latest_index, publish_snapshot, write_run_index, new_run_id, tmp_dir
+from core.fetch_stats import transfer_stats, summarize_timings, log_timing_summary
+from core.latency_history import load_latency_history, save_latency_history, record_latencies, expected_latency, adaptive_timeout
+from core.refresh_schedule import filter_due
+from core.cassette import open_session, cassette_mode, apply_cli_flags
+from core.rate_limit import parse_retry_after
+from core.circuit_breaker import load_breakers, save_breakers, check_host, record_success, record_failure, OPEN, HALF_OPEN
 
 # Set up logging configuration
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Define directories for caching HTML files and logs
+# Define directory for logs (HTML is kept in the snapshot store, see core/snapshots.py)
 script_dir = Path(__file__).resolve().parent
 project_dir = script_dir.parent
-html_cache_dir = project_dir / "data" / "html_cache"
 logs_dir = project_dir / "data" / "logs"
 
-# Ensure the cache and logs directories exist
-html_cache_dir.mkdir(exist_ok=True)
+# Ensure the logs directory exists
 logs_dir.mkdir(exist_ok=True)
 
+# Bodies larger than this are discarded unless a site sets 'max_body_bytes'
+DEFAULT_MAX_BODY_BYTES = 20 * 1024 * 1024
+# Streamed chunks are buffered up to this size before each file write
+WRITE_BUFFER_SIZE = 256 * 1024
 
-async def fetch_and_save(curl_session, url_data, semaphore):
+# Request timeout in seconds, and the shorter one used to probe a host whose circuit is half-open
+DEFAULT_TIMEOUT = 10
+PROBE_TIMEOUT = 5
+# Attempts per URL in the main pass; failures still retryable afterwards get one more in the deferred pass
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 8.0
+# Retry-After values up to this many seconds are waited out inline, longer ones go to the deferred pass
+MAX_RETRY_AFTER = 30
+DEFERRED_RETRY_DELAY = 10
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+async def stream_to_file(response, max_bytes):
+    """
+    Streams a response body into a temporary file without holding it in memory.
+
+    Chunks are hashed as they arrive. They are written, and hashed again after
+    normalization for the manifest (see core.manifest.ContentHasher), from a
+    worker thread, so neither disk I/O nor the normalization blocks the event
+    loop. curl's timing counters are read as soon as the last chunk arrives,
+    while the handle still belongs to this response.
+
+    Args:
+        response (Response): A curl_cffi response opened with stream=True.
+        max_bytes (int): The largest body accepted, 0 to disable the limit.
+
+    Returns:
+        tuple: (temp file Path, SHA-256 hex digest, normalized content hash, size in bytes,
+        transfer stats), or None if the body exceeded max_bytes.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir, suffix=".part")
+    tmp_path = Path(tmp_name)
+    hasher = hashlib.sha256()
+    content_hasher = ContentHasher()
+    size = 0
+    buffer = bytearray()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in response.aiter_content():
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    tmp_path.unlink(missing_ok=True)
+                    return None
+                hasher.update(chunk)
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    await asyncio.to_thread(write_chunk, f, content_hasher, bytes(buffer))
+                    buffer.clear()
+            stats = transfer_stats(response.curl, size)
+            if buffer:
+                await asyncio.to_thread(write_chunk, f, content_hasher, bytes(buffer))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, hasher.hexdigest(), content_hasher.hexdigest(), size, stats
+
+
+def write_chunk(f, content_hasher, data):
+    """Write a buffered chunk and feed it to the normalized hash; runs in a worker thread"""
+    f.write(data)
+    content_hasher.update(data)
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter for the given retry attempt (1-based)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+async def fetch_and_save(curl_session, url_data, scheduler, http_cache, manifest, timeout=DEFAULT_TIMEOUT, probe=False):
     """
-    Fetches a URL and saves the HTML content to a file.
+    Fetches a URL and saves the HTML content to the snapshot store.
+
+    Cached validators are sent as If-None-Match / If-Modified-Since, and a cached
+    copy that is still within its Cache-Control max-age is not requested at all.
+    Both cases are reported with the 'not_modified' status. A probe of a host
+    whose circuit is half-open always sends its request, since only an answer
+    from the host can show that it recovered.
+
+    Successful fetches record a normalized content hash in the manifest, and the
+    result's 'changed' flag tells downstream stages whether the page changed.
+    Every request result carries a 'timing' breakdown (see core/fetch_stats.py);
+    failed requests only know their 'total_ms'.
 
     Args:
         curl_session (AsyncSession): The curl_cffi session used for all requests.
         url_data (dict): A dictionary containing 'base_url', 'domain', 'page'.
-        semaphore (asyncio.Semaphore): A semaphore to limit concurrent requests.
+        scheduler (HostScheduler): Enforces the global and per-host concurrency limits.
+        http_cache (dict): The validator store, updated in place for this URL.
+        manifest (dict): The content manifest, updated in place for this cache file.
+        timeout (float): The request timeout in seconds.
+        probe (bool): Whether this request probes a half-open host.
 
     Returns:
         dict: A dictionary with the URL, status, and file name or error details.
+        Failures worth retrying carry 'retryable': True.
     """
-    async with semaphore:
-        # Construct the full URL
-        url = urljoin(url_data['base_url'].rstrip('/')+'/', url_data['page'])
-        
+    # Construct the full URL
+    url = urljoin(url_data['base_url'].rstrip('/')+'/', url_data['page'])
+    host = url_data.get('host') or urlsplit(url).netloc
+
+    async with scheduler.slot(host):
         try:
+            # Use config-driven filename
+            config_filename = url_data.get('cache_filename', '')
+            if not config_filename:
+                raise ValueError(f"No cache filename configured for URL: {url}")
+            
+            # Remove extension for the log entry
+            filename = config_filename.replace('.html', '')
+
+            # Validators are only usable while the cached body is still stored
+            cache_entry = http_cache.get(url) if snapshot_exists(config_filename) else None
+            if cache_entry and is_fresh(cache_entry) and not probe:
+                logging.info(f"Fresh in cache, skipping request: {url}")
+                touch_content(manifest, config_filename)
+                return {"url": url, "status": "not_modified", "file": filename, "type": "html", "reason": "fresh", "changed": False}
+            request_headers = conditional_headers(cache_entry) if cache_entry else {}
+            max_body_bytes = url_data.get('max_body_bytes') or DEFAULT_MAX_BODY_BYTES
+
+            started = time.monotonic()
             try:
-                response = await curl_session.get(url, impersonate="chrome120", timeout=10)
-                response.raise_for_status()
-                response_text = response.text
+                async with curl_session.stream("GET", url, impersonate="chrome120", timeout=timeout, headers=request_headers) as response:
+                    response.raise_for_status()
+                    if response.status_code == 304 and cache_entry:
+                        http_cache[url] = build_entry(response.headers, cache_entry)
+                        logging.info(f"Not modified: {url}")
+                        touch_content(manifest, config_filename)
+                        return {"url": url, "status": "not_modified", "file": filename, "type": "html", "reason": "revalidated", "changed": False,
+                                "timing": transfer_stats(response.curl, 0)}
+
+                    # Reject oversized bodies early when the server announces their size
+                    content_length = response.headers.get("content-length", "")
+                    body = None
+                    if not (content_length.isdigit() and int(content_length) > max_body_bytes):
+                        body = await stream_to_file(response, max_body_bytes)
+                    if body is None:
+                        logging.error(f"Body larger than {max_body_bytes} bytes for {url}")
+                        return {"url": url, "status": "too_large", "error": f"Body exceeds {max_body_bytes} bytes",
+                                "timing": {"total_ms": round((time.monotonic() - started) * 1000, 1)}}
+                    response_headers = response.headers
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                # Not a cancellation of this fetch: the stream's teardown failed (seen when
+                # closing a failed stream), so it only fails this URL, not the whole batch
+                logging.error(f"Error fetching {url}: stream closed with CancelledError")
+                return {"url": url, "status": "error", "error": "Stream closed with CancelledError", "retryable": True,
+                        "timing": {"total_ms": round((time.monotonic() - started) * 1000, 1)}}
             except Exception as e:
+                timing = {"total_ms": round((time.monotonic() - started) * 1000, 1)}
                 # Handle curl_cffi errors
-                if hasattr(e, 'response') and hasattr(e.response, 'status_code'):  # type: ignore
+                # Connection failures carry a response with status 0
+                if hasattr(e, 'response') and getattr(e.response, 'status_code', 0):  # type: ignore
                     status_code = e.response.status_code  # type: ignore
                     logging.error(f"HTTP {status_code} for {url}")
-                    return {
+                    result = {
                         "url": url,
                         "status": "http_error",
                         "status_code": status_code,
-                        "error": f"HTTP {status_code}"
+                        "error": f"HTTP {status_code}",
+                        "retryable": status_code in RETRYABLE_STATUS_CODES,
+                        "timing": timing
                     }
+                    retry_after = parse_retry_after(e.response.headers.get("retry-after", ""))  # type: ignore
+                    if result["retryable"] and retry_after is not None:
+                        result["retry_after"] = retry_after
+                    return result
                 elif 'timeout' in str(e).lower():
                     logging.error(f"Timeout for {url}")
-                    return {"url": url, "status": "timeout", "error": str(e)}
+                    return {"url": url, "status": "timeout", "error": str(e), "retryable": True, "timing": timing}
                 else:
+                    # Connection, DNS and TLS failures
                     logging.error(f"Error fetching {url}: {str(e)}")
-                    return {"url": url, "status": "error", "error": str(e)}
+                    return {"url": url, "status": "error", "error": str(e), "retryable": True, "timing": timing}
 
             # Use domain and page from JSON data to construct filename
             domain = re.sub(r'[^\w]', '_', url_data['domain'])
@@ -68,43 +221,217 @@ async def fetch_and_save(curl_session, url_data, semaphore):
             if not page:
                 page = 'index'  # Default to 'index' if no specific page path is provided
 
-            # Use config-driven filename
-            config_filename = url_data.get('cache_filename', '')
-            if not config_filename:
-                raise ValueError(f"No cache filename configured for URL: {url}")
-            
-            # Remove extension since we'll add .html
-            filename = config_filename.replace('.html', '')
-
-            # Save HTML content
-            with open(html_cache_dir / f"{filename}.html", "w", encoding="utf-8") as f:
-                f.write(response_text)
-            return {"url": url, "status": "success", "file": filename, "type": "html"}
+            # Move the body into the store as a compressed, content-addressed blob
+            tmp_path, body_digest, normalized_digest, _, timing = body
+            snapshot = await asyncio.to_thread(store_blob_file, tmp_path, body_digest)
+            http_cache[url] = build_entry(response_headers)
+            changed = record_hash(manifest, config_filename, normalized_digest)
+            if not changed:
+                logging.info(f"Content unchanged: {url}")
+            return {"url": url, "status": "success", "file": filename, "type": "html", "changed": changed, "snapshot": snapshot, "timing": timing}
             
         except Exception as e:
             logging.error(f"Unexpected error fetching {url}: {str(e)}")
             return {"url": url, "status": "error", "error": str(e)}
 
 
+async def fetch_with_retry(curl_session, url_data, scheduler, http_cache, manifest, attempts=MAX_ATTEMPTS, timeout=DEFAULT_TIMEOUT, probe=False):
+    """
+    Fetches a URL, retrying retryable failures with exponential backoff and jitter.
 
+    The backoff sleeps happen outside the scheduler slot, so a struggling host
+    does not hold slots other hosts could use. A Retry-After longer than
+    MAX_RETRY_AFTER ends the retries early and leaves the URL to the deferred pass.
 
-async def fetch_all_urls(urls_data, max_concurrent=5):
+    Args:
+        curl_session (AsyncSession): The curl_cffi session used for all requests.
+        url_data (dict): A dictionary containing 'base_url', 'domain', 'page'.
+        scheduler (HostScheduler): Enforces the global and per-host concurrency limits.
+        http_cache (dict): The validator store, updated in place for this URL.
+        manifest (dict): The content manifest, updated in place for this cache file.
+        attempts (int): The maximum number of attempts.
+        timeout (float): The request timeout in seconds.
+        probe (bool): Whether this request probes a half-open host.
+
+    Returns:
+        dict: The result of the last attempt, with 'attempts' set.
+    """
+    for attempt in range(1, attempts + 1):
+        result = await fetch_and_save(curl_session, url_data, scheduler, http_cache, manifest, timeout, probe)
+        result["attempts"] = attempt
+        if not result.get("retryable") or attempt == attempts:
+            return result
+
+        delay = result.get("retry_after")
+        if delay is not None and delay > MAX_RETRY_AFTER:
+            logging.info(f"Retry-After {delay:.0f}s for {result['url']}, deferring")
+            return result
+        if delay is None:
+            delay = backoff_delay(attempt)
+        logging.info(f"Retrying {result['url']} in {delay:.1f}s (attempt {attempt + 1}/{attempts})")
+        await asyncio.sleep(delay)
+    return result
+
+
+async def fetch_all_urls(urls_data, max_concurrent=5, on_complete=None):
     """
     Fetches all URLs concurrently and logs the results.
 
+    Requests are limited globally by max_concurrent and per host by the
+    'max_concurrent' / 'request_delay' values carried in each URL's data.
+    All hosts share one session, whose curl multi handle keeps connections
+    alive and multiplexes HTTP/2 streams per origin.
+
+    Retryable failures are retried with backoff, then once more in a deferred
+    pass at the end of the run. Hosts with an open circuit breaker are skipped
+    ('circuit_open'); once their cooldown expires a single URL is sent as a
+    short-timeout probe, which bypasses the fresh HTTP cache, and the host's
+    other URLs only follow if it succeeds.
+
+    URLs are started longest-expected first, based on their latency in past
+    runs, so the slowest requests overlap with everything else instead of
+    extending the run at the end. Each URL's timeout is derived from its own
+    latency history (core/latency_history.py), DEFAULT_TIMEOUT until enough
+    history exists.
+
+    With on_complete, each URL is announced as soon as its result is final
+    (after any retries), with its snapshot already published to latest.json and
+    the manifest saved, so downstream stages can start before the run ends.
+
     Args:
         urls_data (list): A list of dictionaries containing URL data.
         max_concurrent (int): The maximum number of concurrent requests.
+        on_complete (callable): Optional coroutine function called with (url_data, result)
+            exactly once per URL.
 
     Returns:
         None
     """
-    semaphore = asyncio.Semaphore(max_concurrent)
+    scheduler = HostScheduler(max_concurrent)
+    for url_data in urls_data:
+        if url_data.get('host'):
+            scheduler.configure_host(url_data['host'], url_data.get('max_concurrent'), url_data.get('request_delay'))
+    # Recording and replaying ignore the validator cache and circuit breakers, so
+    # cassettes hold full responses and replays do not depend on local state
+    recording_or_replaying = cassette_mode() is not None
+    http_cache = {} if recording_or_replaying else load_http_cache()
+    manifest = load_manifest()
+    breakers = {} if recording_or_replaying else load_breakers()
+    latency_history = load_latency_history()
+
+    # Decide per host whether to fetch, probe or skip
+    urls = [urljoin(url_data['base_url'].rstrip('/')+'/', url_data['page']) for url_data in urls_data]
+    hosts = [url_data.get('host') or urlsplit(url).netloc for url_data, url in zip(urls_data, urls)]
+    expected = [expected_latency(latency_history, url, host) for url, host in zip(urls, hosts)]
+    timeouts = [adaptive_timeout(latency_history, url, DEFAULT_TIMEOUT) for url in urls]
+    host_modes = {host: check_host(breakers, host) for host in set(hosts)}
+    results = [None] * len(urls_data)
+    first_pass = []
+    probes = {}
+    held = []
+
+    async def finish(i):
+        # Make the page visible to readers before announcing it
+        if on_complete is None:
+            return
+        result = results[i]
+        if isinstance(result, dict) and result.get("status") == "success":
+            publish_snapshot(urls_data[i].get('cache_filename', ''), result["snapshot"])
+            save_manifest(manifest)
+        await on_complete(urls_data[i], result)
+
+    for i, (url_data, host) in enumerate(zip(urls_data, hosts)):
+        mode = host_modes[host]
+        if mode == OPEN:
+            logging.info(f"Circuit open for {host}, skipping {urls[i]}")
+            results[i] = {"url": urls[i], "status": "circuit_open", "error": f"Circuit open for {host}"}
+            await finish(i)
+        elif mode == HALF_OPEN and host in probes:
+            held.append(i)
+        else:
+            if mode == HALF_OPEN:
+                probes[host] = i
+            first_pass.append(i)
+
+    # Longest expected first: semaphores wake waiters in FIFO order, so task order is start order
+    first_pass.sort(key=lambda i: -expected[i])
+    held.sort(key=lambda i: -expected[i])
+    probe_indices = set(probes.values())
+
+    async def run(i, attempts, timeout, final, probe=False):
+        try:
+            results[i] = await fetch_with_retry(curl_session, urls_data[i], scheduler, http_cache, manifest, attempts=attempts, timeout=timeout, probe=probe)
+        except Exception as e:
+            logging.error(f"Unexpected error fetching {urls[i]}: {str(e)}")
+            results[i] = {"url": urls[i], "status": "error", "error": str(e)}
+        if final or not results[i].get("retryable"):
+            await finish(i)
+
+    # Create curl_cffi session with one curl handle per global slot
+    async with open_session("fetcher", max_clients=max_concurrent) as curl_session:
+        tasks = []
+        for i in first_pass:
+            if i in probe_indices:
+                logging.info(f"Probing {hosts[i]} (circuit half-open)")
+                tasks.append(run(i, 1, PROBE_TIMEOUT, final=True, probe=True))
+            else:
+                tasks.append(run(i, MAX_ATTEMPTS, timeouts[i], final=False))
+        await asyncio.gather(*tasks)
+
+        # Deferred pass: remaining retryable failures, plus the held URLs of hosts whose probe succeeded
+        probe_ok = {host for host, i in probes.items() if not results[i].get("retryable")}
+        deferred = [i for i in first_pass if i not in probe_indices and results[i].get("retryable")]
+        previous_attempts = {i: results[i].get("attempts", 0) for i in deferred}
+        for i in held:
+            if hosts[i] in probe_ok:
+                deferred.append(i)
+            else:
+                results[i] = {"url": urls[i], "status": "circuit_open", "error": f"Probe failed for {hosts[i]}"}
+                await finish(i)
+        if deferred:
+            if previous_attempts:
+                logging.info(f"Deferred retry of {len(deferred)} URLs in {DEFERRED_RETRY_DELAY}s")
+                await asyncio.sleep(DEFERRED_RETRY_DELAY)
+            # A learned timeout may have been too tight, so the last attempt gets at least the default
+            await asyncio.gather(*[run(i, 1, max(timeouts[i], DEFAULT_TIMEOUT), final=True) for i in deferred])
+            for i, attempts in previous_attempts.items():
+                results[i]["attempts"] = attempts + 1
+
+    # A host fails a run when it was contacted and only produced retryable failures
+    host_outcomes = {}
+    for host, result in zip(hosts, results):
+        if not isinstance(result, dict) or result.get("status") == "circuit_open":
+            continue
+        host_outcomes[host] = host_outcomes.get(host, False) or not result.get("retryable")
+    for host, reachable in host_outcomes.items():
+        if reachable:
+            record_success(breakers, host)
+        else:
+            record_failure(breakers, host)
 
-    # Create curl_cffi session
-    async with AsyncSession() as curl_session:
-        tasks = [fetch_and_save(curl_session, url_data, semaphore) for url_data in urls_data]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    if not recording_or_replaying:
+        save_http_cache(http_cache)
+        save_breakers(breakers)
+    save_manifest(manifest)
+
+    for host, result in zip(hosts, results):
+        if isinstance(result, dict):
+            result["host"] = host
+    record_latencies(latency_history, results)
+    save_latency_history(latency_history)
+
+    # Index this run's snapshots; unchanged pages keep pointing at their previous blob
+    latest_index = load_latest_index()
+    run_index = {}
+    for url_data, result in zip(urls_data, results):
+        if not isinstance(result, dict):
+            continue
+        cache_filename = url_data.get('cache_filename', '')
+        if result.get("status") == "success":
+            run_index[cache_filename] = result["snapshot"]
+        elif result.get("status") == "not_modified" and cache_filename in latest_index:
+            run_index[cache_filename] = latest_index[cache_filename]
+    write_run_index(new_run_id(), run_index)
     
     # Get current UTC date and hour
     now = datetime.now(timezone.utc)
@@ -118,16 +445,22 @@ async def fetch_all_urls(urls_data, max_concurrent=5):
     # Track and log unsuccessful requests
     failed_requests = []
     successful_count = 0
+    not_modified_count = 0
+    changed_count = 0
     
     for result in results:
-        if isinstance(result, dict) and result.get("status") != "success":
+        if isinstance(result, dict) and result.get("changed"):
+            changed_count += 1
+        if isinstance(result, dict) and result.get("status") == "not_modified":
+            not_modified_count += 1
+        elif isinstance(result, dict) and result.get("status") != "success":
             failed_requests.append(result)
         elif isinstance(result, dict) and result.get("status") == "success":
             successful_count += 1
     
     # Log summary
     total_requests = len(results)
-    logging.info(f"Fetch summary: {successful_count}/{total_requests} successful")
+    logging.info(f"Fetch summary: {successful_count}/{total_requests} successful, {not_modified_count} not modified, {changed_count} changed")
     
     if failed_requests:
         logging.info(f"Failed requests ({len(failed_requests)}):")
@@ -142,9 +475,19 @@ async def fetch_all_urls(urls_data, max_concurrent=5):
     else:
         logging.info("All requests were successful!")
 
+    log_timing_summary(summarize_timings(results))
 
-if __name__ == "__main__":
-    # Load URL data from unified schema
+
+def load_urls_data(organization_keys=None):
+    """
+    Builds the list of pages to fetch from config/sites_config.json.
+
+    Args:
+        organization_keys (iterable): Only include these sites, all sites if None.
+
+    Returns:
+        list: One dictionary per page, as expected by fetch_all_urls.
+    """
     urls_data = []
     file_path = project_dir / 'config' / 'sites_config.json'
     
@@ -153,13 +496,16 @@ if __name__ == "__main__":
         
         for data in data_list:
             base_url = data.get('site')
-            domain = re.sub(r'[^\w]', '_', base_url.split('//')[-1].split('/')[0])
+            host = base_url.split('//')[-1].split('/')[0]
+            domain = re.sub(r'[^\w]', '_', host)
             client_type = data.get('client_type', 'curl_cffi')  # Default to curl_cffi
             organization_key = data.get('organization_key', '')
             
             # Skip Hacker News and Hugging Face as they use direct API calls
             if organization_key in ['hackernews', 'huggingface']:
                 continue
+            if organization_keys is not None and organization_key not in organization_keys:
+                continue
             
             # Handle simple pages list
             pages = data.get('pages', [''])
@@ -178,10 +524,45 @@ if __name__ == "__main__":
                     'page': page,
                     'content_type': content_type,
                     'cache_filename': cache_filename,
-                    'client_type': client_type
+                    'client_type': client_type,
+                    'organization_key': organization_key,
+                    'host': host,
+                    'max_concurrent': data.get('max_concurrent'),
+                    'request_delay': data.get('request_delay'),
+                    'max_body_bytes': data.get('max_body_bytes'),
+                    'min_refresh_hours': data.get('min_refresh_hours'),
+                    'max_refresh_hours': data.get('max_refresh_hours')
                 })
-    
+    return urls_data
+
+
+def due_urls(urls_data):
+    """
+    Drops the sources that are not due for a refresh yet (see core/refresh_schedule.py).
+
+    Recording and replaying always fetch everything.
+
+    Args:
+        urls_data (list): URL dictionaries from load_urls_data.
+
+    Returns:
+        list: The URL dictionaries to fetch in this run.
+    """
+    if cassette_mode():
+        return urls_data
+    return filter_due(urls_data, load_manifest())
+
+
+def main(organization_keys=None):
+    """Fetch every configured page, or only those of the given sites"""
+    urls_data = due_urls(load_urls_data(organization_keys))
     logging.info(f"Total URLs to fetch: {len(urls_data)}")
     
     # Run the fetch_all_urls function to fetch and save HTMLs
-    asyncio.run(fetch_all_urls(urls_data, max_concurrent=5))
\ No newline at end of file
+    asyncio.run(fetch_all_urls(urls_data, max_concurrent=5))
+
+
+if __name__ == "__main__":
+    # --record / --replay [--latency=<factor>] run against data/cassettes/fetcher
+    apply_cli_flags()
+    main()
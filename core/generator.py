@@ -5,6 +5,9 @@ from datetime import datetime, timezone
 from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
 import glob
+from core.manifest import files_digest, is_unchanged, mark_processed
+from core.dates import parse_date
+from core.news_item import NewsItem
 
 # Directory paths
 project_dir = Path(__file__).resolve().parent.parent
@@ -12,6 +15,14 @@ parsed_dir = project_dir / 'data' / 'parsed'
 feeds_dir = project_dir / 'feeds'
 config_dir = project_dir / 'config'
 
+# Files besides the parsed data that shape the feeds; editing one regenerates every feed
+feed_code_paths = [
+    Path(__file__).resolve(),
+    project_dir / 'core' / 'news_item.py',
+    project_dir / 'core' / 'dates.py',
+    config_dir / 'sites_config.json',
+]
+
 # Ensure feeds directory exists
 feeds_dir.mkdir(exist_ok=True)
 
@@ -44,7 +55,7 @@ def get_base_url(feed_name):
     return 'https://ai-news-direct.local'
 
 def safe_get_text(data, key, fallback=''):
-    """Safely get text value from data, handling None and non-string types"""
+    """Safely get text value from data (a dict or NewsItem), handling None and non-string types"""
     value = data.get(key, fallback)
     if value is None:
         return fallback
@@ -52,20 +63,9 @@ def safe_get_text(data, key, fallback=''):
 
 def format_date(date_str):
     """Format date string to ISO format, with fallback to current time"""
-    if not date_str:
-        return datetime.now(timezone.utc).isoformat()
-    
-    try:
-        # Handle various date formats
-        if 'T' in str(date_str):
-            # ISO format
-            dt = datetime.fromisoformat(str(date_str).replace('Z', '+00:00'))
-        else:
-            # Assume it's a simple date, add time
-            dt = datetime.fromisoformat(f"{date_str}T00:00:00+00:00")
-        return dt.isoformat()
-    except (ValueError, TypeError):
-        return datetime.now(timezone.utc).isoformat()
+    # An entry without a usable date is stamped with the generation time
+    dt = parse_date(date_str, default=None)
+    return (dt or datetime.now(timezone.utc)).isoformat()
 
 def create_atom_feed(entries, feed_name):
     """Create an Atom feed from entries with whatever data is available"""
@@ -107,21 +107,22 @@ def create_atom_feed(entries, feed_name):
     for entry_data in entries:
         if not isinstance(entry_data, dict):
             continue
+        item = NewsItem.from_dict(entry_data)
             
         entry = SubElement(feed, 'entry')
         
         # Entry title
         entry_title = SubElement(entry, 'title')
-        title_text = safe_get_text(entry_data, 'title', 'Untitled')
+        title_text = safe_get_text(item, 'title', 'Untitled')
         entry_title.text = title_text
         
         # Entry ID
         entry_id = SubElement(entry, 'id')
-        id_text = safe_get_text(entry_data, 'id', safe_get_text(entry_data, 'url', f"urn:feed:{feed_name}:{hash(str(entry_data))}"))
+        id_text = safe_get_text(item, 'id', safe_get_text(item, 'url', f"urn:feed:{feed_name}:{hash(str(entry_data))}"))
         entry_id.text = id_text
         
         # Entry link
-        url = safe_get_text(entry_data, 'url')
+        url = safe_get_text(item, 'url')
         if url:
             entry_link = SubElement(entry, 'link')
             entry_link.set('href', url)
@@ -129,11 +130,14 @@ def create_atom_feed(entries, feed_name):
         
         # Entry updated/published date
         entry_updated = SubElement(entry, 'updated')
-        date_str = safe_get_text(entry_data, 'published_date', safe_get_text(entry_data, 'date'))
-        entry_updated.text = format_date(date_str)
+        # published_date was parsed with the item, only other values go through format_date
+        if item.published:
+            entry_updated.text = item.published.isoformat()
+        else:
+            entry_updated.text = format_date(safe_get_text(item, 'published_date', safe_get_text(item, 'date')))
         
         # Categories (if available)
-        categories = entry_data.get('categories', [])
+        categories = item.categories
         if isinstance(categories, list):
             for category in categories:
                 if category and str(category).strip():
@@ -144,12 +148,12 @@ def create_atom_feed(entries, feed_name):
         content_parts = []
         
         # Description (main content)
-        description = safe_get_text(entry_data, 'description')
+        description = safe_get_text(item, 'description')
         if description:
             content_parts.append(description)
         
         # Objects/Related items (actual content)
-        objects = entry_data.get('objects', [])
+        objects = item.objects
         if isinstance(objects, list) and objects:
             related_items = []
             for obj in objects:
@@ -176,7 +180,7 @@ def create_atom_feed(entries, feed_name):
             'metadata', 'objects'
         }
         
-        for key, value in entry_data.items():
+        for key, value in item.extra.items():
             if key not in excluded_fields and value:
                 if isinstance(value, (str, int, float)) and str(value).strip():
                     # Only include if it looks like actual content, not technical metadata
@@ -188,9 +192,9 @@ def create_atom_feed(entries, feed_name):
         summary = SubElement(entry, 'summary')
         
         # For Hacker News entries, add discussion link info
-        source = entry_data.get('source', '')
+        source = item.source
         if source == 'hackernews':
-            metadata = entry_data.get('metadata', {})
+            metadata = item.metadata
             score = metadata.get('score', 0)
             comments = metadata.get('comments', 0)
             author = metadata.get('author', '')
@@ -212,7 +216,7 @@ def create_atom_feed(entries, feed_name):
                 summary.text = hn_info
         elif source == 'github':
             # For GitHub entries, add repository statistics
-            metadata = entry_data.get('metadata', {})
+            metadata = item.metadata
             stars = metadata.get('stars', 0)
             forks = metadata.get('forks', 0)
             stars_today = metadata.get('stars_today', 0)
@@ -251,8 +255,15 @@ def generate_feeds():
     for json_file in json_files:
         filename = os.path.basename(json_file)
         feed_name = filename.replace('.json', '')
+        output_file = feeds_dir / f"{feed_name}.xml"
         
         try:
+            # Skip feeds whose parsed data and generator code are byte-identical to the last run
+            digest = files_digest([json_file, *feed_code_paths])
+            if is_unchanged('generator', filename, digest, [output_file]):
+                print(f"Skipping {filename} - unchanged since last run")
+                continue
+            
             with open(json_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
@@ -275,9 +286,9 @@ def generate_feeds():
             pretty_xml = reparsed.toprettyxml(indent="  ", encoding='utf-8')
             
             # Save to file
-            output_file = feeds_dir / f"{feed_name}.xml"
             with open(output_file, 'wb') as f:
                 f.write(pretty_xml)
+            mark_processed('generator', filename, digest)
             
             print(f"Generated: {output_file}")
             
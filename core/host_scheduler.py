@@ -0,0 +1,68 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+# Defaults applied to hosts without explicit settings in sites_config.json
+DEFAULT_HOST_CONCURRENCY = 2
+DEFAULT_REQUEST_DELAY = 0.0
+
+
+class HostScheduler:
+    """
+    Limits concurrent requests per host, on top of a global cap.
+
+    Each host gets its own semaphore and an optional politeness delay between
+    the start of consecutive requests, so pages from one origin never compete
+    with unrelated hosts for the global slots.
+    """
+
+    def __init__(self, max_concurrent=5):
+        self.max_concurrent = max_concurrent
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._hosts = {}
+
+    def configure_host(self, host, max_concurrent=None, request_delay=None):
+        """
+        Registers limits for a host. The first registration wins.
+
+        Args:
+            host (str): The host name (netloc) requests are sent to.
+            max_concurrent (int): Concurrent requests allowed for this host.
+            request_delay (float): Minimum seconds between request starts on this host.
+        """
+        if host in self._hosts:
+            return
+        limit = max(1, min(int(max_concurrent or DEFAULT_HOST_CONCURRENCY), self.max_concurrent))
+        self._hosts[host] = {
+            "semaphore": asyncio.Semaphore(limit),
+            "delay": float(request_delay if request_delay is not None else DEFAULT_REQUEST_DELAY),
+            "lock": asyncio.Lock(),
+            "last_start": 0.0,
+        }
+
+    @asynccontextmanager
+    async def slot(self, host):
+        """
+        Waits for a per-host slot, then the politeness delay, then a global slot.
+
+        The host slot is taken first so tasks queued behind a busy host do not
+        hold global slots that other hosts could use, and the delay is waited
+        out before the global slot for the same reason. The host lock is kept
+        until the global slot is taken, so the delay separates actual request starts.
+        """
+        self.configure_host(host)
+        state = self._hosts[host]
+        async with state["semaphore"]:
+            if state["delay"]:
+                async with state["lock"]:
+                    wait = state["last_start"] + state["delay"] - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    await self._global.acquire()
+                    state["last_start"] = time.monotonic()
+            else:
+                await self._global.acquire()
+            try:
+                yield
+            finally:
+                self._global.release()
@@ -0,0 +1,176 @@
+import logging
+import os
+import re
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+# Pluggable HTML parsing for the scrapers. Each scraper names its backend:
+#   "html.parser"  BeautifulSoup with Python's built-in parser, always available
+#   "lxml"         BeautifulSoup with the lxml tree builder, same API, several times faster
+#   "selectolax"   selectolax's Lexbor parser behind a small CSS-only node API, for
+#                  extractors that only use select/select_one/get_text/get/[]
+# A backend that is not installed falls back down the chain selectolax -> lxml ->
+# html.parser; every extractor written for selectolax also works on a soup.
+# AI_NEWS_PARSER=<backend> overrides the choice of every scraper (selectolax only
+# that of the scrapers written for it, the others then use lxml).
+#
+# List-page scrapers can also name the regions they read (parse_only): the soup
+# backends then only build those subtrees and skip the rest of the page, inline
+# scripts included. selectolax always builds the whole tree, which is cheap there.
+# The fast backends are the optional "parsers" extra: uv sync --extra parsers
+PARSER_ENV_VAR = "AI_NEWS_PARSER"
+
+HTML_PARSER = "html.parser"
+LXML = "lxml"
+SELECTOLAX = "selectolax"
+BACKENDS = [SELECTOLAX, LXML, HTML_PARSER]
+FALLBACKS = {SELECTOLAX: LXML, LXML: HTML_PARSER}
+
+_missing = set()
+
+
+class FastNode:
+    """A selectolax node exposing the subset of the BeautifulSoup API the CSS-only extractors use"""
+
+    __slots__ = ("_node", "_tree")
+
+    def __init__(self, node, tree=None):
+        self._node = node
+        # Nodes point into the parser's tree, which must outlive them
+        self._tree = tree
+
+    def select(self, selector):
+        return [FastNode(node, self._tree) for node in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return FastNode(node, self._tree) if node is not None else None
+
+    def get_text(self, separator="", strip=False):
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def get(self, name, default=None):
+        # Attribute values are the raw strings, class is not split into a list
+        value = self._node.attributes.get(name)
+        return default if value is None else value
+
+    def __getitem__(self, name):
+        value = self._node.attributes[name]
+        return "" if value is None else value
+
+    @property
+    def name(self):
+        return self._node.tag
+
+
+def _parse_selectolax(html_content, parse_only=None):
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(html_content)
+    return FastNode(tree.root, tree)
+
+
+def _parse_lxml(html_content, parse_only=None):
+    return BeautifulSoup(html_content, LXML, parse_only=parse_only)
+
+
+def _parse_html_parser(html_content, parse_only=None):
+    return BeautifulSoup(html_content, HTML_PARSER, parse_only=parse_only)
+
+
+_PARSERS = {SELECTOLAX: _parse_selectolax, LXML: _parse_lxml, HTML_PARSER: _parse_html_parser}
+
+
+class Regions(SoupStrainer):
+    """A SoupStrainer keeping every top-level element that any of several strainers accepts"""
+
+    def __init__(self, strainers):
+        super().__init__()
+        self.strainers = list(strainers)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string):
+        # Text outside the regions is dropped
+        return False
+
+
+def has_class(*names):
+    """
+    Matches a class attribute containing any of the given classes.
+
+    Strainers see the raw attribute string ("Box-row d-flex") rather than the
+    list of classes find_all() works with, so a plain class_='Box-row' would
+    only match elements with exactly that one class.
+
+    Args:
+        *names (str): Class names.
+
+    Returns:
+        re.Pattern: A pattern for SoupStrainer's class_ argument.
+    """
+    return re.compile(r"(?:^|\s)(?:" + "|".join(re.escape(name) for name in names) + r")(?:\s|$)")
+
+
+def resolve_backend(backend=HTML_PARSER):
+    """
+    Picks the backend to parse with.
+
+    Args:
+        backend (str): The backend the scraper asks for.
+
+    Returns:
+        str: AI_NEWS_PARSER if set, otherwise the requested backend. selectolax
+        only serves the CSS-only extractors written for it; other scrapers
+        asked to use it get lxml instead.
+    """
+    override = os.environ.get(PARSER_ENV_VAR)
+    if override == SELECTOLAX and backend != SELECTOLAX:
+        override = LXML
+    backend = override or backend
+    if backend not in _PARSERS:
+        raise ValueError(f"Unknown HTML parser backend '{backend}', expected one of {', '.join(BACKENDS)}")
+    return backend
+
+
+def available_backends():
+    """List the installed backends, fastest first"""
+    available = [HTML_PARSER]
+    try:
+        import lxml  # noqa: F401
+        available.insert(0, LXML)
+    except ImportError:
+        pass
+    try:
+        import selectolax.lexbor  # noqa: F401
+        available.insert(0, SELECTOLAX)
+    except ImportError:
+        pass
+    return available
+
+
+def parse_html(html_content, backend=HTML_PARSER, parse_only=None):
+    """
+    Parses an HTML document with the requested backend or the nearest installed one.
+
+    Args:
+        html_content (str): The HTML document.
+        backend (str): One of BACKENDS.
+        parse_only (SoupStrainer or list): The regions to build, the whole page if None.
+            A partial tree can miss content after a layout change, so callers
+            reparse the whole page when it yields nothing.
+
+    Returns:
+        BeautifulSoup or FastNode: The document root.
+    """
+    backend = resolve_backend(backend)
+    if isinstance(parse_only, (list, tuple)):
+        parse_only = Regions(parse_only)
+    while True:
+        try:
+            return _PARSERS[backend](html_content, parse_only)
+        except (ImportError, FeatureNotFound):
+            fallback = FALLBACKS[backend]
+            if backend not in _missing:
+                _missing.add(backend)
+                logging.warning(f"HTML parser backend '{backend}' is not installed, using '{fallback}'")
+            backend = fallback
@@ -0,0 +1,128 @@
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Persistent validator store for conditional GET requests, keyed by URL
+project_dir = Path(__file__).resolve().parent.parent
+state_dir = project_dir / "data" / "state"
+http_cache_file = state_dir / "http_cache.json"
+
+state_dir.mkdir(parents=True, exist_ok=True)
+
+
+def load_http_cache():
+    """
+    Loads the validator store from disk.
+
+    Returns:
+        dict: A mapping of URL to its cached validators, empty if no store exists yet.
+    """
+    try:
+        with open(http_cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable HTTP cache {http_cache_file}: {e}")
+        return {}
+
+
+def save_http_cache(cache):
+    """
+    Writes the validator store to disk.
+
+    Args:
+        cache (dict): A mapping of URL to its cached validators.
+    """
+    tmp_file = http_cache_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_file.replace(http_cache_file)
+
+
+def parse_max_age(cache_control):
+    """
+    Extracts the freshness lifetime in seconds from a Cache-Control header.
+
+    Args:
+        cache_control (str): The raw Cache-Control header value.
+
+    Returns:
+        int: The max-age in seconds, 0 when the response must be revalidated.
+    """
+    if not cache_control:
+        return 0
+
+    directives = cache_control.lower()
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0
+
+    match = re.search(r'(?:^|[,\s])max-age\s*=\s*"?(\d+)', directives)
+    return int(match.group(1)) if match else 0
+
+
+def build_entry(headers, previous=None):
+    """
+    Builds a cache entry from response headers.
+
+    A 304 response may omit validators, so values from the previous entry are
+    kept whenever the new response does not repeat them.
+
+    Args:
+        headers (Mapping): The response headers.
+        previous (dict): The entry stored for this URL before the request, if any.
+
+    Returns:
+        dict: The entry with 'etag', 'last_modified', 'max_age' and 'fetched_at'.
+    """
+    previous = previous or {}
+    return {
+        "etag": headers.get("etag") or previous.get("etag", ""),
+        "last_modified": headers.get("last-modified") or previous.get("last_modified", ""),
+        "max_age": parse_max_age(headers.get("cache-control", "")),
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def is_fresh(entry):
+    """
+    Checks whether a cache entry is still within its Cache-Control max-age.
+
+    Args:
+        entry (dict): A cache entry produced by build_entry.
+
+    Returns:
+        bool: True if the cached copy can be used without contacting the origin.
+    """
+    max_age = entry.get("max_age", 0)
+    if not max_age:
+        return False
+
+    try:
+        fetched_at = datetime.fromisoformat(entry["fetched_at"])
+    except (KeyError, TypeError, ValueError):
+        return False
+
+    age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+    return 0 <= age < max_age
+
+
+def conditional_headers(entry):
+    """
+    Builds the revalidation headers for a cache entry.
+
+    Args:
+        entry (dict): A cache entry produced by build_entry.
+
+    Returns:
+        dict: If-None-Match / If-Modified-Since headers, empty if no validators are known.
+    """
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
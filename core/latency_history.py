@@ -0,0 +1,115 @@
+import json
+import logging
+from pathlib import Path
+from core.fetch_stats import percentile
+
+# Recent request latencies per URL, persisted across runs.
+# The fetcher uses them to start the slowest URLs first and to size each URL's
+# timeout from its own history instead of a fixed value.
+project_dir = Path(__file__).resolve().parent.parent
+state_dir = project_dir / "data" / "state"
+history_file = state_dir / "latency_history.json"
+
+state_dir.mkdir(parents=True, exist_ok=True)
+
+# Samples kept per URL
+HISTORY_SIZE = 20
+# Samples needed before a URL gets its own timeout
+MIN_SAMPLES = 3
+# Timeout = TIMEOUT_FACTOR x the TIMEOUT_PERCENTILE of past total times, clamped
+TIMEOUT_PERCENTILE = 95
+TIMEOUT_FACTOR = 3
+MIN_TIMEOUT = 5
+MAX_TIMEOUT = 30
+
+
+def load_latency_history():
+    """
+    Loads the latency history.
+
+    Returns:
+        dict: A mapping of URL to {'host', 'samples'} with total times in ms, oldest first.
+    """
+    try:
+        with open(history_file, "r", encoding="utf-8") as f:
+            history = json.load(f)
+        return history if isinstance(history, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable latency history {history_file}: {e}")
+        return {}
+
+
+def save_latency_history(history):
+    """Write the latency history"""
+    tmp_file = history_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_file.replace(history_file)
+
+
+def record_latencies(history, results):
+    """
+    Appends the total time of every completed request to the history.
+
+    Failed requests are not recorded, so a timeout never teaches the fetcher to
+    wait longer next time.
+
+    Args:
+        history (dict): The latency history, updated in place.
+        results (list): Fetch results carrying 'url', 'host' and 'timing'.
+    """
+    for result in results:
+        if not isinstance(result, dict) or result.get("status") not in ("success", "not_modified"):
+            continue
+        total_ms = (result.get("timing") or {}).get("total_ms")
+        if not total_ms:
+            continue
+        entry = history.setdefault(result["url"], {"host": result.get("host", ""), "samples": []})
+        entry["samples"] = (entry["samples"] + [total_ms])[-HISTORY_SIZE:]
+
+
+def expected_latency(history, url, host):
+    """
+    Estimates how long a request will take.
+
+    URLs without history fall back to the median of their host, then to the
+    slowest median seen, so unknown pages are started early rather than last.
+
+    Args:
+        history (dict): The latency history.
+        url (str): The URL to estimate.
+        host (str): The URL's host.
+
+    Returns:
+        float: The expected total time in ms, 0 if nothing is known at all.
+    """
+    samples = history.get(url, {}).get("samples")
+    if samples:
+        return percentile(samples, 50)
+
+    medians = {u: percentile(e["samples"], 50) for u, e in history.items() if e.get("samples")}
+    host_medians = [medians[u] for u, e in history.items() if u in medians and e.get("host") == host]
+    if host_medians:
+        return percentile(host_medians, 50)
+    return max(medians.values(), default=0.0)
+
+
+def adaptive_timeout(history, url, default):
+    """
+    Derives a request timeout from a URL's own history.
+
+    Args:
+        history (dict): The latency history.
+        url (str): The URL being fetched.
+        default (float): The timeout used until enough samples exist.
+
+    Returns:
+        float: The timeout in seconds.
+    """
+    samples = history.get(url, {}).get("samples", [])
+    if len(samples) < MIN_SAMPLES:
+        return default
+    timeout = percentile(samples, TIMEOUT_PERCENTILE) / 1000 * TIMEOUT_FACTOR
+    return round(min(MAX_TIMEOUT, max(MIN_TIMEOUT, timeout)), 1)
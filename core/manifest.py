@@ -0,0 +1,288 @@
+import codecs
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from core.snapshots import read_snapshot, RUN_ENV_VAR
+from core.memo import restore_outputs, store_outputs
+
+# Content-hash manifest shared by the fetcher, the scrapers and the generator.
+# The fetcher records a normalized hash per cache file in content_manifest.json;
+# every downstream stage keeps the hashes it last processed in stages/<stage>.json
+# (one file per stage so stages never rewrite each other's records).
+project_dir = Path(__file__).resolve().parent.parent
+state_dir = project_dir / "data" / "state"
+manifest_file = state_dir / "content_manifest.json"
+stages_dir = state_dir / "stages"
+
+stages_dir.mkdir(parents=True, exist_ok=True)
+
+# Set AI_NEWS_FORCE=1 to ignore the manifest and reprocess everything
+FORCE_ENV_VAR = "AI_NEWS_FORCE"
+
+# Change timestamps kept per cache file for refresh scheduling (see core/refresh_schedule.py)
+CHANGE_HISTORY_SIZE = 10
+
+# Per-request values that change on every fetch without any content change
+VOLATILE_PATTERNS = [
+    # CSP nonces on script/style tags
+    (re.compile(r'\snonce="[^"]*"'), ''),
+    # CSRF / authenticity tokens in hidden inputs and meta tags
+    (re.compile(r'((?:name|id)="(?:csrf[-_]?token|_csrf|authenticity_token|_token|csrf-param)"[^>]*?(?:value|content)=")[^"]*"', re.IGNORECASE), r'\1"'),
+    (re.compile(r'"(?:csrfToken|csrf_token|authenticity_token)"\s*:\s*"[^"]*"'), '"csrf":""'),
+    # Request ids, visitor payloads and nonces GitHub and similar sites emit in meta tags
+    (re.compile(r'(<meta\s+name="(?:request-id|html-safe-nonce|visitor-payload|visitor-hmac|octolytics-[\w-]+|analytics-[\w-]+|fb:[\w-]+)"\s+content=")[^"]*"', re.IGNORECASE), r'\1"'),
+    (re.compile(r'\sdata-(?:request-id|nonce|turbo-[\w-]+|csrf)="[^"]*"'), ''),
+    # Framework build ids (Next.js, Mintlify, Docusaurus) and hashed asset paths
+    (re.compile(r'"buildId"\s*:\s*"[^"]*"'), '"buildId":""'),
+    (re.compile(r'/_next/static/[\w-]+/'), '/_next/static/'),
+    (re.compile(r'(\.(?:js|css))\?v=[\w.-]+'), r'\1'),
+]
+
+# Pages are normalized in segments of this many characters, so hashing a body
+# never holds more than about one segment of it. A segment ends early rather
+# than split a volatile token, looking back at most NORMALIZE_OVERLAP characters.
+NORMALIZE_SEGMENT = 256 * 1024
+NORMALIZE_OVERLAP = 16 * 1024
+
+
+def normalize_content(text):
+    """
+    Strips volatile tokens (nonces, CSRF tokens, request and build ids) from a page.
+
+    Args:
+        text (str): The raw page content.
+
+    Returns:
+        str: The content with volatile values blanked out.
+    """
+    for pattern, replacement in VOLATILE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _segment_end(text):
+    """Where the segment at the start of text ends: NORMALIZE_SEGMENT, moved back before any volatile token it would split"""
+    floor = NORMALIZE_SEGMENT - NORMALIZE_OVERLAP
+    end = NORMALIZE_SEGMENT
+    while end > floor:
+        split = [match.start() for pattern, _ in VOLATILE_PATTERNS
+                 for match in pattern.finditer(text, floor) if match.start() < end < match.end()]
+        if not split:
+            break
+        end = max(min(split), floor)
+    return end
+
+
+class ContentHasher:
+    """
+    Computes content_hash incrementally from a page's raw bytes.
+
+    The bytes are decoded as UTF-8 (invalid sequences replaced) and normalized
+    segment by segment, so a body streamed from the network or disk is hashed
+    without ever being held as a whole. Segments are cut at the same offsets
+    however the bytes are split into chunks.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._hasher = hashlib.sha256()
+        self._pending = []
+        self._pending_size = 0
+
+    def _add_text(self, text):
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size < NORMALIZE_SEGMENT + NORMALIZE_OVERLAP:
+            return
+        pending = ''.join(self._pending)
+        while len(pending) >= NORMALIZE_SEGMENT + NORMALIZE_OVERLAP:
+            end = _segment_end(pending[:NORMALIZE_SEGMENT + NORMALIZE_OVERLAP])
+            self._hasher.update(normalize_content(pending[:end]).encode('utf-8'))
+            pending = pending[end:]
+        self._pending = [pending]
+        self._pending_size = len(pending)
+
+    def update(self, data):
+        """Add the next chunk of the page's bytes"""
+        self._add_text(self._decoder.decode(data))
+
+    def hexdigest(self):
+        """The hex digest of the normalized content added so far"""
+        # Flush a trailing partial character without consuming it, as more bytes may follow
+        state = self._decoder.getstate()
+        tail = self._decoder.decode(b'', final=True)
+        self._decoder.setstate(state)
+        hasher = self._hasher.copy()
+        hasher.update(normalize_content(''.join(self._pending) + tail).encode('utf-8'))
+        return hasher.hexdigest()
+
+
+def content_hash(text):
+    """
+    Computes the normalized SHA-256 hash of a page.
+
+    Args:
+        text (str): The raw page content.
+
+    Returns:
+        str: The hex digest of the normalized content.
+    """
+    hasher = ContentHasher()
+    hasher._add_text(text)
+    return hasher.hexdigest()
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable manifest {path}: {e}")
+        return {}
+
+
+def _write_json(path, data):
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def load_manifest():
+    """Load the fetcher's content manifest, keyed by cache filename"""
+    return _read_json(manifest_file)
+
+
+def save_manifest(manifest):
+    """Write the fetcher's content manifest"""
+    _write_json(manifest_file, manifest)
+
+
+def record_hash(manifest, cache_filename, digest):
+    """
+    Records the normalized hash of a freshly fetched page.
+
+    Args:
+        manifest (dict): The content manifest, updated in place.
+        cache_filename (str): The cache file the page was saved to.
+        digest (str): The page's content_hash.
+
+    Returns:
+        bool: True if the content differs from the previously recorded hash.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    entry = manifest.get(cache_filename, {})
+    changed = entry.get('hash') != digest
+
+    entry['hash'] = digest
+    entry['checked_at'] = now
+    if changed:
+        entry['changed_at'] = now
+        entry['changes'] = (entry.get('changes', []) + [now])[-CHANGE_HISTORY_SIZE:]
+    manifest[cache_filename] = entry
+    return changed
+
+
+def touch_content(manifest, cache_filename):
+    """Mark a cache file as checked without a content change (e.g. HTTP 304)"""
+    entry = manifest.get(cache_filename)
+    if entry:
+        entry['checked_at'] = datetime.now(timezone.utc).isoformat()
+
+
+def input_digest(cache_filenames, code_paths=()):
+    """
+    Combines the recorded hashes of one or more cache files into a single digest.
+
+    Files the fetcher has not recorded yet, and every file when a past snapshot
+    run is pinned via AI_NEWS_SNAPSHOT_RUN, are hashed from the snapshot store.
+
+    Args:
+        cache_filenames (list): Cache filenames a stage reads.
+        code_paths (iterable): Source files of the stage (e.g. the scraper's __file__),
+            so that editing them invalidates earlier results.
+
+    Returns:
+        str: The combined digest, or None if any input file is missing.
+    """
+    manifest = {} if os.environ.get(RUN_ENV_VAR) else load_manifest()
+    parts = []
+    for cache_filename in cache_filenames:
+        digest = manifest.get(cache_filename, {}).get('hash')
+        if not digest:
+            text = read_snapshot(cache_filename)
+            if text is None:
+                return None
+            digest = content_hash(text)
+        parts.append(f"{cache_filename}:{digest}")
+    for path in code_paths:
+        parts.append(f"code:{Path(path).name}:{file_digest(path)}")
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+
+def file_digest(file_path):
+    """Compute the SHA-256 hash of a file's bytes"""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def files_digest(file_paths):
+    """Combine the SHA-256 hashes of several files into a single digest"""
+    parts = [f"{Path(path).name}:{file_digest(path)}" for path in file_paths]
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+
+def is_unchanged(stage, key, digest, output_paths=()):
+    """
+    Checks whether a stage already processed this exact input.
+
+    An input the stage processed before, but not last time (e.g. a page that
+    changed back), is served from the parsed-output memo: its outputs are
+    restored and the stage can skip parsing as well.
+
+    Args:
+        stage (str): The stage name (scraper organization key or 'generator').
+        key (str): The input the digest belongs to.
+        digest (str): The current input digest.
+        output_paths (iterable): Outputs that must still exist for a skip to be safe.
+
+    Returns:
+        bool: True if the stage can skip this input.
+    """
+    if os.environ.get(FORCE_ENV_VAR) or not digest:
+        return False
+    output_paths = list(output_paths)
+    records = _read_json(stages_dir / f"{stage}.json")
+    if records.get(key) == digest and all(Path(path).exists() for path in output_paths):
+        return True
+    if output_paths and restore_outputs(stage, digest, output_paths):
+        mark_processed(stage, key, digest)
+        return True
+    return False
+
+
+def mark_processed(stage, key, digest, output_paths=()):
+    """
+    Remembers the input digest a stage just processed.
+
+    Args:
+        stage (str): The stage name.
+        key (str): The input the digest belongs to.
+        digest (str): The processed input digest.
+        output_paths (iterable): Outputs written for this input, memoized for later runs.
+    """
+    if not digest:
+        return
+    stage_file = stages_dir / f"{stage}.json"
+    records = _read_json(stage_file)
+    records[key] = digest
+    _write_json(stage_file, records)
+    if output_paths:
+        store_outputs(stage, digest, output_paths)
@@ -0,0 +1,117 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+# Parsed-output memo shared by the scrapers.
+# Maps (stage, input digest) to the bytes of the files the stage wrote for that
+# input; the digest covers the input pages and the scraper's own source (see
+# core.manifest.input_digest), so a code change never serves stale output.
+# A hit restores the outputs without parsing, and rewrites only files whose
+# bytes differ. One gzip file per entry, so parallel scrapers never share a
+# file; the file's mtime is its last use, which drives LRU and age eviction.
+project_dir = Path(__file__).resolve().parent.parent
+memo_dir = project_dir / "data" / "memo"
+
+memo_dir.mkdir(parents=True, exist_ok=True)
+
+# Entries unused for this long are dropped
+MAX_AGE_DAYS = 30
+# Beyond this many entries the least recently used ones are dropped
+MAX_ENTRIES = 500
+
+
+def _entry_path(stage, digest):
+    key = hashlib.sha256(f"{stage}:{digest}".encode("utf-8")).hexdigest()
+    return memo_dir / f"{key}.json.gz"
+
+
+def _write_bytes(path, data):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    tmp_path.replace(path)
+
+
+def store_outputs(stage, digest, output_paths):
+    """
+    Memoizes the outputs a stage just wrote for an input.
+
+    Args:
+        stage (str): The stage name (scraper organization key).
+        digest (str): The input digest the outputs were produced from.
+        output_paths (iterable): The files the stage wrote.
+    """
+    if not digest:
+        return
+    try:
+        outputs = {}
+        for path in output_paths:
+            with open(path, "rb") as f:
+                outputs[Path(path).name] = f.read().decode("utf-8")
+        entry = {"stage": stage, "digest": digest, "outputs": outputs}
+        _write_bytes(_entry_path(stage, digest), gzip.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"), mtime=0))
+    except Exception as e:
+        logging.warning(f"Could not memoize {stage} outputs: {e}")
+        return
+    evict()
+
+
+def restore_outputs(stage, digest, output_paths):
+    """
+    Restores a stage's outputs for an input it has processed before.
+
+    Args:
+        stage (str): The stage name (scraper organization key).
+        digest (str): The current input digest.
+        output_paths (iterable): The files the stage would write.
+
+    Returns:
+        bool: True if every output was restored (or already matched), so parsing can be skipped.
+    """
+    if not digest:
+        return False
+    entry_path = _entry_path(stage, digest)
+    try:
+        with open(entry_path, "rb") as f:
+            entry = json.loads(gzip.decompress(f.read()))
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable memo entry {entry_path.name}: {e}")
+        return False
+
+    outputs = entry.get("outputs", {})
+    output_paths = [Path(path) for path in output_paths]
+    if entry.get("digest") != digest or any(path.name not in outputs for path in output_paths):
+        return False
+    for path in output_paths:
+        data = outputs[path.name].encode("utf-8")
+        try:
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    continue
+        except FileNotFoundError:
+            pass
+        _write_bytes(path, data)
+        logging.info(f"Restored {path.name} from the {stage} memo")
+    os.utime(entry_path)
+    return True
+
+
+def evict(max_age_days=MAX_AGE_DAYS, max_entries=MAX_ENTRIES):
+    """Drop memo entries unused for max_age_days, then the least recently used beyond max_entries"""
+    entries = []
+    for path in memo_dir.glob("*.json.gz"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    entries.sort(reverse=True)
+    cutoff = time.time() - max_age_days * 86400
+    for position, (used_at, path) in enumerate(entries):
+        if position >= max_entries or used_at < cutoff:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import ClassVar
+from core.dates import parse_date
+
+# The common record of the parsed outputs (data/parsed/*.json), shared by the
+# scrapers and the feed generator. published_date is parsed once (core/dates.py),
+# when the item is built, and kept next to the ISO string, so sorting, dedup and
+# date checks never reparse it. to_dict() gives back the JSON shape the outputs
+# have always had.
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """One parsed news entry"""
+    id: str = None
+    source: str = None
+    type: str = None
+    title: str = None
+    description: str = None
+    url: str = None
+    published_date: str = None
+    categories: list = field(default_factory=list)
+    organization: str = None
+    metadata: dict = field(default_factory=dict)
+    objects: list = field(default_factory=list)
+    # Keys outside the common schema (localized texts, external_url, ...), written after it
+    extra: dict = field(default_factory=dict)
+    # published_date as a datetime, None if missing or unparseable
+    published: datetime = field(default=None, init=False, repr=False, compare=False)
+
+    FIELDS: ClassVar[tuple] = (
+        'id', 'source', 'type', 'title', 'description', 'url', 'published_date',
+        'categories', 'organization', 'metadata', 'objects',
+    )
+
+    def __post_init__(self):
+        self.published = parse_date(self.published_date, default=None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an item from its JSON form"""
+        fields = {}
+        extra = {}
+        for key, value in data.items():
+            if key in cls.FIELDS:
+                fields[key] = value
+            else:
+                extra[key] = value
+        return cls(**fields, extra=extra)
+
+    @classmethod
+    def coerce(cls, item):
+        """Return item as a NewsItem, converting a dict"""
+        return item if isinstance(item, cls) else cls.from_dict(item)
+
+    def to_dict(self):
+        """Return the item's JSON form: the common fields in schema order, then the extra keys"""
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data.update(self.extra)
+        return data
+
+    def get(self, key, default=None):
+        """Read a field or extra key like dict.get, missing and None values give default"""
+        value = getattr(self, key) if key in self.FIELDS else self.extra.get(key)
+        return default if value is None else value
+
+    def set_published(self, dt):
+        """Replace the published date, keeping the ISO string in step"""
+        self.published = dt
+        self.published_date = dt.isoformat()
+
+
+def json_default(obj):
+    """json.dump default= hook writing NewsItems in their JSON form"""
+    if isinstance(obj, NewsItem):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,105 @@
+import argparse
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from core.html_parser import PARSER_ENV_VAR, HTML_PARSER, SELECTOLAX, available_backends
+from core.news_item import NewsItem
+from core.snapshots import snapshot_exists
+from scrapers import SCRAPER_MODULES, get_scraper
+
+# Compares the HTML parser backends on the cached pages.
+# Usage: python -m core.parser_benchmark [--sources github,meta] [--repeat N] [--full]
+# Every installed backend runs each HTML scraper's extract step on each of its
+# cached pages (selectolax only for the scrapers that select it); the output is
+# compared with html.parser's and the best time kept.
+# Scrapers with parse_only regions are timed on those unless --full is given.
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+project_dir = Path(__file__).resolve().parent.parent
+config_file = project_dir / "config" / "sites_config.json"
+
+def load_cache_files(sources=None):
+    """Map each selected source to its cached HTML pages"""
+    with open(config_file, "r", encoding="utf-8") as f:
+        sites = json.load(f)
+    cache_files = {}
+    for site in sites:
+        source = site.get("organization_key")
+        if source in SCRAPER_MODULES and (not sources or source in sources):
+            cache_files[source] = [name for name in site.get("cache_files", {}).values() if name.endswith(".html")]
+    return cache_files
+
+
+def _normalize(items):
+    # Pages without a date fall back to the parse time, keep only the day
+    def strip(item):
+        if isinstance(item, NewsItem):
+            item = item.to_dict()
+        if isinstance(item, dict) and isinstance(item.get("published_date"), str):
+            return {**item, "published_date": item["published_date"][:10]}
+        return item
+    return json.dumps([strip(item) for item in items] if isinstance(items, list) else items, sort_keys=True, default=str)
+
+
+def run_backend(backend, scraper, cache_filename, repeat, regions=None):
+    """
+    Runs one extraction with a forced backend.
+
+    Returns:
+        tuple: (normalized output, best time in ms).
+    """
+    os.environ[PARSER_ENV_VAR] = backend
+    try:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = scraper.extract(cache_filename, regions)
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return _normalize(output), best
+    finally:
+        os.environ.pop(PARSER_ENV_VAR, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.parser_benchmark", description="Compare HTML parser backends on cached pages.")
+    parser.add_argument("--sources", help="Comma-separated organization keys, all HTML scrapers by default")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend and page, the best time is reported")
+    parser.add_argument("--full", action="store_true", help="Parse whole pages, ignoring the scrapers' parse_only regions")
+    args = parser.parse_args(argv)
+    sources = [s.strip() for s in args.sources.split(",")] if args.sources else None
+
+    backends = available_backends()
+    logging.info(f"Backends installed: {', '.join(backends)}")
+
+    mismatches = 0
+    for source, cache_files in load_cache_files(sources).items():
+        scraper = get_scraper(source)
+        if scraper.parser is None:
+            continue
+        regions = None if args.full else scraper.parse_only
+        for cache_filename in cache_files:
+            if not snapshot_exists(cache_filename):
+                logging.info(f"{source}: no snapshot for {cache_filename}, skipped")
+                continue
+            baseline, baseline_ms = run_backend(HTML_PARSER, scraper, cache_filename, args.repeat, regions)
+            results = [f"{HTML_PARSER} {baseline_ms:.1f}ms"]
+            for backend in backends:
+                if backend == HTML_PARSER or (backend == SELECTOLAX and scraper.parser != SELECTOLAX):
+                    # Only the CSS-only extractors written for selectolax can run on it
+                    continue
+                output, elapsed = run_backend(backend, scraper, cache_filename, args.repeat, regions)
+                same = output == baseline
+                mismatches += not same
+                results.append(f"{backend} {elapsed:.1f}ms ({baseline_ms / elapsed:.1f}x, {'same output' if same else 'OUTPUT DIFFERS'})")
+            logging.info(f"{source}/{cache_filename} (selected {scraper.parser}): {'; '.join(results)}")
+
+    if mismatches:
+        logging.warning(f"{mismatches} backend runs produced different output than {HTML_PARSER}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
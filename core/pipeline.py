@@ -0,0 +1,258 @@
+import argparse
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from core.cassette import apply_cli_flags
+from scrapers import SCRAPER_MODULES, NETWORK_SCRAPERS, get_scraper
+
+# Runs fetch, every scraper and the generator from one entry point.
+# Usage: python -m core.pipeline [--stages fetch,scrape,generate] [--sources anthropic,github]
+#                                [--workers N] [--record | --replay] [--latency=<factor>]
+# Scrapers run in a process pool; when fetching too, each one starts as soon as
+# the last page of its site has been fetched, so parsing overlaps with the network.
+# Scrapers that send requests parse in the pool too, but send their requests from
+# this process's event loop, so they share the fetcher's rate limiter
+# (core/rate_limit.py buckets are per process).
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+STAGES = ["fetch", "scrape", "generate"]
+
+# Fetch results waiting to be dispatched to the pool
+QUEUE_SIZE = 32
+
+# Scrapers by organization_key (see config/sites_config.json), in run order
+SCRAPERS = list(SCRAPER_MODULES)
+
+
+def run_fetch(sources):
+    """Fetch the pages of the selected sources"""
+    from core import fetcher
+    fetcher.main(sources)
+
+
+def run_scraper(source):
+    """
+    Runs one scraper in this process, importing only its module.
+
+    Args:
+        source (str): The scraper's organization_key.
+    """
+    result = get_scraper(source).run()
+    if inspect.iscoroutine(result):
+        asyncio.run(result)
+
+
+def parse_scraper_pages(source):
+    """Runs the request-free part of one of NETWORK_SCRAPERS, in a worker process"""
+    return get_scraper(source).parse_pages()
+
+
+async def run_network_scraper(loop, pool, source):
+    """
+    Runs one of NETWORK_SCRAPERS: its pages are parsed in the pool, then its
+    requests are sent from this event loop, so they draw from the same rate
+    limiter as the fetcher without parsing blocking the fetcher's requests.
+
+    Args:
+        loop (AbstractEventLoop): The running event loop.
+        pool (ProcessPoolExecutor): The scraper worker pool.
+        source (str): The scraper's organization_key.
+    """
+    # Importing the scraper's module (bs4, parser backends) is slow enough to stall the fetcher too
+    scraper = await asyncio.to_thread(get_scraper, source)
+    parsed = None
+    if scraper.parser is not None:
+        parsed = await loop.run_in_executor(pool, parse_scraper_pages, source)
+    await scraper.send_requests(parsed)
+
+
+def _start_scraper(loop, pool, source):
+    if source in NETWORK_SCRAPERS:
+        return asyncio.ensure_future(run_network_scraper(loop, pool, source))
+    return loop.run_in_executor(pool, run_scraper, source)
+
+
+def _start_pool(workers):
+    # Spawned workers do not inherit the parent's event loop, curl handles or threads
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+async def _await_scrapers(futures, outcomes):
+    for source, future in futures.items():
+        try:
+            await future
+            outcomes[f"scrape:{source}"] = "success"
+        except Exception:
+            logging.exception(f"scrape:{source} failed")
+            outcomes[f"scrape:{source}"] = "failure"
+        logging.info(f"scrape:{source} finished ({outcomes[f'scrape:{source}']})")
+
+
+async def run_fetch_and_scrape(sources, workers, outcomes):
+    """
+    Fetches pages and runs each site's scraper once all of its pages are in.
+
+    Completed fetches arrive on a bounded queue; a dispatcher counts down the
+    pages outstanding per site and submits the scraper when the count reaches
+    zero, whatever the fetch outcome (a scraper falls back to the previous
+    snapshot). API scrapers without fetched pages start immediately. Scrapers
+    run in a worker process; NETWORK_SCRAPERS parse there too, and send their
+    requests from this event loop alongside the fetcher.
+
+    Args:
+        sources (list): The organization keys to run, all if None.
+        workers (int): The size of the process pool.
+        outcomes (dict): Step outcomes, updated in place.
+    """
+    from core import fetcher
+
+    selected = sources or list(SCRAPERS)
+    urls_data = fetcher.due_urls(fetcher.load_urls_data(sources))
+    pending = {}
+    for url_data in urls_data:
+        pending[url_data['organization_key']] = pending.get(url_data['organization_key'], 0) + 1
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    futures = {}
+
+    async def on_complete(url_data, result):
+        await queue.put(url_data['organization_key'])
+
+    async def dispatch(pool):
+        while True:
+            source = await queue.get()
+            if source is None:
+                return
+            pending[source] -= 1
+            if pending[source] == 0 and source in selected:
+                logging.info(f"All pages of {source} fetched, starting its scraper")
+                futures[source] = _start_scraper(loop, pool, source)
+
+    with _start_pool(workers) as pool:
+        for source in selected:
+            if not pending.get(source):
+                futures[source] = _start_scraper(loop, pool, source)
+        dispatcher = asyncio.create_task(dispatch(pool))
+
+        started = time.monotonic()
+        try:
+            logging.info(f"Total URLs to fetch: {len(urls_data)}")
+            await fetcher.fetch_all_urls(urls_data, max_concurrent=5, on_complete=on_complete)
+            outcomes["fetch"] = "success"
+        except Exception:
+            logging.exception("fetch failed")
+            outcomes["fetch"] = "failure"
+        logging.info(f"fetch finished in {time.monotonic() - started:.1f}s ({outcomes['fetch']})")
+
+        await queue.put(None)
+        await dispatcher
+        # Sites whose pages were never announced (e.g. the fetch itself crashed)
+        for source in selected:
+            if source not in futures:
+                futures[source] = _start_scraper(loop, pool, source)
+        await _await_scrapers(futures, outcomes)
+
+
+async def run_scrapers_parallel(sources, workers, outcomes):
+    """Run the selected scrapers in a process pool, the requests of NETWORK_SCRAPERS from this event loop"""
+    loop = asyncio.get_running_loop()
+    with _start_pool(workers) as pool:
+        futures = {source: _start_scraper(loop, pool, source) for source in sources or SCRAPERS}
+        await _await_scrapers(futures, outcomes)
+
+
+def run_generate():
+    """Regenerate the feeds from data/parsed"""
+    from core import generator
+    generator.generate_feeds()
+
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.pipeline", description="Run the AI News pipeline in one process.")
+    parser.add_argument("--stages", help=f"Comma-separated stages to run ({','.join(STAGES)}), all by default")
+    parser.add_argument("--sources", help=f"Comma-separated organization keys to fetch and scrape ({','.join(SCRAPERS)}), all by default")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Scraper processes; 0 runs fetch and every scraper one after another in this process")
+    parser.add_argument("--record", action="store_true", help="Record HTTP traffic to data/cassettes")
+    parser.add_argument("--replay", action="store_true", help="Serve HTTP traffic from data/cassettes")
+    parser.add_argument("--latency", help="Scale recorded response times by this factor when replaying")
+    args = parser.parse_args(argv)
+
+    args.stages = _split(args.stages) or STAGES
+    args.sources = _split(args.sources)
+    unknown = [stage for stage in args.stages if stage not in STAGES] + \
+        [source for source in (args.sources or []) if source not in SCRAPERS]
+    if unknown:
+        parser.error(f"Unknown stages or sources: {', '.join(unknown)}")
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    return args
+
+
+def main(argv=None):
+    """
+    Runs the selected stages and sources.
+
+    A failing fetch or scraper is logged and the run continues, like the
+    separate workflow steps did, and is reported as a GitHub Actions warning
+    when running in a workflow. The generator always runs after every scraper
+    has finished.
+
+    Returns:
+        int: The exit code, 1 if the generate stage failed (the feeds were not updated).
+    """
+    args = parse_args(argv)
+    cassette_flags = [flag for flag, enabled in (("--record", args.record), ("--replay", args.replay)) if enabled]
+    if args.latency:
+        cassette_flags.append(f"--latency={args.latency}")
+    apply_cli_flags(cassette_flags)
+
+    outcomes = {}
+
+    def run_step(name, func, *func_args):
+        started = time.monotonic()
+        try:
+            func(*func_args)
+            outcomes[name] = "success"
+        except Exception:
+            logging.exception(f"{name} failed")
+            outcomes[name] = "failure"
+        logging.info(f"{name} finished in {time.monotonic() - started:.1f}s ({outcomes[name]})")
+
+    if args.workers > 0 and "scrape" in args.stages:
+        if "fetch" in args.stages:
+            asyncio.run(run_fetch_and_scrape(args.sources, args.workers, outcomes))
+        else:
+            asyncio.run(run_scrapers_parallel(args.sources, args.workers, outcomes))
+    else:
+        if "fetch" in args.stages:
+            run_step("fetch", run_fetch, args.sources)
+        if "scrape" in args.stages:
+            for source in args.sources or SCRAPERS:
+                run_step(f"scrape:{source}", run_scraper, source)
+    if "generate" in args.stages:
+        run_step("generate", run_generate)
+
+    failed = [name for name, outcome in outcomes.items() if outcome == "failure"]
+    logging.info(f"Pipeline summary: {len(outcomes) - len(failed)}/{len(outcomes)} steps succeeded"
+                 + (f", failed: {', '.join(failed)}" if failed else ""))
+    if os.environ.get("GITHUB_ACTIONS") == "true":
+        # Annotate the job, which only fails when the feeds could not be generated
+        for name in failed:
+            if name != "generate":
+                print(f"::warning title=Pipeline step failed::{name} failed, its feeds may be stale (see the pipeline log)")
+    return 1 if outcomes.get("generate") == "failure" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Per-host token buckets shared by every request a process sends.
+# Sessions from core.cassette.open_session take a token before each request,
+# so the fetcher, the API scrapers and the GitHub lookups draw from one budget
+# per host (PATH_LIMITS gives a few paths a budget of their own). A 429 (or a
+# 503 with Retry-After) pauses the bucket for the announced delay, or an
+# exponential backoff without one.
+# Buckets are per process. core.pipeline therefore sends the requests of the
+# scrapers that make them (scrapers.NETWORK_SCRAPERS) from its own process next to
+# the fetcher; its worker processes only parse. Running stages as separate
+# commands gives each its own budget.
+project_dir = Path(__file__).resolve().parent.parent
+config_file = project_dir / "config" / "sites_config.json"
+
+# Requests per second and burst size for hosts without their own settings
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 5
+# API hosts the scrapers call directly, which have no site entry in sites_config.json
+API_HOST_LIMITS = {
+    "hacker-news.firebaseio.com": (10.0, 10),
+}
+# Paths with a bucket of their own, apart from the rest of their host: (host, path suffix).
+# GitHub's release and commit atom feeds are small cached documents the trending
+# scraper requests by the hundred, while the trending pages keep the site's limit.
+PATH_LIMITS = {
+    ("github.com", ".atom"): (10.0, 20),
+}
+# Backoff after a 429 without Retry-After: BACKOFF_BASE * 2^(strikes - 1), capped
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header.
+
+    Args:
+        value (str): The header value, either delay-seconds or an HTTP date.
+
+    Returns:
+        float: The delay in seconds, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def bucket_key(url):
+    """
+    Names the bucket a request draws from.
+
+    Args:
+        url (str): The requested URL, or a bare host name.
+
+    Returns:
+        str: The host, or "host/*suffix" for paths listed in PATH_LIMITS.
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or url
+    for limited_host, suffix in PATH_LIMITS:
+        if host == limited_host and parts.path.endswith(suffix):
+            return f"{host}/*{suffix}"
+    return host
+
+
+class TokenBucket:
+    """A token bucket that hands out reservations"""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+
+    def reserve(self):
+        """
+        Takes one token, going into debt if none is left.
+
+        Returns:
+            float: Seconds the caller must wait before sending its request.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 0:
+            wait = max(wait, -self.tokens / self.rate)
+        return wait
+
+    def available(self):
+        """Return how many tokens could be taken right now without waiting"""
+        if self.blocked_until > time.monotonic():
+            return 0.0
+        return max(0.0, min(self.burst, self.tokens + (time.monotonic() - self.updated) * self.rate))
+
+
+class RateLimiter:
+    """Keeps one token bucket per host, and per path listed in PATH_LIMITS"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._site_limits = None
+
+    def _load_site_limits(self):
+        limits = dict(API_HOST_LIMITS)
+        limits.update({f"{host}/*{suffix}": rate_burst for (host, suffix), rate_burst in PATH_LIMITS.items()})
+        try:
+            with open(config_file, "r", encoding="utf-8") as f:
+                for site in json.load(f):
+                    if site.get("rate_limit"):
+                        host = urlsplit(site["site"]).hostname
+                        limits[host] = (site["rate_limit"], site.get("burst", DEFAULT_BURST))
+        except Exception as e:
+            logging.warning(f"Could not read rate limits from {config_file}: {e}")
+        return limits
+
+    def configure_host(self, host, rate, burst=DEFAULT_BURST):
+        """
+        Sets the rate (requests per second) and burst size of a host.
+
+        Args:
+            host (str): The host name.
+            rate (float): Sustained requests per second.
+            burst (int): Requests allowed back to back after an idle period.
+        """
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, burst)
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if self._site_limits is None:
+                self._site_limits = self._load_site_limits()
+            rate, burst = self._site_limits.get(key, (DEFAULT_RATE, DEFAULT_BURST))
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+    def burst(self, url):
+        """Return the burst size of a URL's (or host's) bucket, the most requests it lets through back to back"""
+        with self._lock:
+            return self._bucket(bucket_key(url)).burst
+
+    def available(self, url):
+        """Return how many requests to a URL's bucket could be sent right now without waiting"""
+        with self._lock:
+            return self._bucket(bucket_key(url)).available()
+
+    def _reserve(self, url):
+        with self._lock:
+            return self._bucket(bucket_key(url)).reserve()
+
+    async def acquire(self, url):
+        """Wait for a token for the URL's host"""
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, url, status_code, headers=None):
+        """
+        Adjusts a host's bucket to a response.
+
+        Throttling responses pause the host; any other response clears its backoff.
+
+        Args:
+            url (str): The requested URL.
+            status_code (int): The response status.
+            headers (Mapping): The response headers.
+        """
+        key = bucket_key(url)
+        retry_after = parse_retry_after((headers or {}).get("retry-after", ""))
+        with self._lock:
+            bucket = self._bucket(key)
+            if status_code not in THROTTLE_STATUS_CODES or (status_code == 503 and retry_after is None):
+                bucket.strikes = 0
+                return
+            bucket.strikes += 1
+            delay = retry_after if retry_after is not None else min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (bucket.strikes - 1))
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+        logging.warning(f"Throttled by {key} (HTTP {status_code}), pausing requests for {delay:.0f}s")
+
+
+# The limiter shared by everything in this process
+limiter = RateLimiter()
@@ -0,0 +1,106 @@
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from core.fetch_stats import percentile
+from core.manifest import FORCE_ENV_VAR
+
+# Per-source refresh scheduling from the change history in the content manifest.
+# A source is refreshed at half its typical interval between content changes,
+# clamped to the site's min_refresh_hours / max_refresh_hours.
+
+DEFAULT_MIN_REFRESH_HOURS = 1
+DEFAULT_MAX_REFRESH_HOURS = 72
+# A source counts as due slightly early, so a scheduled run starting a little
+# sooner than the previous one does not push the refresh back a whole cycle
+DUE_SLACK = 0.1
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def refresh_interval(manifest_entry, min_hours=None, max_hours=None):
+    """
+    Computes how often a cache file should be refetched.
+
+    Until two changes have been observed the minimum interval is used, so new
+    sources are polled eagerly while their history builds up.
+
+    Args:
+        manifest_entry (dict): The cache file's content manifest entry.
+        min_hours (float): The shortest interval allowed.
+        max_hours (float): The longest interval allowed.
+
+    Returns:
+        timedelta: The refresh interval.
+    """
+    min_hours = DEFAULT_MIN_REFRESH_HOURS if min_hours is None else min_hours
+    max_hours = DEFAULT_MAX_REFRESH_HOURS if max_hours is None else max(max_hours, min_hours)
+
+    changes = sorted(filter(None, (_parse_time(value) for value in manifest_entry.get('changes', []))))
+    gaps = [(later - earlier).total_seconds() / 3600 for earlier, later in zip(changes, changes[1:])]
+    hours = percentile(gaps, 50) / 2 if gaps else min_hours
+    return timedelta(hours=min(max_hours, max(min_hours, hours)))
+
+
+def next_due(manifest_entries, min_hours=None, max_hours=None):
+    """
+    Computes when a source is next due, from the entries of all its cache files.
+
+    Args:
+        manifest_entries (list): Content manifest entries of the source's cache files.
+        min_hours (float): The site's min_refresh_hours.
+        max_hours (float): The site's max_refresh_hours.
+
+    Returns:
+        datetime: The next due time, or None if a cache file was never checked.
+    """
+    due_times = []
+    for entry in manifest_entries:
+        checked_at = _parse_time(entry.get('checked_at')) if entry else None
+        if not checked_at:
+            return None
+        interval = refresh_interval(entry, min_hours, max_hours)
+        due_times.append(checked_at + interval * (1 - DUE_SLACK))
+    return min(due_times) if due_times else None
+
+
+def filter_due(urls_data, manifest, now=None):
+    """
+    Keeps the URLs of sources that are due for a refresh.
+
+    All pages of a source are refreshed together, when its earliest page is
+    due. Setting AI_NEWS_FORCE=1 fetches everything.
+
+    Args:
+        urls_data (list): URL dictionaries with 'organization_key', 'cache_filename'
+            and optional 'min_refresh_hours' / 'max_refresh_hours'.
+        manifest (dict): The content manifest.
+        now (datetime): The reference time, the current UTC time by default.
+
+    Returns:
+        list: The URL dictionaries to fetch.
+    """
+    if os.environ.get(FORCE_ENV_VAR):
+        return urls_data
+    now = now or datetime.now(timezone.utc)
+
+    sources = {}
+    for url_data in urls_data:
+        sources.setdefault(url_data.get('organization_key', ''), []).append(url_data)
+
+    due_urls = []
+    for source, source_urls in sources.items():
+        due = next_due(
+            [manifest.get(url_data.get('cache_filename', '')) for url_data in source_urls],
+            source_urls[0].get('min_refresh_hours'),
+            source_urls[0].get('max_refresh_hours'),
+        )
+        if due is None or due <= now:
+            due_urls.extend(source_urls)
+        else:
+            logging.info(f"Skipping {source}, next refresh due {due.strftime('%Y-%m-%d %H:%M UTC')}")
+    return due_urls
@@ -0,0 +1,234 @@
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from http.cookiejar import Cookie
+from pathlib import Path
+from urllib.parse import urlsplit
+from curl_cffi import CurlOpt
+from curl_cffi.requests import AsyncSession
+from core.rate_limit import limiter
+
+# HTTP session state persisted across runs and shared by every stage that uses
+# core.cassette.open_session: the cookie jar (so bot-protection clearance cookies
+# survive between runs) and the addresses hosts resolved to, which are pinned
+# with CURLOPT_RESOLVE for a few minutes so stages started right after each other
+# skip DNS lookups. Real record TTLs are not visible through curl, and CDN-fronted
+# hosts rotate addresses quickly, so a pin is never refreshed by requests that
+# used it and is dropped as soon as a request to it fails.
+#
+# TLS session tickets cannot be persisted: libcurl keeps its session cache in
+# memory and offers no way to export it, so resumption only happens between
+# connections of one session (which all stages already share per run).
+project_dir = Path(__file__).resolve().parent.parent
+state_dir = project_dir / "data" / "state"
+session_state_file = state_dir / "session_state.json"
+
+state_dir.mkdir(parents=True, exist_ok=True)
+
+# How long a resolved address is pinned, counted from the lookup that produced it
+DNS_TTL_SECONDS = 5 * 60
+# In-run curl DNS cache lifetime (curl's default is 60s)
+DNS_CACHE_TIMEOUT = 600
+# Session cookies (no expiry) are kept this long after they were last seen
+SESSION_COOKIE_MAX_AGE = 24 * 3600
+
+
+def load_session_state():
+    """
+    Loads the persisted session state.
+
+    Returns:
+        dict: {'cookies': [cookie dicts], 'dns': {"host:port": {'host', 'port', 'address', 'resolved_at'}}}.
+    """
+    try:
+        with open(session_state_file, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if isinstance(state, dict):
+            return {"cookies": state.get("cookies", []), "dns": state.get("dns", {})}
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable session state {session_state_file}: {e}")
+    return {"cookies": [], "dns": {}}
+
+
+def save_session_state(state):
+    """Write the session state"""
+    tmp_file = session_state_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_file.replace(session_state_file)
+
+
+def resolve_entries(dns, now=None):
+    """
+    Builds CURLOPT_RESOLVE entries for the addresses that are still fresh.
+
+    Args:
+        dns (dict): The 'dns' part of the session state.
+        now (float): The reference time, time.time() by default.
+
+    Returns:
+        list: "host:port:address" strings.
+    """
+    now = now or time.time()
+    entries = []
+    for entry in dns.values():
+        if now - entry.get("resolved_at", 0) > DNS_TTL_SECONDS or entry["address"] == entry["host"]:
+            continue
+        address = entry["address"]
+        if ":" in address:
+            address = f"[{address}]"
+        entries.append(f"{entry['host']}:{entry['port']}:{address}")
+    return entries
+
+
+def _cookie_to_dict(cookie, now):
+    expires = cookie.expires if cookie.expires else int(now + SESSION_COOKIE_MAX_AGE)
+    return {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "path": cookie.path,
+        "secure": bool(cookie.secure),
+        "expires": expires,
+    }
+
+
+def _dict_to_cookie(data):
+    domain = data.get("domain", "")
+    return Cookie(
+        version=0, name=data["name"], value=data["value"], port=None, port_specified=False,
+        domain=domain, domain_specified=bool(domain), domain_initial_dot=domain.startswith("."),
+        path=data.get("path", "/"), path_specified=True, secure=data.get("secure", False),
+        expires=data.get("expires"), discard=False, comment=None, comment_url=None, rest={},
+    )
+
+
+class PersistentSession:
+    """
+    An AsyncSession that starts from the persisted cookies and DNS pins and saves them back on exit.
+
+    Exposes the request, get and stream methods the stages use. Every request
+    waits for a token from the shared per-host rate limiter first.
+    """
+
+    def __init__(self, **kwargs):
+        self._state = load_session_state()
+        self._resolved = {}
+        self._failed_hosts = set()
+
+        curl_options = dict(kwargs.pop("curl_options", None) or {})
+        curl_options.setdefault(CurlOpt.DNS_CACHE_TIMEOUT, DNS_CACHE_TIMEOUT)
+        resolve = resolve_entries(self._state["dns"])
+        # "host:port" keys answered from a pin rather than a lookup of this run
+        self._pinned = {":".join(entry.split(":", 2)[:2]) for entry in resolve}
+        if resolve:
+            curl_options[CurlOpt.RESOLVE] = resolve
+        self._session = AsyncSession(curl_options=curl_options, **kwargs)
+
+        now = time.time()
+        for data in self._state["cookies"]:
+            if data.get("expires") and data["expires"] > now:
+                self._session.cookies.jar.set_cookie(_dict_to_cookie(data))
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        try:
+            self._save()
+        except Exception as e:
+            logging.warning(f"Could not save session state: {e}")
+        return await self._session.__aexit__(*args)
+
+    @staticmethod
+    def _host_key(url):
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return parts.hostname, port
+
+    def _remember(self, response):
+        host, port = self._host_key(response.url)
+        if not host:
+            return
+        key = f"{host}:{port}"
+        if response.status_code == 421 or response.status_code >= 500:
+            # Misdirected or failing, possibly an edge the host no longer uses
+            self._unpin(key)
+        elif response.primary_ip and key not in self._pinned:
+            # Only fresh lookups are recorded, so a pin expires DNS_TTL_SECONDS after its lookup
+            self._resolved[key] = {
+                "host": host,
+                "port": port,
+                "address": response.primary_ip,
+                "resolved_at": time.time(),
+            }
+
+    def _forget(self, url):
+        # Connection, TLS and HTTP failures all drop the host's pin
+        host, port = self._host_key(url)
+        if host:
+            self._unpin(f"{host}:{port}")
+
+    def _unpin(self, key):
+        self._failed_hosts.add(key)
+        self._resolved.pop(key, None)
+        if key in self._pinned:
+            # Later requests of this run look the host up again: "-host:port" removes
+            # the pinned entry from curl's DNS cache
+            self._pinned.discard(key)
+            resolve = self._session.curl_options[CurlOpt.RESOLVE]
+            self._session.curl_options[CurlOpt.RESOLVE] = [entry for entry in resolve if not entry.startswith(f"{key}:")] + [f"-{key}"]
+
+    def _save(self):
+        now = time.time()
+        # Merge with the file as it is now, other processes may have saved meanwhile
+        state = load_session_state()
+
+        dns = state["dns"]
+        for key, entry in self._state["dns"].items():
+            dns.setdefault(key, entry)
+        dns.update(self._resolved)
+        for key in self._failed_hosts - set(self._resolved):
+            dns.pop(key, None)
+        state["dns"] = {key: entry for key, entry in dns.items() if now - entry.get("resolved_at", 0) <= DNS_TTL_SECONDS}
+
+        cookies = {(c["domain"], c["path"], c["name"]): c for c in state["cookies"]}
+        for cookie in self._session.cookies.jar:
+            data = _cookie_to_dict(cookie, now)
+            cookies[(data["domain"], data["path"], data["name"])] = data
+        state["cookies"] = [c for c in cookies.values() if c.get("expires") and c["expires"] > now]
+
+        save_session_state(state)
+
+    async def request(self, method, url, **kwargs):
+        await limiter.acquire(url)
+        try:
+            response = await self._session.request(method, url, **kwargs)
+        except Exception:
+            self._forget(url)
+            raise
+        self._remember(response)
+        limiter.observe(url, response.status_code, response.headers)
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        await limiter.acquire(url)
+        try:
+            async with self._session.stream(method, url, **kwargs) as response:
+                self._remember(response)
+                limiter.observe(url, response.status_code, response.headers)
+                yield response
+        except Exception:
+            self._forget(url)
+            raise
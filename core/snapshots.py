@@ -0,0 +1,299 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+# Content-addressed HTML snapshot store.
+# Blobs live in blobs/<sha256[:2]>/<sha256>.<codec>, compressed and deduplicated
+# across runs. Every fetch run writes runs/<run_id>.json mapping cache_filename
+# to a blob, and latest.json always points at the newest blob per cache file.
+# Only the newest MAX_RUNS run indexes are kept, and blobs neither they nor
+# latest.json reference are deleted.
+project_dir = Path(__file__).resolve().parent.parent
+snapshots_dir = project_dir / "data" / "snapshots"
+blobs_dir = snapshots_dir / "blobs"
+runs_dir = snapshots_dir / "runs"
+tmp_dir = snapshots_dir / "tmp"
+latest_index_file = snapshots_dir / "latest.json"
+legacy_cache_dir = project_dir / "data" / "html_cache"
+
+blobs_dir.mkdir(parents=True, exist_ok=True)
+runs_dir.mkdir(parents=True, exist_ok=True)
+tmp_dir.mkdir(parents=True, exist_ok=True)
+
+# Set AI_NEWS_SNAPSHOT_RUN=<run_id> to make readers use a past run instead of the latest one
+RUN_ENV_VAR = "AI_NEWS_SNAPSHOT_RUN"
+
+CODEC = "zst" if zstandard else "gz"
+
+# Run indexes kept for reparsing past runs; older runs and their unreferenced blobs are deleted
+MAX_RUNS = 30
+
+
+def _blob_path(digest, codec):
+    return blobs_dir / digest[:2] / f"{digest}.{codec}"
+
+
+def _compress_stream(source, target, codec):
+    if codec == "zst":
+        zstandard.ZstdCompressor(level=10).copy_stream(source, target)
+        return
+    with gzip.GzipFile(fileobj=target, mode="wb", compresslevel=6, mtime=0) as gz:
+        shutil.copyfileobj(source, gz)
+
+
+def _decompress(data, codec):
+    if codec == "zst":
+        if not zstandard:
+            raise RuntimeError("zstandard is required to read .zst snapshots")
+        # copy_stream writes frames without a content size, which decompress() refuses
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+def _read_index(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable snapshot index {path}: {e}")
+        return {}
+
+
+def _write_index(path, index):
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def store_blob_file(source_path, digest=None):
+    """
+    Moves a downloaded body file into the store, reusing an existing blob with the same content.
+
+    The body is compressed from disk in chunks, written to a temporary name and
+    renamed into place, so a partially written blob is never visible. The source
+    file is removed afterwards.
+
+    Args:
+        source_path (Path): The uncompressed body on disk.
+        digest (str): The SHA-256 of the body if already known (e.g. hashed while streaming).
+
+    Returns:
+        dict: An index entry with 'sha256', 'codec', 'size' and 'stored_size'.
+    """
+    source_path = Path(source_path)
+    size = source_path.stat().st_size
+    if not digest:
+        with open(source_path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+
+    try:
+        for codec in ("zst", "gz"):
+            existing = _blob_path(digest, codec)
+            if existing.exists():
+                return {"sha256": digest, "codec": codec, "size": size, "stored_size": existing.stat().st_size}
+
+        blob_path = _blob_path(digest, CODEC)
+        blob_path.parent.mkdir(exist_ok=True)
+        tmp_path = blob_path.with_name(blob_path.name + ".tmp")
+        with open(source_path, "rb") as source, open(tmp_path, "wb") as target:
+            _compress_stream(source, target, CODEC)
+        tmp_path.replace(blob_path)
+        return {"sha256": digest, "codec": CODEC, "size": size, "stored_size": blob_path.stat().st_size}
+    finally:
+        source_path.unlink(missing_ok=True)
+
+
+def load_latest_index():
+    """Load the mapping of cache_filename to its newest blob entry"""
+    return _read_index(latest_index_file)
+
+
+def write_run_index(run_id, run_index):
+    """
+    Saves the index of one fetch run and merges it into latest.json.
+
+    Args:
+        run_id (str): The run identifier (UTC timestamp).
+        run_index (dict): A mapping of cache_filename to blob entry.
+    """
+    _write_index(runs_dir / f"{run_id}.json", run_index)
+    latest = load_latest_index()
+    latest.update(run_index)
+    _write_index(latest_index_file, latest)
+    prune()
+
+
+def publish_snapshot(cache_filename, entry):
+    """
+    Points latest.json at a new blob before the run index is written.
+
+    Lets readers in other processes see a page as soon as it is stored.
+
+    Args:
+        cache_filename (str): The configured cache filename.
+        entry (dict): The blob entry returned by store_blob_file.
+    """
+    latest = load_latest_index()
+    latest[cache_filename] = entry
+    _write_index(latest_index_file, latest)
+
+
+def list_runs():
+    """List the ids of all recorded runs, oldest first"""
+    return sorted(path.stem for path in runs_dir.glob("*.json"))
+
+
+def prune(max_runs=MAX_RUNS):
+    """
+    Deletes all but the newest max_runs run indexes, then every blob no remaining index references.
+
+    Args:
+        max_runs (int): The number of run indexes to keep.
+
+    Returns:
+        int: The number of blobs deleted.
+    """
+    runs = list_runs()
+    stale_runs = runs[:-max_runs] if max_runs > 0 else runs
+    for run_id in stale_runs:
+        (runs_dir / f"{run_id}.json").unlink(missing_ok=True)
+
+    referenced = set()
+    for index_path in [latest_index_file, *runs_dir.glob("*.json")]:
+        referenced.update(entry.get("sha256") for entry in _read_index(index_path).values() if isinstance(entry, dict))
+
+    removed = 0
+    for blob_path in blobs_dir.glob("*/*"):
+        # Blobs still being written end in .tmp
+        if blob_path.suffix in (".zst", ".gz") and blob_path.name.split(".")[0] not in referenced:
+            blob_path.unlink(missing_ok=True)
+            removed += 1
+    if removed:
+        logging.info(f"Pruned {removed} snapshot blobs no kept run references")
+    return removed
+
+
+def _lookup(cache_filename, run_id=None):
+    run_id = run_id or os.environ.get(RUN_ENV_VAR)
+    index = _read_index(runs_dir / f"{run_id}.json") if run_id else load_latest_index()
+    return index.get(cache_filename)
+
+
+def snapshot_exists(cache_filename, run_id=None):
+    """
+    Checks whether a snapshot is available for a cache file.
+
+    Args:
+        cache_filename (str): The configured cache filename.
+        run_id (str): A past run to look in instead of the latest snapshots.
+
+    Returns:
+        bool: True if the page can be read with read_snapshot.
+    """
+    entry = _lookup(cache_filename, run_id)
+    if entry:
+        return _blob_path(entry["sha256"], entry["codec"]).exists()
+    return not (run_id or os.environ.get(RUN_ENV_VAR)) and (legacy_cache_dir / cache_filename).exists()
+
+
+def read_snapshot_bytes(cache_filename, run_id=None):
+    """
+    Reads the raw bytes of a cached page.
+
+    Pages fetched before the snapshot store existed are read from data/html_cache.
+
+    Args:
+        cache_filename (str): The configured cache filename.
+        run_id (str): A past run to read instead of the latest snapshot.
+
+    Returns:
+        bytes: The page body, or None if no snapshot is available.
+    """
+    entry = _lookup(cache_filename, run_id)
+    try:
+        if entry:
+            with open(_blob_path(entry["sha256"], entry["codec"]), "rb") as f:
+                return _decompress(f.read(), entry["codec"])
+        if not (run_id or os.environ.get(RUN_ENV_VAR)):
+            with open(legacy_cache_dir / cache_filename, "rb") as f:
+                return f.read()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.error(f"Error reading snapshot for {cache_filename}: {e}")
+    return None
+
+
+@contextmanager
+def open_snapshot(cache_filename, run_id=None):
+    """
+    Opens a cached page for reading in chunks, decompressing it as it is read.
+
+    Unlike read_snapshot_bytes, the page is never held in memory as a whole.
+
+    Args:
+        cache_filename (str): The configured cache filename.
+        run_id (str): A past run to read instead of the latest snapshot.
+
+    Yields:
+        A binary file object with read(size), or None if no snapshot is available.
+    """
+    entry = _lookup(cache_filename, run_id)
+    if entry:
+        path, codec = _blob_path(entry["sha256"], entry["codec"]), entry["codec"]
+    elif not (run_id or os.environ.get(RUN_ENV_VAR)):
+        path, codec = legacy_cache_dir / cache_filename, None
+    else:
+        yield None
+        return
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        yield None
+        return
+    with f:
+        if codec == "zst":
+            if not zstandard:
+                raise RuntimeError("zstandard is required to read .zst snapshots")
+            with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+                yield reader
+        elif codec == "gz":
+            with gzip.GzipFile(fileobj=f, mode="rb") as reader:
+                yield reader
+        else:
+            yield f
+
+
+def read_snapshot(cache_filename, run_id=None):
+    """
+    Reads a cached page as text.
+
+    Args:
+        cache_filename (str): The configured cache filename.
+        run_id (str): A past run to read instead of the latest snapshot.
+
+    Returns:
+        str: The decoded page, or None if no snapshot is available.
+    """
+    data = read_snapshot_bytes(cache_filename, run_id)
+    return data.decode("utf-8", errors="replace") if data is not None else None
+
+
+def new_run_id():
+    """Create a run id from the current UTC time"""
+    return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
@@ -1 +1,49 @@
-# Scrapers module for AI-News-Direct
\ No newline at end of file
+# Scrapers module for AI-News-Direct
+import importlib
+import json
+from pathlib import Path
+
+config_file = Path(__file__).resolve().parent.parent / "config" / "sites_config.json"
+
+
+def _scraper_modules():
+    # A site's scraper lives in scrapers/<organization_key>.py ("-" becomes "_"),
+    # unless its entry names another module under "scraper_module"
+    with open(config_file, "r", encoding="utf-8") as f:
+        sites = json.load(f)
+    return {
+        site["organization_key"]: "scrapers." + (site.get("scraper_module") or site["organization_key"].replace("-", "_"))
+        for site in sites if site.get("organization_key")
+    }
+
+
+# Scraper modules by organization_key, in config/sites_config.json order.
+# A module is imported only when its scraper is selected; importing it registers
+# its Scraper subclass (see scrapers/base.py).
+SCRAPER_MODULES = _scraper_modules()
+
+# Scrapers that send requests of their own (API calls, GitHub date lookups). Each
+# implements send_requests(parsed), which the pipeline awaits on its event loop next
+# to the fetcher, so every request of a run draws from the same per-host rate
+# limits. Those that parse pages (parser is not None) also implement parse_pages(),
+# which runs in a worker process and whose picklable result send_requests receives.
+NETWORK_SCRAPERS = {"hackernews", "huggingface", "github"}
+
+
+def get_scraper(organization_key):
+    """
+    Imports a scraper's module and returns an instance of its registered class.
+
+    Args:
+        organization_key (str): The site's organization_key.
+
+    Returns:
+        Scraper: The site's scraper.
+    """
+    if organization_key not in SCRAPER_MODULES:
+        raise KeyError(f"No site '{organization_key}' in {config_file.name}")
+    importlib.import_module(SCRAPER_MODULES[organization_key])
+    from scrapers.base import REGISTRY
+    if organization_key not in REGISTRY:
+        raise KeyError(f"{SCRAPER_MODULES[organization_key]} registers no scraper for '{organization_key}'")
+    return REGISTRY[organization_key]()
@@ -1,120 +1,36 @@
 import json
-from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 import hashlib
 import re
+from core.dates import iso_date
+from scrapers.base import Scraper, register
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Scalar "key":value pairs of the JSON the page embeds for its news list
+STATE_FIELD_PATTERN = re.compile(r'"(\w+)":("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?)')
 
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find AIBase configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'aibase':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("AIBase configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None, None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None, None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup, html_content
-
-def parse_relative_time(time_str):
-    """Parse relative time strings like '8 小时前' or '2 天前' into ISO format"""
-    if not time_str:
-        return None
-    
-    time_str = time_str.strip()
-    
-    # Handle "刚刚" (just now)
-    if '刚刚' in time_str:
-        return datetime.now(timezone.utc).isoformat()
-    
-    # Handle "X 分钟前" (X minutes ago)
-    minutes_match = re.search(r'(\d+)\s*分钟前', time_str)
-    if minutes_match:
-        minutes = int(minutes_match.group(1))
-        dt = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-        return dt.isoformat()
-    
-    # Handle "X 小时前" (X hours ago)
-    hours_match = re.search(r'(\d+)\s*小时前', time_str)
-    if hours_match:
-        hours = int(hours_match.group(1))
-        dt = datetime.now(timezone.utc) - timedelta(hours=hours)
-        return dt.isoformat()
-    
-    # Handle "X 天前" (X days ago)
-    days_match = re.search(r'(\d+)\s*天前', time_str)
-    if days_match:
-        days = int(days_match.group(1))
-        dt = datetime.now(timezone.utc) - timedelta(days=days)
-        return dt.isoformat()
-    
-    # Handle "前天" (day before yesterday)
-    if '前天' in time_str:
-        dt = datetime.now(timezone.utc) - timedelta(days=2)
-        return dt.isoformat()
-    
-    # Handle "昨天" (yesterday)
-    if '昨天' in time_str:
-        dt = datetime.now(timezone.utc) - timedelta(days=1)
-        return dt.isoformat()
-    
-    # Handle date format like "02-13"
-    short_date_match = re.match(r'(\d{2})-(\d{2})', time_str)
-    if short_date_match:
-        month = int(short_date_match.group(1))
-        day = int(short_date_match.group(2))
-        year = datetime.now().year
+def build_oid_index(html_content):
+    """Index the embedded news records by oid in one pass over the page"""
+    # Each "oid" starts a record that collects the scalar fields following it
+    # (createTime, pv, thumb, ...) until the next "oid"
+    index = {}
+    record = None
+    for match in STATE_FIELD_PATTERN.finditer(html_content):
+        key, raw_value = match.groups()
         try:
-            dt = datetime(year, month, day, tzinfo=timezone.utc)
-            return dt.isoformat()
+            value = json.loads(raw_value)
         except ValueError:
-            pass
-    
-    # Try standard date format YYYY-MM-DD HH:MM:SS
-    try:
-        dt = datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S')
-        return dt.replace(tzinfo=timezone.utc).isoformat()
-    except ValueError:
-        pass
-    
-    return None
+            continue
+        if key == 'oid':
+            record = index.setdefault(str(value), {})
+        elif record is not None and key not in record:
+            record[key] = value
+    return index
 
 def extract_daily_news_from_html(soup, html_content):
     """Extract AI daily news from HTML structure"""
     articles = []
+    oid_index = build_oid_index(html_content)
     
     # Find all news item links - they have href like /zh/daily/25844
     news_links = soup.find_all('a', href=re.compile(r'/zh/daily/\d+'))
@@ -157,20 +73,13 @@ def extract_daily_news_from_html(soup, html_content):
             # Extract date/time info - try to get from JSON data first, then fall back to icon-rili
             published_date = None
             
-            # Method 1: Try to extract createTime from the page's embedded JSON data
-            # Look for the oid in the JSON data structure
-            if oid:
-                # The page contains JSON with createTime for each item
-                # Pattern: "oid":26000,"createTime":"2026-03-06 15:47:00"
-                json_pattern = f'"oid":{oid}.*?"createTime":"([^"]+)"'
-                json_match = re.search(json_pattern, html_content)
-                if json_match:
-                    create_time_str = json_match.group(1)
-                    try:
-                        dt = datetime.strptime(create_time_str, '%Y-%m-%d %H:%M:%S')
-                        published_date = dt.replace(tzinfo=timezone.utc).isoformat()
-                    except ValueError:
-                        pass
+            # Method 1: Take createTime from the page's embedded JSON data
+            # The page contains JSON with createTime for each item
+            # Pattern: "oid":26000,"createTime":"2026-03-06 15:47:00"
+            record = oid_index.get(oid, {})
+            create_time_str = record.get('createTime')
+            if isinstance(create_time_str, str):
+                published_date = iso_date(create_time_str, default=None)
             
             # Method 2: Fall back to parsing relative time from the display text
             if not published_date:
@@ -179,7 +88,7 @@ def extract_daily_news_from_html(soup, html_content):
                     date_div = date_icon.find_parent('div')
                     if date_div:
                         date_text = date_div.get_text(strip=True)
-                        published_date = parse_relative_time(date_text)
+                        published_date = iso_date(date_text, default=None)
             
             # Extract page views - the view count is in a div containing an icon-fangwenliang1 <i> element
             pv = 0
@@ -196,12 +105,16 @@ def extract_daily_news_from_html(soup, html_content):
                             pv = int(pv_num * 1000)
                         else:
                             pv = int(pv_num)
+            if not pv and isinstance(record.get('pv'), (int, float)):
+                pv = int(record['pv'])
             
             # Extract thumbnail image
             thumbnail = ''
             img = link.find('img', loading='lazy')
             if img:
                 thumbnail = img.get('src', '')
+            if not thumbnail and isinstance(record.get('thumb'), str):
+                thumbnail = record['thumb']
             
             if not published_date:
                 published_date = datetime.now(timezone.utc).isoformat()
@@ -255,62 +168,24 @@ def parse_aibase_html(soup, html_content):
         logging.warning("No articles found in HTML structure")
         return []
     
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in articles})]
-    
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-    
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-    
-    logging.info(f"Successfully parsed {len(dedup_list)} unique articles from AIBase daily")
-    return dedup_list
+    logging.info(f"Successfully parsed {len(articles)} articles from AIBase daily")
+    return articles
+
+
+@register
+class AIBaseScraper(Scraper):
+    organization_key = 'aibase'
+    name = 'AIBase'
+    parser = 'html.parser'
 
-def save_to_json(articles, filename):
-    """Save articles to JSON file"""
-    try:
-        config = load_config()
-        output_files = config['output_files']
-        
-        # Determine the output filename based on the cache filename
-        if 'daily' in filename:
-            page_type = 'daily'
-        else:
-            page_type = 'daily'
-        
-        output_filename = output_files.get(page_type, 'aibase_daily.json')
-        json_path = parsed_dir / output_filename
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=4, ensure_ascii=False)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
+    def parse(self, soup, cache_filename):
+        # The parser reads both the DOM and the page's embedded JSON
+        return parse_aibase_html(soup, self.read(cache_filename))
+
+
+def main():
+    """Parse every configured AIBase cache file"""
+    AIBaseScraper().run()
 
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing AIBase {page_type} file: {cache_filename}")
-            soup, html_content = load_html(cache_filename)
-            if soup:
-                articles = parse_aibase_html(soup, html_content)
-                if articles:
-                    save_to_json(articles, cache_filename)
-                else:
-                    logging.error("No articles to save")
-            else:
-                logging.error(f"Failed to load HTML from {cache_filename}")
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
+    main()
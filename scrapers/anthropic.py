@@ -1,150 +1,50 @@
-import json
-from bs4 import BeautifulSoup
-import os
-from pathlib import Path
 import logging
 from datetime import datetime, timezone, timedelta
-import codecs
-from dateutil import parser
 import hashlib
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find Anthropic configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'anthropic':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("Anthropic configuration not found in sites_config.json")
-
-
-def load_html(filename):
-    file_path = html_dir / filename
-    # Read the HTML file
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    # Parse the HTML content
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    return soup
-
-
-
-
-def _extract_research_data(soup, base_url):
-    """Extract data from research pages using new CSS module selectors"""
+import re
+from bs4 import SoupStrainer
+from core.dates import iso_date, DateParseError
+from core.news_item import NewsItem
+from scrapers.base import Scraper, register, date_sort_key, KEEP_EARLIEST
+
+# CSS module class prefixes of the page sections
+PUBLICATION_LIST = 'PublicationList-module-scss-module'
+FEATURED_GRID = 'FeaturedGrid-module-scss-module'
+ARTICLE_LIST = 'ArticleList-module'
+# The publication lists, featured grids and engineering article cards
+PARSE_ONLY = [
+    SoupStrainer('a', class_=re.compile(r'PublicationList-module|FeaturedGrid-module')),
+    SoupStrainer('article', class_=re.compile(ARTICLE_LIST)),
+]
+
+
+def _extract_publication_data(soup, base_url, page_type):
+    """Extract data from the news and research pages using their CSS module classes"""
     post_items = []
     
-    # Process PublicationList items (research publications list)
-    publication_items = soup.select('a[class*="PublicationList-module-scss-module"][class*="listItem"]')
-    for post in publication_items:
-        # Extract title from the title span
-        title_element = post.select_one('[class*="PublicationList-module-scss-module"][class*="title"]')
-        
-        # Extract date from time element
-        date_element = post.select_one('[class*="PublicationList-module-scss-module"][class*="date"]')
-        
-        # Extract category from subject span
-        category_element = post.select_one('[class*="PublicationList-module-scss-module"][class*="subject"]')
+    # Process PublicationList items (main list)
+    for post in soup.select(f'a[class*="{PUBLICATION_LIST}"][class*="listItem"]'):
+        # Title, date and category spans
+        title_element = post.select_one(f'[class*="{PUBLICATION_LIST}"][class*="title"]')
+        date_element = post.select_one(f'[class*="{PUBLICATION_LIST}"][class*="date"]')
+        category_element = post.select_one(f'[class*="{PUBLICATION_LIST}"][class*="subject"]')
         categories = [category_element.get_text(strip=True)] if category_element else []
         
         if title_element:
-            post_item = _create_post_item(
-                post, title_element, date_element, base_url, 'research', soup, categories
-            )
+            post_item = _create_post_item(post, title_element, date_element, base_url, page_type, categories)
             if post_item:
                 post_items.append(post_item)
     
-    # Also process FeaturedGrid items (featured research articles)
-    featured_items = soup.select('a[class*="FeaturedGrid-module-scss-module"][class*="sideLink"]')
-    for post in featured_items:
-        # Title from headline element
-        title_element = post.select_one('[class*="FeaturedGrid-module-scss-module"][class*="title"]')
-        
-        # Date from time element
-        date_element = post.select_one('[class*="FeaturedGrid-module-scss-module"][class*="date"]')
-        
-        # Category from caption bold
+    # Also process FeaturedGrid side items (featured articles)
+    for post in soup.select(f'a[class*="{FEATURED_GRID}"][class*="sideLink"]'):
+        # Title from headline element, date from time element, category from caption bold
+        title_element = post.select_one(f'[class*="{FEATURED_GRID}"][class*="title"]')
+        date_element = post.select_one(f'[class*="{FEATURED_GRID}"][class*="date"]')
         category_element = post.select_one('span.caption.bold')
         categories = [category_element.get_text(strip=True)] if category_element else []
         
         if title_element:
-            post_item = _create_post_item(
-                post, title_element, date_element, base_url, 'research', soup, categories
-            )
-            if post_item:
-                post_items.append(post_item)
-    
-    return post_items
-
-
-def _extract_news_data(soup, base_url):
-    """Extract data from news pages using new CSS module selectors"""
-    post_items = []
-    
-    # Process PublicationList items (main news list)
-    publication_items = soup.select('a[class*="PublicationList-module-scss-module"][class*="listItem"]')
-    for post in publication_items:
-        # Extract title from the title span
-        title_element = post.select_one('[class*="PublicationList-module-scss-module"][class*="title"]')
-        
-        # Extract date from time element
-        date_element = post.select_one('[class*="PublicationList-module-scss-module"][class*="date"]')
-        
-        # Extract category from subject span
-        category_element = post.select_one('[class*="PublicationList-module-scss-module"][class*="subject"]')
-        categories = [category_element.get_text(strip=True)] if category_element else []
-        
-        if title_element:
-            post_item = _create_post_item(
-                post, title_element, date_element, base_url, 'news', soup, categories
-            )
-            if post_item:
-                post_items.append(post_item)
-    
-    # Also try FeaturedGrid side items (featured/side articles)
-    featured_items = soup.select('a[class*="FeaturedGrid-module-scss-module"][class*="sideLink"]')
-    for post in featured_items:
-        # Title from headline element
-        title_element = post.select_one('[class*="FeaturedGrid-module-scss-module"][class*="title"]')
-        
-        # Date from time element
-        date_element = post.select_one('[class*="FeaturedGrid-module-scss-module"][class*="date"]')
-        
-        # Category from caption bold
-        category_element = post.select_one('span.caption.bold')
-        categories = [category_element.get_text(strip=True)] if category_element else []
-        
-        if title_element:
-            post_item = _create_post_item(
-                post, title_element, date_element, base_url, 'news', soup, categories
-            )
+            post_item = _create_post_item(post, title_element, date_element, base_url, page_type, categories)
             if post_item:
                 post_items.append(post_item)
     
@@ -152,15 +52,14 @@ def _extract_news_data(soup, base_url):
 
 
 def _extract_engineering_data(soup, base_url):
-    """Extract data from engineering pages using new CSS module selectors"""
+    """Extract data from engineering pages using their CSS module classes"""
     post_items = []
     
     # Process ArticleList items (engineering blog articles)
     # The CSS module hash can vary, so we look for the article elements more broadly
-    article_items = soup.find_all('article', class_=lambda x: x and 'ArticleList-module' in x)
-    for post in article_items:
+    for post in soup.select(f'article[class*="{ARTICLE_LIST}"]'):
         # Find the card link within the article - look for any anchor with cardLink in class
-        card_link = post.find('a', class_=lambda x: x and 'cardLink' in x)
+        card_link = post.select_one('a[class*="cardLink"]')
         if not card_link:
             continue
             
@@ -171,19 +70,17 @@ def _extract_engineering_data(soup, base_url):
         
         # Date from the date div - look for class ending with '__date'
         # This is more specific to avoid matching other date-related classes
-        date_element = post.find('div', class_=lambda x: x and '__date' in str(x))
+        date_element = post.select_one('div[class*="__date"]')
         
         if title_element:
-            post_item = _create_post_item(
-                card_link, title_element, date_element, base_url, 'engineering', soup
-            )
+            post_item = _create_post_item(card_link, title_element, date_element, base_url, 'engineering')
             if post_item:
                 post_items.append(post_item)
     
     return post_items
 
 
-def _create_post_item(post, title_element, date_element, base_url, page_type, soup, categories=None):
+def _create_post_item(post, title_element, date_element, base_url, page_type, categories=None):
     """Create a post item from extracted elements"""
     title = title_element.get_text(strip=True) if title_element else ''
     if not title:
@@ -204,8 +101,8 @@ def _create_post_item(post, title_element, date_element, base_url, page_type, so
     if date_element:
         date_str = date_element.get_text(strip=True)
         try:
-            published_date = datetime.strptime(date_str, '%b %d, %Y').replace(tzinfo=timezone.utc).isoformat()
-        except ValueError:
+            published_date = iso_date(date_str)
+        except DateParseError:
             logging.warning(f"Could not parse date '{date_str}' for article '{title[:50]}...'")
             published_date = None
     
@@ -222,70 +119,34 @@ def _create_post_item(post, title_element, date_element, base_url, page_type, so
     ]
     item_id = hashlib.md5("_".join(filter(None, id_components)).encode()).hexdigest()
     
-    return {
-        'id': item_id,
-        'source': 'anthropic',
-        'type': page_type,
-        'title': title,
-        'description': '',
-        'url': url,
-        'published_date': published_date,
-        'categories': categories or [],
-        'organization': 'Anthropic',
-        'metadata': {},
-        'objects': []
-    }
+    return NewsItem(
+        id=item_id,
+        source='anthropic',
+        type=page_type,
+        title=title,
+        description='',
+        url=url,
+        published_date=published_date,
+        categories=categories or [],
+        organization='Anthropic',
+        metadata={},
+        objects=[],
+    )
 
 
 
 
-def save_to_json(post_items, filename):
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in post_items})]
-    
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-    
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-    
-    # Find the latest valid date among posts and create fallback for missing dates
-    # A valid date is one that is NOT the current time (i.e., it was actually parsed from the page)
+def apply_fallback_dates(post_items):
+    """Give posts without a parsed date the day after the latest parsed one"""
+    # A date within the last minute is the current-time fallback of _create_post_item,
+    # not one read from the page
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=1)
     def is_valid_date(item):
-        """Check if the date is a valid parsed date (not the current datetime fallback)"""
-        date_str = item.get('published_date', '')
-        if not date_str:
-            return False
-        try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            # Consider it invalid if it's very close to now (within 1 minute)
-            # This indicates it was set as the current datetime fallback
-            now = datetime.now(timezone.utc)
-            # If the date is within the last minute, it's likely a fallback
-            if (now - dt).total_seconds() < 60:
-                return False
-            return True
-        except:
-            return False
-    
-    # Get all valid dates
-    valid_dates = []
-    for item in dedup_list:
-        if is_valid_date(item):
-            try:
-                dt = datetime.fromisoformat(item['published_date'].replace('Z', '+00:00'))
-                valid_dates.append(dt)
-            except:
-                pass
+        return item.published is not None and item.published <= cutoff
+
+    valid_dates = [item.published for item in post_items if is_valid_date(item)]
     
     # Calculate fallback date: latest valid date + 1 day
-    fallback_date = None
     if valid_dates:
         latest_date = max(valid_dates)
         fallback_date = (latest_date + timedelta(days=1)).replace(tzinfo=timezone.utc)
@@ -296,61 +157,53 @@ def save_to_json(post_items, filename):
         logging.warning("No valid dates found, using current date as fallback")
     
     # Apply fallback date to posts without valid dates
-    for item in dedup_list:
+    for item in post_items:
         if not is_valid_date(item):
-            item['published_date'] = fallback_date.isoformat()
-            logging.info(f"Applied fallback date to: {item.get('title', 'Unknown')[:50]}...")
-    
-    # Re-sort after applying fallback dates
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-
-    # Determine page type and get config-driven filename
-    config = load_config()
-    output_files = config['output_files']
-    if 'news' in filename:
-        page_type = 'news'
-    elif 'engineering' in filename:
-        page_type = 'engineering'
-    elif 'research' in filename:
-        page_type = 'research'
-
-    try:
-        output_filename = output_files.get(page_type, f'anthropic_{page_type}.json')
-        json_path = parsed_dir / output_filename
-        with open(json_path, 'w') as f:
-            json.dump(dedup_list, f, indent=4)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
+            item.set_published(fallback_date)
+            logging.info(f"Applied fallback date to: {(item.title or 'Unknown')[:50]}...")
 
 
 def extract_html_data(soup, filename):
     """Route to the appropriate extraction function based on filename"""
+    # CSS selectors only, so the selectolax backend can run these
     if 'research' in filename:
-        return _extract_research_data(soup, 'https://www.anthropic.com/research/')
+        return _extract_publication_data(soup, 'https://www.anthropic.com/research/', 'research')
     elif 'engineering' in filename:
         return _extract_engineering_data(soup, 'https://www.anthropic.com/engineering/')
     elif 'news' in filename:
-        return _extract_news_data(soup, 'https://www.anthropic.com/news/')
+        return _extract_publication_data(soup, 'https://www.anthropic.com/news/', 'news')
     else:
         logging.error(f"Unknown file type: {filename}")
         return []
 
 
+@register
+class AnthropicScraper(Scraper):
+    organization_key = 'anthropic'
+    name = 'Anthropic'
+    parser = 'selectolax'
+    parse_only = PARSE_ONLY
+    # A post in both the featured grid and the list keeps the parsed date
+    merge_policy = KEEP_EARLIEST
+    # Pages without posts still replace the previous output
+    save_empty = True
+    # The Anthropic outputs have always been ASCII-escaped
+    ensure_ascii = True
+
+    def parse(self, soup, cache_filename):
+        return extract_html_data(soup, cache_filename)
+
+    def finalize(self, items, page_type):
+        items = super().finalize(items, page_type)
+        apply_fallback_dates(items)
+        # Re-sort after applying fallback dates
+        items.sort(key=date_sort_key, reverse=True)
+        return items
+
+
+def main():
+    """Parse every configured Anthropic cache file"""
+    AnthropicScraper().run()
+
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing Anthropic {page_type} file: {cache_filename}")
-            soup = load_html(cache_filename)
-            if soup:
-                post_items = extract_html_data(soup, cache_filename)
-                save_to_json(post_items, cache_filename)
-            else:
-                logging.error(f"Failed to load HTML from {cache_filename}")
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
\ No newline at end of file
+    main()
@@ -1,83 +1,9 @@
-import json
-from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
 import re
-from dateutil import parser as date_parser
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find Artificial Analysis configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'artificial_analysis':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("Artificial Analysis configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
-
-def parse_date(date_str):
-    """Parse date string to ISO format"""
-    if not date_str:
-        return None
-    
-    # Clean up the date string
-    date_str = date_str.strip()
-    
-    try:
-        # Try parsing with dateutil which handles various formats
-        dt = date_parser.parse(date_str)
-        # Ensure timezone info is present
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.isoformat()
-    except (ValueError, TypeError):
-        pass
-    
-    # Try specific format (e.g., "March 5, 2026")
-    try:
-        dt = datetime.strptime(date_str, '%B %d, %Y')
-        dt = dt.replace(tzinfo=timezone.utc)
-        return dt.isoformat()
-    except ValueError:
-        pass
-    
-    logging.warning(f"Could not parse date: '{date_str}'")
-    return None
+from core.dates import iso_date
+from scrapers.base import Scraper, register
 
 def extract_articles(soup):
     """Extract articles from the HTML"""
@@ -111,7 +37,7 @@ def extract_articles(soup):
                 continue
             
             # Parse the date
-            published_date = parse_date(date_str)
+            published_date = iso_date(date_str, default=None)
             if not published_date:
                 published_date = datetime.now(timezone.utc).isoformat()
             
@@ -151,41 +77,22 @@ def extract_articles(soup):
     
     return articles
 
+@register
+class ArtificialAnalysisScraper(Scraper):
+    organization_key = 'artificial_analysis'
+    name = 'Artificial Analysis'
+    parser = 'lxml'
+    # An empty page still replaces the previous output
+    save_empty = True
+    indent = 2
+
+    def parse(self, soup, cache_filename):
+        return extract_articles(soup)
+
+
 def main():
-    """Main function to run the scraper"""
-    logging.info("Starting Artificial Analysis scraper...")
-    
-    # Load configuration
-    config = load_config()
-    output_filename = config['output_files'].get('articles', 'artificial_analysis.json')
-    cache_filename = config['cache_files'].get('articles', 'artificial_analysis.html')
-    
-    logging.info(f"Output file: {output_filename}")
-    logging.info(f"Cache file: {cache_filename}")
-    
-    # Load HTML
-    soup = load_html(cache_filename)
-    if not soup:
-        logging.error("Failed to load HTML")
-        return
-    
-    # Extract articles
-    articles = extract_articles(soup)
-    
-    if not articles:
-        logging.warning("No articles found")
-        # Save empty array to maintain consistency
-        articles = []
-    
-    # Sort articles by published_date descending
-    articles.sort(key=lambda x: x.get('published_date', ''), reverse=True)
-    
-    # Save to JSON
-    output_path = parsed_dir / output_filename
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
-    
-    logging.info(f"Saved {len(articles)} articles to {output_path}")
+    """Parse the configured Artificial Analysis articles page"""
+    ArtificialAnalysisScraper().run()
 
 if __name__ == '__main__':
     main()
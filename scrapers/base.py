@@ -0,0 +1,277 @@
+import json
+import inspect
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+from core.manifest import input_digest, is_unchanged, mark_processed
+from core.snapshots import read_snapshot, snapshot_exists
+from core.html_parser import parse_html
+from core.dates import parse_date
+from core.news_item import NewsItem, json_default
+
+# Shared plumbing of the scrapers: config lookup, page loading, dedup, sorting
+# and output. A scraper subclasses Scraper and implements parse() (extract() may
+# read the page without a DOM first), or BaseScraper and run() when its source is
+# an API, and registers under its organization_key; scrapers.get_scraper() imports
+# the module only when that scraper is selected.
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Directories for parsed output and configuration (HTML comes from core.snapshots)
+project_dir = Path(__file__).resolve().parent.parent
+parsed_dir = project_dir / 'data' / 'parsed'
+config_dir = project_dir / 'config'
+
+# Shared modules that shape every scraper's output; editing one invalidates all parsed outputs
+shared_code_paths = [
+    project_dir / 'core' / 'dates.py',
+    project_dir / 'core' / 'news_item.py',
+    project_dir / 'core' / 'html_parser.py',
+    project_dir / 'core' / 'embedded_state.py',
+]
+
+# Ensure parsed directory exists
+parsed_dir.mkdir(exist_ok=True)
+
+# Registered scraper classes by organization_key
+REGISTRY = {}
+
+
+@lru_cache(maxsize=None)
+def load_sites_config():
+    """Load config/sites_config.json once per process"""
+    with open(config_dir / 'sites_config.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def site_config(organization_key):
+    """Return the output and cache filenames configured for a site"""
+    for site in load_sites_config():
+        if site.get('organization_key') == organization_key:
+            return {
+                'output_files': site.get('output_files', {}),
+                'cache_files': site.get('cache_files', {})
+            }
+    raise ValueError(f"{organization_key} configuration not found in sites_config.json")
+
+
+def register(cls):
+    """Class decorator adding a scraper to REGISTRY under its organization_key"""
+    REGISTRY[cls.organization_key] = cls
+    return cls
+
+
+# Sort key of items without a usable published_date
+UNDATED = datetime.min.replace(tzinfo=timezone.utc)
+
+# What dedup_items keys items on
+ID_KEY = 'id'    # the item id; scrapers derive it from stable fields
+URL_KEY = 'url'  # the canonical URL, for sites whose ids include a fallback date
+# Which of two items with the same key dedup_items keeps
+KEEP_FIRST = 'first'
+KEEP_LAST = 'last'
+KEEP_EARLIEST = 'earliest'  # the earlier published_date, so a parsed date beats a parse-time fallback
+
+
+def date_sort_key(item):
+    """Sort key for newest-first ordering, undated items last"""
+    published = item.published if isinstance(item, NewsItem) else parse_date(item.get('published_date'), default=None)
+    return published or UNDATED
+
+
+def canonical_url(url):
+    """Normalize a URL for comparison: lowercase scheme and host, no fragment or trailing slash"""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+def _keep_earliest(kept, item):
+    kept_date, item_date = date_sort_key(kept), date_sort_key(item)
+    if item_date != UNDATED and (kept_date == UNDATED or item_date < kept_date):
+        return item
+    return kept
+
+
+MERGE_POLICIES = {
+    KEEP_FIRST: lambda kept, item: kept,
+    KEEP_LAST: lambda kept, item: item,
+    KEEP_EARLIEST: _keep_earliest,
+}
+
+
+def dedup_items(items, key=ID_KEY, merge=KEEP_FIRST):
+    """
+    Drops items that share a key, in one pass.
+
+    Args:
+        items (list): The items to deduplicate.
+        key: ID_KEY, URL_KEY or a function returning an item's key.
+        merge: A policy name from MERGE_POLICIES, or a function (kept, item) returning
+            the item to keep.
+
+    Returns:
+        list: One item per key, in the order each key first appeared. Items without
+        a key are all kept.
+    """
+    if key == ID_KEY:
+        key_of = lambda item: item.get('id')
+    elif key == URL_KEY:
+        key_of = lambda item: canonical_url(item.get('url'))
+    else:
+        key_of = key
+    merge = MERGE_POLICIES[merge] if isinstance(merge, str) else merge
+
+    kept = {}
+    for position, item in enumerate(items):
+        item_key = key_of(item)
+        if item_key is None or item_key == '':
+            # Nothing to compare on, keep it in place
+            item_key = (None, position)
+        if item_key in kept:
+            kept[item_key] = merge(kept[item_key], item)
+        else:
+            kept[item_key] = item
+    return list(kept.values())
+
+
+class BaseScraper(ABC):
+    """
+    Base class of every scraper: config lookup and output.
+
+    Subclasses set organization_key and name, and implement run(). Scrapers of
+    API sources, without pages to parse, subclass this directly.
+    """
+    organization_key = None
+    # Name used in log messages
+    name = None
+    # HTML parser backend, see core/html_parser.py; None for scrapers without pages
+    parser = None
+    # json.dump options of the output files
+    indent = 4
+    ensure_ascii = False
+
+    @property
+    def config(self):
+        return site_config(self.organization_key)
+
+    def code_paths(self):
+        """Source files whose changes invalidate the parsed outputs"""
+        return [inspect.getfile(type(self)), __file__, *shared_code_paths]
+
+    def output_path(self, page_type):
+        return parsed_dir / self.config['output_files'].get(page_type, f'{self.organization_key}_{page_type}.json')
+
+    def save(self, items, page_type):
+        """Write the items to the output file configured for page_type"""
+        json_path = self.output_path(page_type)
+        try:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(items, f, indent=self.indent, ensure_ascii=self.ensure_ascii, default=json_default)
+            logging.info(f"Parsed data successfully written to '{json_path}'")
+        except IOError as e:
+            logging.error(f"Error writing to file: {e}")
+            return False
+        return True
+
+    @abstractmethod
+    def run(self):
+        """Write the site's output files"""
+
+
+class Scraper(BaseScraper):
+    """
+    Base class of the site scrapers that parse cached pages.
+
+    Subclasses set organization_key and name, and implement parse(soup, cache_filename)
+    returning the page's items; one that does not cannot be instantiated. run() parses
+    every configured cache file into the output file configured under the same key.
+    """
+    # HTML parser backend, see core/html_parser.py
+    parser = 'html.parser'
+    # SoupStrainer(s) limiting the first parse of a page, None parses it whole
+    parse_only = None
+    # How finalize() deduplicates, see dedup_items
+    dedup_key = ID_KEY
+    merge_policy = KEEP_FIRST
+    # Write the output even when a page yields no items
+    save_empty = False
+
+    def read(self, cache_filename):
+        """Return the text of a cached page, or None if it is missing"""
+        html_content = read_snapshot(cache_filename)
+        if html_content is None:
+            logging.error(f"Snapshot not found: {cache_filename}")
+        return html_content
+
+    def load_html(self, cache_filename, parse_only=None):
+        """Load a cached page, optionally only the given regions"""
+        html_content = self.read(cache_filename)
+        if html_content is None:
+            return None
+        return parse_html(html_content, self.parser, parse_only)
+
+    @abstractmethod
+    def parse(self, soup, cache_filename):
+        """Extract the items of a parsed page"""
+
+    def extract(self, cache_filename, parse_only=None):
+        """
+        Loads and parses one cached page.
+
+        Returns:
+            list: The page's items, or None if the page could not be loaded.
+        """
+        soup = self.load_html(cache_filename, parse_only)
+        if soup is None:
+            return None
+        return self.parse(soup, cache_filename)
+
+    def load_items(self, cache_filename):
+        """Extract a page's items from the parse_only regions, or the whole page if they yield none"""
+        items = self.extract(cache_filename, self.parse_only)
+        if items is not None and not items and self.parse_only is not None:
+            logging.warning(f"No items in the parsed regions of {cache_filename}, parsing the whole page")
+            items = self.extract(cache_filename)
+        return items
+
+    def finalize(self, items, page_type):
+        """Deduplicate the items and sort them newest first"""
+        items = dedup_items([NewsItem.coerce(item) for item in items], self.dedup_key, self.merge_policy)
+        items.sort(key=date_sort_key, reverse=True)
+        logging.info(f"Parsed {len(items)} unique {self.name} {page_type} items")
+        return items
+
+    def process(self, page_type, cache_filename):
+        """Parse one cached page unless it is unchanged since the last run"""
+        digest = input_digest([cache_filename], self.code_paths())
+        outputs = [self.output_path(page_type)]
+        if is_unchanged(self.organization_key, cache_filename, digest, outputs):
+            logging.info(f"Skipping unchanged {self.name} {page_type} file: {cache_filename}")
+            return
+        logging.info(f"Processing {self.name} {page_type} file: {cache_filename}")
+
+        items = self.load_items(cache_filename)
+        if items is None:
+            logging.error(f"Failed to load {self.name} data from {cache_filename}")
+            return
+        if not items and not self.save_empty:
+            logging.error(f"No {self.name} items to save from {cache_filename}")
+            return
+
+        if self.save(self.finalize(items, page_type), page_type):
+            mark_processed(self.organization_key, cache_filename, digest, outputs)
+
+    def run(self):
+        """Parse every configured cache file"""
+        for page_type, cache_filename in self.config['cache_files'].items():
+            if snapshot_exists(cache_filename):
+                self.process(page_type, cache_filename)
+            else:
+                logging.error(f"Required cache file not found: {cache_filename}")
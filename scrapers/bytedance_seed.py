@@ -1,53 +1,14 @@
 import json
-from bs4 import BeautifulSoup
 import os
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
+from core.dates import iso_date
+from core.embedded_state import extract_state, ROUTER_DATA
+from scrapers.base import Scraper, register
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find ByteDance configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'bytedance':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("ByteDance configuration not found in sites_config.json")
-
-def extract_script_data(file_path):
-    # Read the HTML file
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    # Parse the HTML content
-    soup = BeautifulSoup(html_content, 'html.parser')
-
+def extract_script_data(soup):
+    """Read window._ROUTER_DATA from the page's script tag"""
     # Find the script tag containing window._ROUTER_DATA
     script_tag = soup.find('script', string=lambda text: 'window._ROUTER_DATA' in text)
     
@@ -70,14 +31,13 @@ def extract_script_data(file_path):
     return router_data
 
 
-def parse_and_save(router_data):
+def parse_router_data(router_data):
+    """Extract the articles of a blog or public_papers page, None if the data is unusable"""
     if not router_data or 'loaderData' not in router_data:
         logging.error("Invalid router data")
-        return
+        return None
 
     base_url = "https://seed.bytedance.com/"
-    config = load_config()
-    output_files = config['output_files']
 
     # Determine page type
     # Note: public_papers in URL maps to 'research' output type
@@ -87,7 +47,7 @@ def parse_and_save(router_data):
         page_type = 'public_papers'
     else:
         logging.error("Unknown page type")
-        return
+        return None
 
     article_list = []
     
@@ -98,11 +58,11 @@ def parse_and_save(router_data):
         loader_data_key = '(locale$)/public_papers/layout'
     else:
         logging.error(f"Unsupported page type: {page_type}")
-        return
+        return None
 
     if loader_data_key not in router_data['loaderData']:
         logging.error(f"Loader data key {loader_data_key} not found")
-        return
+        return None
 
     for article in router_data['loaderData'][loader_data_key]['article_list']:
         # Extract basic data
@@ -129,7 +89,8 @@ def parse_and_save(router_data):
         ]
         item_id = hashlib.md5("_".join(filter(None, id_components)).encode()).hexdigest()
         if publish_date:
-            published_date = datetime.fromtimestamp(publish_date / 1000).replace(tzinfo=timezone.utc).isoformat()
+            # PublishDate is in epoch milliseconds
+            published_date = iso_date(publish_date / 1000)
         else:
             published_date = datetime.now(timezone.utc).isoformat()
         
@@ -180,44 +141,33 @@ def parse_and_save(router_data):
 
         article_list.append(article_data)
 
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in article_list})]
-    
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-    
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
+    return article_list
 
-    # Dump as json file using config-driven filename
-    # Map public_papers to research key in config
-    config_key = 'research' if page_type == 'public_papers' else page_type
-    try:
-        filename = output_files.get(config_key, f'bytedance_seed_{config_key}.json')
-        json_path = parsed_dir / filename
-        with open(json_path, 'w') as f:
-            json.dump(dedup_list, f, indent=4)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
 
+@register
+class ByteDanceSeedScraper(Scraper):
+    organization_key = 'bytedance'
+    name = 'ByteDance'
+    parser = 'lxml'
+    # A page without articles still replaces the previous output
+    save_empty = True
+    # The ByteDance Seed outputs have always been ASCII-escaped
+    ensure_ascii = True
+
+    def parse(self, soup, cache_filename):
+        return parse_router_data(extract_script_data(soup))
+
+    def extract(self, cache_filename, parse_only=None):
+        # Decode window._ROUTER_DATA straight from the page bytes, parsing the HTML only if it is missing
+        router_data = extract_state(cache_filename, ROUTER_DATA)
+        if router_data is not None:
+            return parse_router_data(router_data)
+        return super().extract(cache_filename, parse_only)
+
+
+def main():
+    """Parse every configured ByteDance Seed cache file"""
+    ByteDanceSeedScraper().run()
 
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing ByteDance {page_type} file: {cache_filename}")
-            router_data = extract_script_data(file_path)
-            parse_and_save(router_data)
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
\ No newline at end of file
+    main()
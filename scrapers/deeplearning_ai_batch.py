@@ -1,82 +1,11 @@
 import json
-from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
 import re
-from dateutil import parser as date_parser
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find DeepLearning AI configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'deeplearning_ai':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("DeepLearning AI configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
-
-def parse_date(date_str):
-    """Parse date string to ISO format"""
-    if not date_str:
-        return None
-    
-    # Clean up the date string
-    date_str = date_str.strip()
-    
-    try:
-        # Try parsing with dateutil which handles various formats
-        dt = date_parser.parse(date_str)
-        # Ensure timezone info is present
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.isoformat()
-    except (ValueError, TypeError):
-        pass
-    
-    # Try specific format for the batch dates (ISO format with timezone)
-    try:
-        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        return dt.isoformat()
-    except ValueError:
-        pass
-    
-    logging.warning(f"Could not parse date: '{date_str}'")
-    return None
+from core.dates import iso_date, parse_dates
+from core.embedded_state import extract_state, NEXT_DATA
+from scrapers.base import Scraper, register
 
 def extract_date_from_tag(tags):
     """Extract date from tags list"""
@@ -87,25 +16,29 @@ def extract_date_from_tag(tags):
         tag_name = tag.get('name', '')
         # Check if tag looks like a date (e.g., "Mar 06, 2026" or "February 27, 2026")
         if re.match(r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}$', tag_name, re.IGNORECASE):
-            return parse_date(tag_name)
+            return iso_date(tag_name, default=None)
     
     return None
 
 def extract_posts(soup):
     """Extract posts from the Next.js data"""
-    posts = []
-    
     # Find the __NEXT_DATA__ script
     next_data_script = soup.find('script', id='__NEXT_DATA__')
     if not next_data_script:
         logging.error("Could not find __NEXT_DATA__ script")
-        return posts
+        return []
     
     try:
         data = json.loads(next_data_script.string)
     except json.JSONDecodeError as e:
         logging.error(f"Failed to parse JSON: {e}")
-        return posts
+        return []
+    
+    return extract_posts_from_data(data)
+
+def extract_posts_from_data(data):
+    """Extract posts from the decoded __NEXT_DATA__ object"""
+    posts = []
     
     # Navigate to the posts
     try:
@@ -115,17 +48,18 @@ def extract_posts(soup):
         logging.error(f"Failed to navigate to posts: {e}")
         return posts
     
-    for post_data in posts_data:
+    # Parse the whole published_at column at once
+    published_dates = parse_dates((post_data.get('published_at') if isinstance(post_data, dict) else None for post_data in posts_data), default=None)
+    
+    for post_data, published in zip(posts_data, published_dates):
         try:
             title = post_data.get('title', '')
             slug = post_data.get('slug', '')
             feature_image = post_data.get('feature_image', '')
             custom_excerpt = post_data.get('custom_excerpt', '')
-            published_at = post_data.get('published_at', '')
             tags = post_data.get('tags', [])
             
-            # Parse the date
-            published_date = parse_date(published_at)
+            published_date = published.isoformat() if published else None
             if not published_date:
                 # Try to extract from tags
                 published_date = extract_date_from_tag(tags)
@@ -178,41 +112,29 @@ def extract_posts(soup):
     
     return posts
 
+@register
+class DeepLearningAIScraper(Scraper):
+    organization_key = 'deeplearning_ai'
+    name = 'DeepLearning AI'
+    parser = 'lxml'
+    # An empty page still replaces the previous output
+    save_empty = True
+    indent = 2
+
+    def parse(self, soup, cache_filename):
+        return extract_posts(soup)
+
+    def extract(self, cache_filename, parse_only=None):
+        # Read __NEXT_DATA__ straight from the page bytes, parsing the HTML only if it is missing
+        next_data = extract_state(cache_filename, NEXT_DATA)
+        if next_data is not None:
+            return extract_posts_from_data(next_data)
+        return super().extract(cache_filename, parse_only)
+
+
 def main():
-    """Main function to run the scraper"""
-    logging.info("Starting DeepLearning AI The Batch scraper...")
-    
-    # Load configuration
-    config = load_config()
-    output_filename = config['output_files'].get('main', 'deeplearning_ai_batch.json')
-    cache_filename = config['cache_files'].get('main', 'deeplearning_ai_batch.html')
-    
-    logging.info(f"Output file: {output_filename}")
-    logging.info(f"Cache file: {cache_filename}")
-    
-    # Load HTML
-    soup = load_html(cache_filename)
-    if not soup:
-        logging.error("Failed to load HTML")
-        return
-    
-    # Extract posts
-    posts = extract_posts(soup)
-    
-    if not posts:
-        logging.warning("No posts found")
-        # Save empty array to maintain consistency
-        posts = []
-    
-    # Sort posts by published_date descending
-    posts.sort(key=lambda x: x.get('published_date', ''), reverse=True)
-    
-    # Save to JSON
-    output_path = parsed_dir / output_filename
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(posts, f, indent=2, ensure_ascii=False)
-    
-    logging.info(f"Saved {len(posts)} posts to {output_path}")
+    """Parse the configured DeepLearning AI The Batch page"""
+    DeepLearningAIScraper().run()
 
 if __name__ == '__main__':
     main()
@@ -1,54 +1,10 @@
-import json
-from bs4 import BeautifulSoup
 import os
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
 import re
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-
-    # Find DeepSeek configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'deepseek':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-
-    raise ValueError("DeepSeek configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
+from core.dates import parse_date
+from scrapers.base import Scraper, register
 
 def extract_news_links(soup):
     """Extract all news article links from the main page"""
@@ -118,15 +74,9 @@ def parse_date_from_url(url_path):
 def parse_date_from_title(title):
     """Parse date from title like 'DeepSeek V3.1 更新 2025/09/22'"""
     # Look for date pattern YYYY/MM/DD
-    match = re.search(r'(\d{4})/(\d{1,2})/(\d{1,2})', title)
+    match = re.search(r'\d{4}/\d{1,2}/\d{1,2}', title)
     if match:
-        try:
-            year = int(match.group(1))
-            month = int(match.group(2))
-            day = int(match.group(3))
-            return datetime(year, month, day, tzinfo=timezone.utc)
-        except ValueError:
-            pass
+        return parse_date(match.group(0), default=None)
 
     return None
 
@@ -186,59 +136,23 @@ def parse_deepseek_html(soup):
         article = create_article_from_link(news_item)
         articles.append(article)
 
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in articles})]
-
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-
-    logging.info(f"Successfully parsed {len(dedup_list)} unique articles")
-    return dedup_list
-
-def save_to_json(articles, filename):
-    """Save articles to JSON file"""
-    try:
-        config = load_config()
-        output_files = config['output_files']
-
-        # Determine the output filename based on the cache filename
-        if 'main' in filename:
-            page_type = 'main'
-        else:
-            page_type = 'main'  # default
-
-        output_filename = output_files.get(page_type, 'deepseek_news.json')
-        json_path = parsed_dir / output_filename
-
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=4, ensure_ascii=False)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
+    logging.info(f"Successfully parsed {len(articles)} articles")
+    return articles
+
+
+@register
+class DeepSeekScraper(Scraper):
+    organization_key = 'deepseek'
+    name = 'DeepSeek'
+    parser = 'html.parser'
+
+    def parse(self, soup, cache_filename):
+        return parse_deepseek_html(soup)
+
+
+def main():
+    """Parse every configured DeepSeek cache file"""
+    DeepSeekScraper().run()
 
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing DeepSeek {page_type} file: {cache_filename}")
-            soup = load_html(cache_filename)
-            articles = parse_deepseek_html(soup)
-            if articles:
-                save_to_json(articles, cache_filename)
-            else:
-                logging.error("No articles to save")
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
\ No newline at end of file
+    main()
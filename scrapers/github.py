@@ -1,139 +1,108 @@
-import json
-from bs4 import BeautifulSoup
-import os
-from pathlib import Path
+import asyncio
 import logging
 from datetime import datetime, timezone
 import hashlib
 import re
-from curl_cffi import requests
+from core import cassette
+from core.rate_limit import limiter
 import xml.etree.ElementTree as ET
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-
-    # Find GitHub configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'github':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-
-    raise ValueError("GitHub configuration not found in sites_config.json")
-
-def fetch_latest_release_date(repo_path):
-    """Fetch the latest release date from GitHub releases atom feed"""
+from core.manifest import input_digest, is_unchanged, mark_processed
+from core.snapshots import snapshot_exists
+from bs4 import SoupStrainer
+from core.html_parser import has_class
+from scrapers.base import Scraper, register, dedup_items
+
+# The only part of a trending page the extractor reads
+PARSE_ONLY = SoupStrainer('article', class_=has_class('Box-row'))
+
+# A repository's release/commit feeds, which draw from their own rate limiter
+# bucket (core.rate_limit.PATH_LIMITS) rather than the trending pages' github.com one
+FEED_URL = 'https://github.com/{repo_path}/{feed}.atom'
+ATOM_NAMESPACE = {'atom': 'http://www.w3.org/2005/Atom'}
+
+async def fetch_latest_feed_date(session, repo_path, feed):
+    """Fetch the updated date of the first entry of a repository's releases or commits atom feed"""
     try:
-        releases_url = f"https://github.com/{repo_path}/releases.atom"
-        response = requests.get(releases_url, timeout=10)
+        feed_url = FEED_URL.format(repo_path=repo_path, feed=feed)
+        response = await session.get(feed_url, timeout=10)
         response.raise_for_status()
 
         # Parse the atom feed
         root = ET.fromstring(response.content)
 
-        # Find the first entry (latest release)
-        namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-        entries = root.findall('atom:entry', namespace)
+        # Find the first entry (latest release or commit)
+        entries = root.findall('atom:entry', ATOM_NAMESPACE)
 
         if entries:
             # Get the updated date of the first entry
-            updated_elem = entries[0].find('atom:updated', namespace)
+            updated_elem = entries[0].find('atom:updated', ATOM_NAMESPACE)
             if updated_elem is not None:
                 return updated_elem.text
 
     except Exception as e:
-        logging.debug(f"Failed to fetch release date for {repo_path}: {e}")
+        logging.debug(f"Failed to fetch {feed} date for {repo_path}: {e}")
 
     return None
 
-def fetch_latest_commit_date(repo_path):
-    """Fetch the latest commit date from GitHub commits atom feed"""
-    try:
-        commits_url = f"https://github.com/{repo_path}/commits.atom"
-        response = requests.get(commits_url, timeout=10)
-        response.raise_for_status()
-
-        # Parse the atom feed
-        root = ET.fromstring(response.content)
-
-        # Find the first entry (latest commit)
-        namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-        entries = root.findall('atom:entry', namespace)
-
-        if entries:
-            # Get the updated date of the first entry
-            updated_elem = entries[0].find('atom:updated', namespace)
-            if updated_elem is not None:
-                return updated_elem.text
-
-    except Exception as e:
-        logging.debug(f"Failed to fetch commit date for {repo_path}: {e}")
-
-    return None
-
-def get_repo_date(repo_path):
+async def get_repo_date(session, repo_path):
     """Get the latest release date, fallback to latest commit date"""
-    # Try to get latest release date first
-    release_date = fetch_latest_release_date(repo_path)
-    if release_date:
-        return release_date
-
-    # Fallback to latest commit date
-    commit_date = fetch_latest_commit_date(repo_path)
-    if commit_date:
-        return commit_date
-
-    # Final fallback to current time
-    return datetime.now(timezone.utc).isoformat()
-
-def load_html(filename):
-    file_path = html_dir / filename
-    # Read the HTML file
+    # The first useful answer in priority order wins: a release date, else the commit
+    # date. While the feeds' bucket has tokens to spare, both feeds are requested
+    # together and a release date cancels the commit request still in flight. Once
+    # the budget binds, a speculative commit request would delay a needed one, so
+    # it is sent only when there is no release.
+    commits = None
+    if limiter.available(FEED_URL) >= 2:
+        commits = asyncio.create_task(fetch_latest_feed_date(session, repo_path, 'commits'))
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    # Parse the HTML content
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
+        release_date = await fetch_latest_feed_date(session, repo_path, 'releases')
+        if release_date:
+            return release_date
+        return await (commits or fetch_latest_feed_date(session, repo_path, 'commits'))
+    finally:
+        if commits:
+            commits.cancel()
+
+async def enrich_repo_dates(repositories, max_concurrent=None):
+    """Set published_date to each repository's latest release or commit date, looking every repo up once"""
+    repositories_by_path = {}
+    for repository in repositories:
+        repositories_by_path.setdefault(repository['metadata']['repo_path'], []).append(repository)
+
+    # Each lookup sends two requests; more in flight than the feeds' bucket lets
+    # through back to back would only queue for tokens
+    max_concurrent = max_concurrent or max(1, limiter.burst(FEED_URL) // 2)
+    semaphore = asyncio.Semaphore(max_concurrent)
+    async with cassette.open_session("github", max_clients=2 * max_concurrent) as session:
+        async def lookup(repo_path):
+            async with semaphore:
+                return await get_repo_date(session, repo_path)
+
+        repo_dates = await asyncio.gather(*[lookup(repo_path) for repo_path in repositories_by_path])
+
+    for same_repositories, repo_date in zip(repositories_by_path.values(), repo_dates):
+        # Final fallback to current time
+        repo_date = repo_date or datetime.now(timezone.utc).isoformat()
+        for repository in same_repositories:
+            repository['published_date'] = repo_date
+    logging.info(f"Looked up dates of {len(repositories_by_path)} repositories")
 
 def extract_trending_data(soup, timeframe='monthly'):
     """Extract trending repositories from GitHub trending page"""
     repositories = []
     base_url = 'https://github.com'
 
-    # Find repository articles
-    repo_articles = soup.find_all('article', class_='Box-row')
+    # Find repository articles (CSS selectors only, so the selectolax backend can run this)
+    repo_articles = soup.select('article.Box-row')
 
     for article in repo_articles:
         try:
             # Extract repository name and URL
-            title_element = article.find('h2', class_='h3 lh-condensed')
+            title_element = article.select_one('h2.h3.lh-condensed')
             if not title_element:
                 continue
 
-            repo_link = title_element.find('a')
+            repo_link = title_element.select_one('a')
             if not repo_link:
                 continue
 
@@ -150,15 +119,15 @@ def extract_trending_data(soup, timeframe='monthly'):
                 formatted_title = repo_name
 
             # Extract description
-            description_element = article.find('p', class_='col-9 color-fg-muted my-1 tmp-pr-4')
+            description_element = article.select_one('p.col-9.color-fg-muted.my-1.tmp-pr-4')
             description = description_element.get_text(strip=True) if description_element else ''
 
             # Extract programming language
-            language_element = article.find('span', itemprop='programmingLanguage')
+            language_element = article.select_one('span[itemprop="programmingLanguage"]')
             language = language_element.get_text(strip=True) if language_element else ''
 
             # Extract stars count
-            stars_element = article.find('a', href=re.compile(r'/stargazers$'))
+            stars_element = article.select_one('a[href$="/stargazers"]')
             stars_text = stars_element.get_text(strip=True) if stars_element else '0'
             # Clean stars text (remove commas and convert k to thousands)
             stars_clean = stars_text.replace(',', '')
@@ -175,7 +144,7 @@ def extract_trending_data(soup, timeframe='monthly'):
                     stars_count = 0
 
             # Extract forks count
-            forks_element = article.find('a', href=re.compile(r'/forks$'))
+            forks_element = article.select_one('a[href$="/forks"]')
             forks_text = forks_element.get_text(strip=True) if forks_element else '0'
             # Clean forks text
             forks_clean = forks_text.replace(',', '')
@@ -192,7 +161,7 @@ def extract_trending_data(soup, timeframe='monthly'):
                     forks_count = 0
 
             # Extract stars today (trending metric)
-            stars_today_element = article.find('span', class_='d-inline-block float-sm-right')
+            stars_today_element = article.select_one('span.d-inline-block.float-sm-right')
             stars_today_text = stars_today_element.get_text(strip=True) if stars_today_element else '0 stars today'
             # Extract number from "X stars today" text
             stars_today_match = re.search(r'(\d+(?:,\d+)*)', stars_today_text)
@@ -201,9 +170,6 @@ def extract_trending_data(soup, timeframe='monthly'):
             # Generate unique ID based on repository path (stable across updates)
             item_id = hashlib.md5(f"github_trending_{repo_path}".encode()).hexdigest()
 
-            # Get the latest release or commit date for this repository
-            repo_date = get_repo_date(repo_path)
-
             repository = {
                 'id': item_id,
                 'source': 'github',
@@ -211,7 +177,8 @@ def extract_trending_data(soup, timeframe='monthly'):
                 'title': formatted_title,
                 'description': description,
                 'url': repo_url,
-                'published_date': repo_date,
+                # Filled in by enrich_repo_dates, parsing makes no requests
+                'published_date': None,
                 'categories': [language] if language else [],
                 'metadata': {
                     'stars': stars_count,
@@ -233,71 +200,114 @@ def extract_trending_data(soup, timeframe='monthly'):
 
 def deduplicate_repositories(all_repositories):
     """Deduplicate repositories by repo_path, keeping the one with highest stars_today"""
-    repo_dict = {}
-
-    for repo in all_repositories:
-        repo_path = repo['metadata']['repo_path']
-
-        # If this repo path hasn't been seen or has higher stars_today, keep it
-        if (repo_path not in repo_dict or
-            repo['metadata']['stars_today'] > repo_dict[repo_path]['metadata']['stars_today']):
-            repo_dict[repo_path] = repo
-
-    return list(repo_dict.values())
-
-def save_to_json(repositories, output_filename):
-    """Save repositories to JSON file"""
-    # Sort by stars_today (trending metric) in descending order
-    repositories.sort(key=lambda x: x['metadata'].get('stars_today', 0), reverse=True)
-
-    json_path = parsed_dir / output_filename
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(repositories, f, ensure_ascii=False, indent=2)
-
-    logging.info(f"Successfully saved {len(repositories)} trending repositories to {json_path}")
-
-if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    output_files = config['output_files']
-
-    all_repositories = []
-    timeframes = ['daily', 'weekly', 'monthly']
-
-    # Process each timeframe
-    for timeframe in timeframes:
-        cache_key = f'trending?since={timeframe}'
-        cache_filename = cache_files.get(cache_key)
-        individual_output = output_files.get(cache_key)
-
-        if not cache_filename:
-            logging.warning(f"No cache file configured for {cache_key}")
-            continue
+    # Keep the one with higher stars_today, the first seen on a tie
+    return dedup_items(
+        all_repositories,
+        key=lambda repo: repo['metadata']['repo_path'],
+        merge=lambda kept, repo: repo if repo['metadata']['stars_today'] > kept['metadata']['stars_today'] else kept,
+    )
+
+@register
+class GitHubScraper(Scraper):
+    organization_key = 'github'
+    name = 'GitHub'
+    parser = 'selectolax'
+    parse_only = PARSE_ONLY
+    indent = 2
+
+    def parse(self, soup, cache_filename):
+        cache_key = next(key for key, name in self.config['cache_files'].items() if name == cache_filename)
+        return extract_trending_data(soup, cache_key.split('since=')[-1])
+
+    def finalize(self, items, page_type):
+        # Sort by stars_today (trending metric) in descending order
+        return sorted(items, key=lambda x: x['metadata'].get('stars_today', 0), reverse=True)
+
+    def parse_pages(self):
+        """
+        Parses every trending timeframe, without sending any request.
+
+        The pipeline runs this in a worker process and passes the result to
+        send_requests on its own event loop.
+
+        Returns:
+            dict: The input 'digest' and the parsed 'repositories' per timeframe,
+            or None if no timeframe changed or no repositories were found.
+        """
+        cache_files = self.config['cache_files']
+        output_files = self.config['output_files']
+
+        repositories_by_key = {}
+        timeframes = ['daily', 'weekly', 'monthly']
+
+        # The combined feed depends on every timeframe, so skip only if none changed
+        trending_cache_files = [cache_files[f'trending?since={tf}'] for tf in timeframes if cache_files.get(f'trending?since={tf}')]
+        trending_outputs = [self.output_path(key) for key in output_files]
+        digest = input_digest(trending_cache_files, self.code_paths())
+        if is_unchanged('github', 'trending', digest, trending_outputs):
+            logging.info("Skipping unchanged GitHub trending files")
+            return None
+
+        # Process each timeframe
+        for timeframe in timeframes:
+            cache_key = f'trending?since={timeframe}'
+            cache_filename = cache_files.get(cache_key)
+
+            if not cache_filename:
+                logging.warning(f"No cache file configured for {cache_key}")
+                continue
 
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing GitHub trending file: {cache_filename}")
-            soup = load_html(cache_filename)
-            if soup:
-                repositories = extract_trending_data(soup, timeframe)
-                all_repositories.extend(repositories)
-
-                # Save individual timeframe file
-                if individual_output:
-                    save_to_json(repositories, individual_output)
+            if snapshot_exists(cache_filename):
+                logging.info(f"Processing GitHub trending file: {cache_filename}")
+                repositories = self.load_items(cache_filename)
+                if repositories is not None:
+                    repositories_by_key[cache_key] = repositories
+                else:
+                    logging.error(f"Failed to load HTML content for {cache_filename}")
             else:
-                logging.error(f"Failed to load HTML content for {cache_filename}")
-        else:
-            logging.warning(f"Cache file not found: {cache_filename}")
-
-    # Deduplicate and save combined results
-    if all_repositories:
+                logging.warning(f"Cache file not found: {cache_filename}")
+
+        if not any(repositories_by_key.values()):
+            logging.error("No repositories found to process")
+            return None
+        return {'digest': digest, 'repositories': repositories_by_key}
+
+    async def send_requests(self, parsed):
+        """Look up the dates of the parsed repositories, then save individual and combined results"""
+        if parsed is None:
+            return
+        repositories_by_key = parsed['repositories']
+        all_repositories = [repository for repositories in repositories_by_key.values() for repository in repositories]
+
+        # One lookup stage for every timeframe, repositories trending in several are looked up once
+        await enrich_repo_dates(all_repositories)
+        await asyncio.to_thread(self.save_trending, repositories_by_key, all_repositories, parsed['digest'])
+
+    def save_trending(self, repositories_by_key, all_repositories, digest):
+        """Save individual timeframe files and the deduplicated combined file"""
+        output_files = self.config['output_files']
+        for cache_key, repositories in repositories_by_key.items():
+            if cache_key in output_files:
+                self.save(self.finalize(repositories, cache_key), cache_key)
+
+        # Deduplicate and save combined results
         logging.info(f"Found {len(all_repositories)} total repositories before deduplication")
         deduplicated_repositories = deduplicate_repositories(all_repositories)
         logging.info(f"After deduplication: {len(deduplicated_repositories)} repositories")
 
         # Save combined deduplicated results
-        combined_output = output_files.get('trending_combined', 'github_trends.json')
-        save_to_json(deduplicated_repositories, combined_output)
-    else:
-        logging.error("No repositories found to process")
\ No newline at end of file
+        self.save(self.finalize(deduplicated_repositories, 'trending_combined'), 'trending_combined')
+        mark_processed('github', 'trending', digest, [self.output_path(key) for key in output_files])
+
+    async def run(self):
+        """Parse all trending timeframes, look up the repositories' dates, then save individual and combined results"""
+        await self.send_requests(self.parse_pages())
+
+
+async def main():
+    """Parse all trending timeframes and save individual and combined results"""
+    await GitHubScraper().run()
+
+if __name__ == "__main__":
+    cassette.apply_cli_flags()
+    asyncio.run(main())
@@ -1,38 +1,13 @@
-import json
 import asyncio
-from curl_cffi.requests import AsyncSession
-from pathlib import Path
+from core.cassette import open_session, apply_cli_flags
 import logging
 from datetime import datetime, timezone
 import hashlib
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory setup
-project_dir = Path(__file__).resolve().parent.parent
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find Hacker News configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'hackernews':
-            return {
-                'output_files': site.get('output_files', {})
-            }
-    
-    raise ValueError("Hacker News configuration not found in sites_config.json")
+from scrapers.base import BaseScraper, register
 
 async def fetch_best_stories(limit=50):
     """Fetch best stories from Hacker News API"""
-    async with AsyncSession() as session:
+    async with open_session("hackernews") as session:
         try:
             # Get list of best story IDs
             response = await session.get('https://hacker-news.firebaseio.com/v0/beststories.json', impersonate="chrome120", timeout=10)
@@ -82,21 +57,29 @@ async def fetch_best_stories(limit=50):
             logging.error(f"Failed to fetch best stories: {e}")
             return []
 
+@register
+class HackerNewsScraper(BaseScraper):
+    organization_key = 'hackernews'
+    name = 'Hacker News'
+    indent = 2
+
+    async def send_requests(self, parsed=None):
+        """Fetch and save Hacker News best stories"""
+        logging.info("Fetching Hacker News best stories...")
+        stories = await fetch_best_stories()
+
+        if stories:
+            await asyncio.to_thread(self.save, stories, 'beststories')
+        else:
+            logging.error("No stories were fetched")
+
+    async def run(self):
+        await self.send_requests()
+
 async def main():
     """Main function to fetch and save Hacker News best stories"""
-    config = load_config()
-    
-    logging.info("Fetching Hacker News best stories...")
-    stories = await fetch_best_stories()
-    
-    if stories:
-        output_file = parsed_dir / config['output_files']['beststories']
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(stories, f, ensure_ascii=False, indent=2)
-        
-        logging.info(f"Successfully saved {len(stories)} stories to {output_file}")
-    else:
-        logging.error("No stories were fetched")
+    await HackerNewsScraper().run()
 
 if __name__ == "__main__":
+    apply_cli_flags()
     asyncio.run(main())
\ No newline at end of file
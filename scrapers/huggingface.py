@@ -1,38 +1,13 @@
-import json
 import asyncio
-from curl_cffi.requests import AsyncSession
-from pathlib import Path
+from core.cassette import open_session, apply_cli_flags
 import logging
 from datetime import datetime, timezone, timedelta
 import hashlib
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory setup
-project_dir = Path(__file__).resolve().parent.parent
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-
-    # Find Hugging Face configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'huggingface':
-            return {
-                'output_files': site.get('output_files', {})
-            }
-
-    raise ValueError("Hugging Face configuration not found in sites_config.json")
+from scrapers.base import BaseScraper, register
 
 async def fetch_trending_items(item_type='model', limit=20):
     """Fetch trending models or datasets from Hugging Face API"""
-    async with AsyncSession() as session:
+    async with open_session("huggingface") as session:
         try:
             # Fetch trending items using the trending API
             params = {
@@ -116,7 +91,7 @@ async def fetch_trending_items(item_type='model', limit=20):
 
 async def fetch_daily_papers():
     """Fetch daily papers from the last 30 days and return top papers by upvotes and GitHub stars"""
-    async with AsyncSession() as session:
+    async with open_session("huggingface") as session:
         all_papers = []
 
         # Get dates for the last 30 days starting from yesterday, but skip weekends
@@ -271,45 +246,35 @@ async def fetch_daily_papers():
 
         return formatted_papers
 
+@register
+class HuggingFaceScraper(BaseScraper):
+    organization_key = 'huggingface'
+    name = 'Hugging Face'
+    indent = 2
+
+    async def send_requests(self, parsed=None):
+        """Fetch and save Hugging Face trending models, datasets and daily papers"""
+        feeds = [
+            ('trending_models', 'trending models', lambda: fetch_trending_items('model')),
+            ('trending_datasets', 'trending datasets', lambda: fetch_trending_items('dataset')),
+            ('daily_papers', 'daily papers', fetch_daily_papers),
+        ]
+        for page_type, label, fetch in feeds:
+            logging.info(f"Fetching Hugging Face {label}...")
+            items = await fetch()
+
+            if items:
+                await asyncio.to_thread(self.save, items, page_type)
+            else:
+                logging.error(f"No {label} were fetched")
+
+    async def run(self):
+        await self.send_requests()
+
 async def main():
     """Main function to fetch and save Hugging Face trending models and datasets"""
-    config = load_config()
-
-    # Fetch trending models
-    logging.info("Fetching Hugging Face trending models...")
-    models = await fetch_trending_items('model')
-
-    if models:
-        output_file = parsed_dir / config['output_files']['trending_models']
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(models, f, ensure_ascii=False, indent=2)
-        logging.info(f"Successfully saved {len(models)} models to {output_file}")
-    else:
-        logging.error("No models were fetched")
-
-    # Fetch trending datasets
-    logging.info("Fetching Hugging Face trending datasets...")
-    datasets = await fetch_trending_items('dataset')
-
-    if datasets:
-        output_file = parsed_dir / config['output_files']['trending_datasets']
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(datasets, f, ensure_ascii=False, indent=2)
-        logging.info(f"Successfully saved {len(datasets)} datasets to {output_file}")
-    else:
-        logging.error("No datasets were fetched")
-
-    # Fetch daily papers
-    logging.info("Fetching Hugging Face daily papers...")
-    papers = await fetch_daily_papers()
-
-    if papers:
-        output_file = parsed_dir / config['output_files']['daily_papers']
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(papers, f, ensure_ascii=False, indent=2)
-        logging.info(f"Successfully saved {len(papers)} papers to {output_file}")
-    else:
-        logging.error("No papers were fetched")
+    await HuggingFaceScraper().run()
 
 if __name__ == "__main__":
+    apply_cli_flags()
     asyncio.run(main())
\ No newline at end of file
@@ -1,89 +1,17 @@
-import json
-from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
 import re
+from core.dates import iso_date
+from bs4 import SoupStrainer
+from core.html_parser import parse_html, has_class
+from scrapers.base import Scraper, register, URL_KEY, KEEP_EARLIEST
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find Meta AI configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'meta':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("Meta AI configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
-
-def parse_date(date_str):
-    """Parse date string to ISO format"""
-    if not date_str:
-        return None
-    
-    # Clean up the date string
-    date_str = date_str.strip()
-    
-    # Try different date formats
-    date_formats = [
-        '%B %d, %Y',      # December 16, 2025
-        '%b %d, %Y',      # Dec 16, 2025
-        '%B %d %Y',       # December 16 2025
-        '%b %d %Y',       # Dec 16 2025
-        '%Y-%m-%d',       # 2025-12-16
-    ]
-    
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except ValueError:
-            continue
-    
-    # Try to extract date from format like "Feb 9, 2026"
-    try:
-        # Remove extra spaces and normalize
-        date_str = re.sub(r'\s+', ' ', date_str)
-        dt = datetime.strptime(date_str, '%b %d, %Y')
-        return dt.replace(tzinfo=timezone.utc).isoformat()
-    except ValueError:
-        pass
-    
-    logging.warning(f"Could not parse date: '{date_str}'")
-    return None
+# The featured post, the news cards and the noscript fallback
+PARSE_ONLY = [
+    SoupStrainer('div', class_=has_class('_metaAIFeaturedBlogHero__heroContainer', '_amda')),
+    SoupStrainer('noscript'),
+]
 
 def extract_featured_post(soup):
     """Extract the featured post from the hero section"""
@@ -114,7 +42,7 @@ def extract_featured_post(soup):
             # Extract date
             date_elem = featured_container.find('div', class_='_amun')
             date_str = date_elem.get_text(strip=True) if date_elem else None
-            published_date = parse_date(date_str)
+            published_date = iso_date(date_str, default=None)
             
             if not published_date:
                 published_date = datetime.now(timezone.utc).isoformat()
@@ -183,7 +111,7 @@ def extract_latest_news(soup):
                     date_str = text
                     break
             
-            published_date = parse_date(date_str)
+            published_date = iso_date(date_str, default=None)
             if not published_date:
                 published_date = datetime.now(timezone.utc).isoformat()
             
@@ -228,7 +156,7 @@ def extract_noscript_posts(soup):
         return posts
     
     # Parse noscript content
-    noscript_soup = BeautifulSoup(str(noscript), 'html.parser')
+    noscript_soup = parse_html(str(noscript), MetaAIScraper.parser)
     
     # Find all blog post containers in noscript
     blog_containers = noscript_soup.find_all('div', class_='_8xm7')
@@ -254,7 +182,7 @@ def extract_noscript_posts(soup):
             # Extract date
             date_elem = container.find('p', class_='_8wl0')
             date_str = date_elem.get_text(strip=True) if date_elem else None
-            published_date = parse_date(date_str)
+            published_date = iso_date(date_str, default=None)
             
             # Extract categories
             category_elems = container.find_all('h4', class_='_8xok')
@@ -316,62 +244,27 @@ def parse_meta_ai_html(soup):
         noscript_posts = extract_noscript_posts(soup)
         all_posts.extend(noscript_posts)
     
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in all_posts})]
-    
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-    
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-    
-    logging.info(f"Successfully parsed {len(dedup_list)} unique posts from Meta AI blog")
-    return dedup_list
+    logging.info(f"Successfully parsed {len(all_posts)} posts from Meta AI blog")
+    return all_posts
 
-def save_to_json(posts, filename):
-    """Save posts to JSON file"""
-    try:
-        config = load_config()
-        output_files = config['output_files']
-        
-        # Determine the output filename based on the cache filename
-        if 'news' in filename:
-            page_type = 'main'
-        else:
-            page_type = 'main'
-        
-        output_filename = output_files.get(page_type, 'meta_ai_news.json')
-        json_path = parsed_dir / output_filename
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=4, ensure_ascii=False)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
+
+@register
+class MetaAIScraper(Scraper):
+    organization_key = 'meta'
+    name = 'Meta AI'
+    parser = 'lxml'
+    parse_only = PARSE_ONLY
+    # Ids include the date, which falls back to the parse time; a post listed twice keeps its parsed date
+    dedup_key = URL_KEY
+    merge_policy = KEEP_EARLIEST
+
+    def parse(self, soup, cache_filename):
+        return parse_meta_ai_html(soup)
+
+
+def main():
+    """Parse every configured Meta AI cache file"""
+    MetaAIScraper().run()
 
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing Meta AI {page_type} file: {cache_filename}")
-            soup = load_html(cache_filename)
-            if soup:
-                posts = parse_meta_ai_html(soup)
-                if posts:
-                    save_to_json(posts, cache_filename)
-                else:
-                    logging.error("No posts to save")
-            else:
-                logging.error(f"Failed to load HTML from {cache_filename}")
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
+    main()
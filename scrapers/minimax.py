@@ -1,77 +1,8 @@
-import json
-from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
-import re
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find MiniMax configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'minimax':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("MiniMax configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
-
-def parse_date(date_str):
-    """Parse date string to ISO format"""
-    if not date_str:
-        return None
-    
-    # Clean up the date string
-    date_str = date_str.strip()
-    
-    # Try different date formats
-    date_formats = [
-        '%Y-%m-%d',       # 2026-02-12
-        '%Y/%m/%d',       # 2026/02/12
-    ]
-    
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except ValueError:
-            continue
-    
-    logging.warning(f"Could not parse date: '{date_str}'")
-    return None
+from core.dates import iso_date
+from scrapers.base import Scraper, register
 
 def parse_minimax_html(soup):
     """Parse the MiniMax release notes HTML to extract all model updates"""
@@ -98,7 +29,7 @@ def parse_minimax_html(soup):
             date_text = date_span.get_text(strip=True) if date_span else date_id
             
             # Parse the date
-            published_date = parse_date_from_text(date_text)
+            published_date = iso_date(date_text, default=None)
             
             # Find the next sibling card element
             next_elem = header.find_next_sibling()
@@ -159,129 +90,23 @@ def parse_minimax_html(soup):
             logging.warning(f"Failed to parse header/card: {e}")
             continue
     
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in posts})]
-    
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-    
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-    
-    logging.info(f"Successfully parsed {len(dedup_list)} unique posts from MiniMax release notes")
-    return dedup_list
+    logging.info(f"Successfully parsed {len(posts)} posts from MiniMax release notes")
+    return posts
 
 
-def parse_date_from_text(date_str):
-    """Parse date text like 'Mar. 2026', 'Feb. 2026', 'Jan. 16, 2026' to ISO format"""
-    if not date_str:
-        return None
-    
-    # Clean up
-    date_str = date_str.strip()
-    
-    # Try different formats
-    date_formats = [
-        '%b. %Y',        # Mar. 2026
-        '%B %Y',         # March 2026
-        '%b %d, %Y',     # Jan 16, 2026
-        '%B %d, %Y',     # January 16, 2026
-        '%b %d %Y',      # Jan 16 2026
-        '%Y-%m-%d',      # 2026-02-12
-    ]
-    
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except ValueError:
-            continue
-    
-    # Handle abbreviated months - Sept is special case
-    month_replacements = {
-        'Jan.': 'Jan', 'Feb.': 'Feb', 'Mar.': 'Mar', 'Apr.': 'Apr',
-        'May.': 'May', 'Jun.': 'Jun', 'Jul.': 'Jul', 'Aug.': 'Aug',
-        'Sept.': 'Sep', 'Sep.': 'Sep', 'Oct.': 'Oct', 'Nov.': 'Nov', 'Dec.': 'Dec'
-    }
-    
-    for old, new in month_replacements.items():
-        if old in date_str:
-            date_str = date_str.replace(old, new)
-            break
-    
-    # Try again after replacements
-    for fmt in ['%b %d, %Y', '%b %d %Y', '%b. %d, %Y', '%b. %d %Y']:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except ValueError:
-            continue
-    
-    # Try to extract just the year/month if full date fails
-    # Handle formats like "Mar. 2026" -> assume 1st of month
-    match = re.match(r'([A-Za-z]+)\.?\s+(\d{4})', date_str)
-    if match:
-        try:
-            month_str = match.group(1)
-            year = int(match.group(2))
-            month_map = {
-                'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-            }
-            month_lower = month_str.lower()[:3]
-            if month_lower in month_map:
-                dt = datetime(year, month_map[month_lower], 1, tzinfo=timezone.utc)
-                return dt.isoformat()
-        except:
-            pass
-    
-    logging.warning(f"Could not parse date: '{date_str}'")
-    return None
+@register
+class MiniMaxScraper(Scraper):
+    organization_key = 'minimax'
+    name = 'MiniMax'
+    parser = 'html.parser'
+
+    def parse(self, soup, cache_filename):
+        return parse_minimax_html(soup)
 
-def save_to_json(posts, filename):
-    """Save posts to JSON file"""
-    try:
-        config = load_config()
-        output_files = config['output_files']
-        
-        # Determine the output filename based on the cache filename
-        if 'models' in filename or 'blog' in filename:
-            page_type = 'models'
-        else:
-            page_type = 'main'
-        
-        output_filename = output_files.get(page_type, 'minimax_blog.json')
-        json_path = parsed_dir / output_filename
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=4, ensure_ascii=False)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
+
+def main():
+    """Parse every configured MiniMax cache file"""
+    MiniMaxScraper().run()
 
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing MiniMax {page_type} file: {cache_filename}")
-            soup = load_html(cache_filename)
-            if soup:
-                posts = parse_minimax_html(soup)
-                if posts:
-                    save_to_json(posts, cache_filename)
-                else:
-                    logging.error("No posts to save")
-            else:
-                logging.error(f"Failed to load HTML from {cache_filename}")
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
+    main()
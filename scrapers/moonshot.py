@@ -1,79 +1,9 @@
-import json
-from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
 import re
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find Moonshot configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'moonshot':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("Moonshot configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
-
-def parse_date(date_str):
-    """Parse date string to ISO format"""
-    if not date_str:
-        return None
-    
-    # Clean up the date string
-    date_str = date_str.strip()
-    
-    # Try different date formats
-    date_formats = [
-        '%Y-%m-%d',       # 2025-12-31
-        '%Y/%m/%d',       # 2025/12/31
-        '%B %d, %Y',      # December 31, 2025
-        '%b %d, %Y',      # Dec 31, 2025
-    ]
-    
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except ValueError:
-            continue
-    
-    logging.warning(f"Could not parse date: '{date_str}'")
-    return None
+from core.dates import iso_date
+from scrapers.base import Scraper, register, URL_KEY, KEEP_EARLIEST
 
 def parse_moonshot_html(soup):
     """Parse the Moonshot blog HTML to extract all blog posts"""
@@ -120,18 +50,10 @@ def parse_moonshot_html(soup):
             time_elem = item.find('time')
             published_date = None
             if time_elem:
-                date_str = time_elem.get('datetime', '')
-                if date_str:
-                    # Parse ISO format date
-                    try:
-                        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                        published_date = dt.isoformat()
-                    except:
-                        pass
-                
+                # The datetime attribute, else the displayed date
+                published_date = iso_date(time_elem.get('datetime'), default=None)
                 if not published_date:
-                    date_str = time_elem.get_text(strip=True)
-                    published_date = parse_date(date_str)
+                    published_date = iso_date(time_elem.get_text(strip=True), default=None)
             
             if not published_date:
                 published_date = datetime.now(timezone.utc).isoformat()
@@ -167,62 +89,26 @@ def parse_moonshot_html(soup):
             logging.warning(f"Failed to parse post item: {e}")
             continue
     
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in posts})]
-    
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-    
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-    
-    logging.info(f"Successfully parsed {len(dedup_list)} unique posts from Moonshot blog")
-    return dedup_list
+    logging.info(f"Successfully parsed {len(posts)} posts from Moonshot blog")
+    return posts
 
-def save_to_json(posts, filename):
-    """Save posts to JSON file"""
-    try:
-        config = load_config()
-        output_files = config['output_files']
-        
-        # Determine the output filename based on the cache filename
-        if 'blog' in filename:
-            page_type = 'blog'
-        else:
-            page_type = 'main'
-        
-        output_filename = output_files.get(page_type, 'moonshot_blog.json')
-        json_path = parsed_dir / output_filename
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=4, ensure_ascii=False)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
+
+@register
+class MoonshotScraper(Scraper):
+    organization_key = 'moonshot'
+    name = 'Moonshot'
+    parser = 'html.parser'
+    # Ids include the date, which falls back to the parse time; a post listed twice keeps its parsed date
+    dedup_key = URL_KEY
+    merge_policy = KEEP_EARLIEST
+
+    def parse(self, soup, cache_filename):
+        return parse_moonshot_html(soup)
+
+
+def main():
+    """Parse every configured Moonshot cache file"""
+    MoonshotScraper().run()
 
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing Moonshot {page_type} file: {cache_filename}")
-            soup = load_html(cache_filename)
-            if soup:
-                posts = parse_moonshot_html(soup)
-                if posts:
-                    save_to_json(posts, cache_filename)
-                else:
-                    logging.error("No posts to save")
-            else:
-                logging.error(f"Failed to load HTML from {cache_filename}")
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
+    main()
@@ -1,99 +1,8 @@
-import json
-from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
 from datetime import datetime, timezone
 import hashlib
-import re
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Directory containing the HTML files
-project_dir = Path(__file__).resolve().parent.parent
-html_dir = project_dir / 'data' / 'html_cache'
-parsed_dir = project_dir / 'data' / 'parsed'
-config_dir = project_dir / 'config'
-# Ensure parsed directory exists
-parsed_dir.mkdir(exist_ok=True)
-
-def load_config():
-    """Load site configuration to get output filenames and cache filenames"""
-    config_file = config_dir / 'sites_config.json'
-    with open(config_file, 'r', encoding='utf-8') as f:
-        sites_config = json.load(f)
-    
-    # Find Z-AI configuration
-    for site in sites_config:
-        if site.get('organization_key') == 'z-ai':
-            return {
-                'output_files': site.get('output_files', {}),
-                'cache_files': site.get('cache_files', {})
-            }
-    
-    raise ValueError("Z-AI configuration not found in sites_config.json")
-
-def load_html(filename):
-    """Load HTML content from cache file"""
-    file_path = html_dir / filename
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        logging.error(f"File not found: {file_path}")
-        return None
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
-        return None
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    return soup
-
-def parse_date_from_text(date_str):
-    """Parse date text like 'Feb. 12, 2026', '2026-02-12' to ISO format"""
-    if not date_str:
-        return None
-    
-    # Clean up
-    date_str = date_str.strip()
-    
-    # Try to parse as YYYY-MM-DD first
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        try:
-            dt = datetime.strptime(date_str, '%Y-%m-%d')
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except:
-            pass
-    
-    # Handle abbreviated months
-    month_replacements = {
-        'Jan.': 'Jan', 'Feb.': 'Feb', 'Mar.': 'Mar', 'Apr.': 'Apr',
-        'May.': 'May', 'Jun.': 'Jun', 'Jul.': 'Jul', 'Aug.': 'Aug',
-        'Sept.': 'Sep', 'Sep.': 'Sep', 'Oct.': 'Oct', 'Nov.': 'Nov', 'Dec.': 'Dec'
-    }
-    
-    for old, new in month_replacements.items():
-        if old in date_str:
-            date_str = date_str.replace(old, new)
-            break
-    
-    # Try different formats
-    date_formats = [
-        '%b %d, %Y',     # Jan 12, 2026
-        '%B %d, %Y',     # January 12, 2026
-        '%b %d %Y',      # Jan 12 2026
-        '%b. %d, %Y',    # Jan. 12, 2026
-    ]
-    
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except ValueError:
-            continue
-    
-    logging.warning(f"Could not parse date: '{date_str}'")
-    return None
+from core.dates import iso_date
+from scrapers.base import Scraper, register
 
 def parse_z_ai_html(soup):
     """Parse the Z-AI release notes HTML to extract all model updates"""
@@ -120,7 +29,7 @@ def parse_z_ai_html(soup):
             date_text = date_label.get_text(strip=True) if date_label else date_id
             
             # Parse the date
-            published_date = parse_date_from_text(date_text)
+            published_date = iso_date(date_text, default=None)
             
             # Find the description (model name)
             model_name = ''
@@ -189,59 +98,23 @@ def parse_z_ai_html(soup):
             logging.warning(f"Failed to parse update container: {e}")
             continue
     
-    # Remove duplicates using JSON string deduplication
-    dedup_list = [json.loads(entry) for entry in list({json.dumps(d) for d in posts})]
-    
-    # Sort by published_date in reverse chronological order (newest first)
-    def get_date_for_sorting(item):
-        date_str = item.get('published_date', '')
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                pass
-        return datetime.min.replace(tzinfo=timezone.utc)
-    
-    dedup_list.sort(key=get_date_for_sorting, reverse=True)
-    
-    logging.info(f"Successfully parsed {len(dedup_list)} unique posts from Z-AI release notes")
-    return dedup_list
+    logging.info(f"Successfully parsed {len(posts)} posts from Z-AI release notes")
+    return posts
+
+
+@register
+class ZAIScraper(Scraper):
+    organization_key = 'z-ai'
+    name = 'Z-AI'
+    parser = 'html.parser'
 
-def save_to_json(posts, filename):
-    """Save posts to JSON file"""
-    try:
-        config = load_config()
-        output_files = config['output_files']
-        
-        # Determine the output filename based on the cache filename
-        page_type = 'main'  # Z-AI has 'main' in config
-        
-        output_filename = output_files.get(page_type, 'z_ai_blog.json')
-        json_path = parsed_dir / output_filename
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=4, ensure_ascii=False)
-            logging.info(f"Parsed data successfully written to '{json_path}'")
-    except IOError as e:
-        logging.error(f"Error writing to file: {e}")
+    def parse(self, soup, cache_filename):
+        return parse_z_ai_html(soup)
+
+
+def main():
+    """Parse every configured Z.ai cache file"""
+    ZAIScraper().run()
 
 if __name__ == "__main__":
-    config = load_config()
-    cache_files = config['cache_files']
-    
-    # Process each configured cache file
-    for page_type, cache_filename in cache_files.items():
-        file_path = html_dir / cache_filename
-        if file_path.exists():
-            logging.info(f"Processing Z-AI {page_type} file: {cache_filename}")
-            soup = load_html(cache_filename)
-            if soup:
-                posts = parse_z_ai_html(soup)
-                if posts:
-                    save_to_json(posts, cache_filename)
-                else:
-                    logging.error("No posts to save")
-            else:
-                logging.error(f"Failed to load HTML from {cache_filename}")
-        else:
-            logging.error(f"Required cache file not found: {cache_filename}")
+    main()
@@ -0,0 +1,15 @@
+import pytest
+from core import manifest, memo
+
+
+@pytest.fixture
+def state_dirs(tmp_path, monkeypatch):
+    """Point the manifest and the memo at a temporary directory"""
+    stages_dir = tmp_path / "state" / "stages"
+    stages_dir.mkdir(parents=True)
+    monkeypatch.setattr(manifest, "stages_dir", stages_dir)
+    monkeypatch.setattr(manifest, "manifest_file", tmp_path / "state" / "content_manifest.json")
+    monkeypatch.setattr(memo, "memo_dir", tmp_path / "memo")
+    (tmp_path / "memo").mkdir()
+    monkeypatch.delenv(manifest.FORCE_ENV_VAR, raising=False)
+    return tmp_path
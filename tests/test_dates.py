@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+
+import pytest
+from core.dates import DateParseError, iso_date, parse_date, parse_dates
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-02-12", "2026-02-12T00:00:00+00:00"),
+    ("2026-03-06 15:47:00", "2026-03-06T15:47:00+00:00"),
+    ("2026-02-12T08:30:00Z", "2026-02-12T08:30:00+00:00"),
+    ("2026-02-12T08:30:00+08:00", "2026-02-12T08:30:00+08:00"),
+    ("2026/02/12", "2026-02-12T00:00:00+00:00"),
+    ("Jan 16, 2026", "2026-01-16T00:00:00+00:00"),
+    ("January 16 2026", "2026-01-16T00:00:00+00:00"),
+    ("Sept. 5, 2025", "2025-09-05T00:00:00+00:00"),
+    ("Mar. 2026", "2026-03-01T00:00:00+00:00"),
+    ("  Jan   16,  2026 ", "2026-01-16T00:00:00+00:00"),
+    # Shapes only dateutil knows
+    ("5 September 2025", "2025-09-05T00:00:00+00:00"),
+    ("Thu, 05 Feb 2026 10:00:00 GMT", "2026-02-05T10:00:00+00:00"),
+])
+def test_absolute_shapes(value, expected):
+    assert iso_date(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("8 分钟前", "2026-10-17T11:52:00+00:00"),
+    ("3 小时前", "2026-10-17T09:00:00+00:00"),
+    ("2 天前", "2026-10-15T12:00:00+00:00"),
+    ("刚刚", "2026-10-17T12:00:00+00:00"),
+    ("昨天", "2026-10-16T12:00:00+00:00"),
+    ("前天", "2026-10-15T12:00:00+00:00"),
+    ("02-13", "2026-02-13T00:00:00+00:00"),
+])
+def test_relative_shapes(value, expected):
+    assert iso_date(value, now=NOW) == expected
+
+
+def test_datetimes_and_epoch_seconds():
+    assert parse_date(datetime(2026, 1, 2, 3, 4)) == datetime(2026, 1, 2, 3, 4, tzinfo=timezone.utc)
+    assert iso_date(1700000000) == "2023-11-14T22:13:20+00:00"
+    assert iso_date(1700000000.5) == "2023-11-14T22:13:20.500000+00:00"
+
+
+@pytest.mark.parametrize("value", [
+    # dateutil would fill the missing fields from today's date
+    "2026", "M2.5", "Tuesday", "3:45", "June",
+    "not a date", "2025-02-29", "13-45",
+])
+def test_unparseable_dates(value):
+    with pytest.raises(DateParseError):
+        parse_date(value)
+    assert parse_date(value, default=None) is None
+
+
+@pytest.mark.parametrize("value", [None, "", "   "])
+def test_missing_values_return_the_default(value):
+    assert parse_date(value, default="fallback") == "fallback"
+    with pytest.raises(DateParseError):
+        parse_date(value)
+
+
+def test_iso_date_default():
+    assert iso_date("junk", default=None) is None
+    assert iso_date(None, default="x") == "x"
+
+
+def test_parse_dates_keeps_order_and_shares_now():
+    values = ["2026-01-01", "3 小时前", "2026-01-01", None, "junk", ["unhashable"]]
+    assert parse_dates(values, default=None, now=NOW) == [
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        datetime(2026, 10, 17, 9, 0, tzinfo=timezone.utc),
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        None,
+        None,
+        None,
+    ]
+
+
+def test_parse_dates_raises_without_default():
+    with pytest.raises(DateParseError):
+        parse_dates(["2026-01-01", "junk"])
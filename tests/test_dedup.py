@@ -0,0 +1,80 @@
+import pytest
+from core.news_item import NewsItem
+from scrapers.base import (
+    KEEP_EARLIEST, KEEP_FIRST, KEEP_LAST, URL_KEY, canonical_url, date_sort_key, dedup_items, UNDATED,
+)
+
+
+def item(id=None, url=None, published_date=None, title=None):
+    return {"id": id, "url": url, "published_date": published_date, "title": title}
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://Example.com/post/", "https://example.com/post"),
+    ("HTTPS://example.com/post#comments", "https://example.com/post"),
+    ("https://example.com/post?page=2", "https://example.com/post?page=2"),
+    ("https://example.com", "https://example.com/"),
+    (" https://example.com/a/ ", "https://example.com/a"),
+    ("", None),
+    (None, None),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_dedup_by_id_keeps_first_key_order():
+    items = [item("a", title="1"), item("b", title="2"), item("a", title="3"), item("c", title="4")]
+    assert [i["title"] for i in dedup_items(items)] == ["1", "2", "4"]
+
+
+def test_dedup_keep_last_replaces_in_place():
+    items = [item("a", title="1"), item("b", title="2"), item("a", title="3")]
+    assert [i["title"] for i in dedup_items(items, merge=KEEP_LAST)] == ["3", "2"]
+
+
+def test_dedup_keep_first_is_the_default():
+    items = [item("a", title="1"), item("a", title="2")]
+    assert dedup_items(items) == dedup_items(items, merge=KEEP_FIRST) == [items[0]]
+
+
+def test_dedup_keep_earliest_prefers_dated_items():
+    items = [
+        item("a", published_date="2026-03-01T00:00:00+00:00", title="later"),
+        item("a", published_date="2026-01-01T00:00:00+00:00", title="earlier"),
+        item("a", published_date=None, title="undated"),
+        item("b", published_date=None, title="undated b"),
+        item("b", published_date="2026-02-01T00:00:00+00:00", title="dated b"),
+    ]
+    assert [i["title"] for i in dedup_items(items, merge=KEEP_EARLIEST)] == ["earlier", "dated b"]
+
+
+def test_dedup_by_canonical_url():
+    items = [
+        item("1", url="https://example.com/post/"),
+        item("2", url="https://EXAMPLE.com/post#top"),
+        item("3", url="https://example.com/other"),
+    ]
+    assert [i["id"] for i in dedup_items(items, key=URL_KEY)] == ["1", "3"]
+
+
+def test_items_without_a_key_are_all_kept_in_place():
+    items = [item(None, title="x"), item("a", title="1"), item("", title="y"), item("a", title="2"), item(None, title="z")]
+    assert [i["title"] for i in dedup_items(items)] == ["x", "1", "y", "z"]
+
+
+def test_custom_key_and_merge():
+    repos = [
+        {"path": "a/b", "stars": 5},
+        {"path": "c/d", "stars": 1},
+        {"path": "a/b", "stars": 9},
+    ]
+    kept = dedup_items(repos, key=lambda r: r["path"], merge=lambda kept, r: r if r["stars"] > kept["stars"] else kept)
+    assert kept == [{"path": "a/b", "stars": 9}, {"path": "c/d", "stars": 1}]
+
+
+def test_news_items_and_dicts_share_the_sort_key():
+    news_item = NewsItem(id="a", published_date="2026-01-01T00:00:00Z")
+    as_dict = news_item.to_dict()
+    assert date_sort_key(news_item) == date_sort_key(as_dict)
+    assert date_sort_key(NewsItem(id="b")) == UNDATED
+    assert [i.id for i in dedup_items([news_item, NewsItem(id="a", title="dup")])] == ["a"]
@@ -0,0 +1,130 @@
+from pathlib import Path
+
+import pytest
+from core import manifest
+from core.manifest import files_digest, input_digest, is_unchanged, mark_processed
+from core.memo import restore_outputs, store_outputs
+from scrapers.base import shared_code_paths
+from scrapers.deepseek import DeepSeekScraper
+
+CACHE_FILENAME = "example_news.html"
+
+
+@pytest.fixture
+def recorded_page(state_dirs, monkeypatch):
+    """A cache file the fetcher has recorded a hash for"""
+    monkeypatch.delenv("AI_NEWS_SNAPSHOT_RUN", raising=False)
+    manifest.save_manifest({CACHE_FILENAME: {"hash": "a" * 64}})
+    return CACHE_FILENAME
+
+
+def test_input_digest_changes_with_code(recorded_page, tmp_path):
+    code = tmp_path / "scraper.py"
+    code.write_text("VERSION = 1\n")
+    before = input_digest([recorded_page], [code])
+    assert input_digest([recorded_page], [code]) == before
+
+    code.write_text("VERSION = 2\n")
+    assert input_digest([recorded_page], [code]) != before
+
+
+def test_input_digest_changes_with_content(recorded_page):
+    before = input_digest([recorded_page])
+    manifest.save_manifest({recorded_page: {"hash": "b" * 64}})
+    assert input_digest([recorded_page]) != before
+
+
+def test_input_digest_of_a_missing_page(state_dirs, monkeypatch):
+    monkeypatch.setattr(manifest, "read_snapshot", lambda cache_filename: None)
+    assert input_digest(["never_fetched.html"]) is None
+
+
+def test_scraper_code_paths_cover_the_shared_modules():
+    code_paths = [Path(path) for path in DeepSeekScraper().code_paths()]
+    assert code_paths[0].name == "deepseek.py"
+    assert Path("scrapers/base.py").resolve() in [path.resolve() for path in code_paths]
+    for path in shared_code_paths:
+        assert path in code_paths
+        assert path.exists()
+
+
+def test_files_digest_changes_with_any_file(tmp_path):
+    first, second = tmp_path / "first.json", tmp_path / "second.py"
+    first.write_text("[]")
+    second.write_text("x = 1\n")
+    before = files_digest([first, second])
+    second.write_text("x = 2\n")
+    assert files_digest([first, second]) != before
+
+
+def test_mark_processed_then_skip(state_dirs, tmp_path):
+    output = tmp_path / "out.json"
+    output.write_text("[]")
+    assert not is_unchanged("example", CACHE_FILENAME, "digest-1", [output])
+
+    mark_processed("example", CACHE_FILENAME, "digest-1")
+    assert is_unchanged("example", CACHE_FILENAME, "digest-1", [output])
+    assert not is_unchanged("example", CACHE_FILENAME, "digest-2", [output])
+
+
+def test_missing_output_is_not_skipped(state_dirs, tmp_path):
+    mark_processed("example", CACHE_FILENAME, "digest-1")
+    assert not is_unchanged("example", CACHE_FILENAME, "digest-1", [tmp_path / "gone.json"])
+
+
+def test_force_disables_skips(state_dirs, tmp_path, monkeypatch):
+    output = tmp_path / "out.json"
+    output.write_text("[]")
+    mark_processed("example", CACHE_FILENAME, "digest-1")
+    monkeypatch.setenv(manifest.FORCE_ENV_VAR, "1")
+    assert not is_unchanged("example", CACHE_FILENAME, "digest-1", [output])
+
+
+def test_memo_round_trip(state_dirs, tmp_path):
+    output = tmp_path / "out.json"
+    output.write_text('[{"id": "a"}]', encoding="utf-8")
+    store_outputs("example", "digest-1", [output])
+
+    output.write_text('[{"id": "b"}]', encoding="utf-8")
+    assert not restore_outputs("example", "digest-2", [output])
+    assert output.read_text(encoding="utf-8") == '[{"id": "b"}]'
+
+    assert restore_outputs("example", "digest-1", [output])
+    assert output.read_text(encoding="utf-8") == '[{"id": "a"}]'
+
+
+def test_memo_restores_a_page_that_changed_back(state_dirs, tmp_path):
+    output = tmp_path / "out.json"
+    output.write_text("first", encoding="utf-8")
+    mark_processed("example", CACHE_FILENAME, "digest-1", [output])
+    output.write_text("second", encoding="utf-8")
+    mark_processed("example", CACHE_FILENAME, "digest-2", [output])
+
+    assert is_unchanged("example", CACHE_FILENAME, "digest-1", [output])
+    assert output.read_text(encoding="utf-8") == "first"
+    # The stage record now points at the restored input
+    assert is_unchanged("example", CACHE_FILENAME, "digest-1", [])
+
+
+def test_memo_misses_for_other_stages(state_dirs, tmp_path):
+    output = tmp_path / "out.json"
+    output.write_text("[]")
+    store_outputs("example", "digest-1", [output])
+    assert not restore_outputs("other", "digest-1", [output])
+    assert not restore_outputs("example", None, [output])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 1000])
+def test_streamed_content_hash(monkeypatch, chunk_size):
+    # Small segments, so the page spans many of them
+    monkeypatch.setattr(manifest, "NORMALIZE_SEGMENT", 64)
+    monkeypatch.setattr(manifest, "NORMALIZE_OVERLAP", 16)
+    page = "".join(f'<script nonce="n{i}">é {i}</script>' for i in range(50)).encode("utf-8") + b"\xff end"
+    hasher = manifest.ContentHasher()
+    for start in range(0, len(page), chunk_size):
+        hasher.update(page[start:start + chunk_size])
+    assert hasher.hexdigest() == manifest.content_hash(page.decode("utf-8", errors="replace"))
+
+    # Volatile tokens are blanked even where they fall on a segment boundary
+    other = page.replace(b'nonce="n', b'nonce="x')
+    assert manifest.content_hash(other.decode("utf-8", errors="replace")) == hasher.hexdigest()
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from core.rate_limit import RateLimiter, bucket_key
+from scrapers import github
+
+FEED = '<feed xmlns="http://www.w3.org/2005/Atom">{}</feed>'
+ENTRY = "<entry><updated>{}</updated></entry>"
+
+
+def test_atom_feeds_have_their_own_bucket():
+    assert bucket_key("https://github.com/org/repo/releases.atom") == "github.com/*.atom"
+    assert bucket_key("https://github.com/trending?since=daily") == "github.com"
+    assert bucket_key("github.com") == "github.com"
+    assert bucket_key("https://example.com/feed.atom") == "example.com"
+
+
+def test_available_tokens():
+    limiter = RateLimiter()
+    limiter.configure_host("example.com", rate=0.001, burst=3)
+    assert limiter.available("https://example.com/") == pytest.approx(3, abs=0.01)
+    limiter._reserve("https://example.com/")
+    assert limiter.available("https://example.com/") == pytest.approx(2, abs=0.01)
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content.encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, feeds):
+        self.feeds = feeds
+        self.requested = []
+
+    async def get(self, url, **kwargs):
+        feed = url.rsplit("/", 1)[1].split(".")[0]
+        self.requested.append(feed)
+        await asyncio.sleep(0.01 if feed == "releases" else 0.02)
+        return FakeResponse(FEED.format(self.feeds.get(feed, "")))
+
+
+@pytest.mark.parametrize("spare", [True, False])
+def test_release_date_wins(monkeypatch, spare):
+    limiter = RateLimiter()
+    limiter.configure_host("github.com/*.atom", rate=100, burst=20 if spare else 1)
+    monkeypatch.setattr(github, "limiter", limiter)
+
+    session = FakeSession({"releases": ENTRY.format("2025-02-01"), "commits": ENTRY.format("2025-03-01")})
+    assert asyncio.run(github.get_repo_date(session, "org/repo")) == "2025-02-01"
+    assert session.requested == (["releases", "commits"] if spare else ["releases"])
+
+    session = FakeSession({"commits": ENTRY.format("2025-03-01")})
+    assert asyncio.run(github.get_repo_date(session, "org/repo")) == "2025-03-01"
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+import scrapers
+from scrapers import SCRAPER_MODULES, get_scraper
+from scrapers.base import BaseScraper, Scraper
+
+
+def test_every_configured_site_has_a_scraper():
+    with open(scrapers.config_file, "r", encoding="utf-8") as f:
+        keys = [site["organization_key"] for site in json.load(f)]
+    assert list(SCRAPER_MODULES) == keys
+    for key in keys:
+        scraper = get_scraper(key)
+        assert scraper.organization_key == key
+        assert isinstance(scraper, BaseScraper)
+
+
+def test_modules_follow_the_organization_key(tmp_path, monkeypatch):
+    config_file = tmp_path / "sites_config.json"
+    config_file.write_text(json.dumps([
+        {"organization_key": "z-ai"},
+        {"organization_key": "meta", "scraper_module": "meta_ai"},
+        {"site": "https://example.com"},
+    ]))
+    monkeypatch.setattr(scrapers, "config_file", config_file)
+    assert scrapers._scraper_modules() == {"z-ai": "scrapers.z_ai", "meta": "scrapers.meta_ai"}
+
+
+def test_unknown_site():
+    with pytest.raises(KeyError):
+        get_scraper("no-such-site")
+
+
+def test_scraper_without_parse_cannot_be_instantiated():
+    class Unfinished(Scraper):
+        organization_key = "unfinished"
+
+    with pytest.raises(TypeError):
+        Unfinished()
+
+
+def test_api_scraper_needs_only_run():
+    class Api(BaseScraper):
+        organization_key = "api"
+
+        def run(self):
+            pass
+
+    assert Api().parser is None
+    with pytest.raises(TypeError):
+        type("NoRun", (BaseScraper,), {})()
@@ -0,0 +1,17 @@
+from core.session_state import DNS_TTL_SECONDS, resolve_entries
+
+NOW = 1_800_000_000
+
+
+def entry(host, address, age, port=443):
+    return {"host": host, "port": port, "address": address, "resolved_at": NOW - age}
+
+
+def test_only_fresh_lookups_are_pinned():
+    dns = {
+        "fresh.example:443": entry("fresh.example", "192.0.2.1", 60),
+        "stale.example:443": entry("stale.example", "192.0.2.2", DNS_TTL_SECONDS + 1),
+        "v6.example:443": entry("v6.example", "2001:db8::1", 60),
+        "literal:443": entry("literal", "literal", 60),
+    }
+    assert resolve_entries(dns, now=NOW) == ["fresh.example:443:192.0.2.1", "v6.example:443:[2001:db8::1]"]
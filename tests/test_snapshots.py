@@ -0,0 +1,56 @@
+import pytest
+from core import snapshots
+from core.snapshots import list_runs, prune, read_snapshot, store_blob_file, write_run_index
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """An empty snapshot store in a temporary directory"""
+    for name in ("blobs_dir", "runs_dir", "tmp_dir"):
+        path = tmp_path / name
+        path.mkdir()
+        monkeypatch.setattr(snapshots, name, path)
+    monkeypatch.setattr(snapshots, "latest_index_file", tmp_path / "latest.json")
+    monkeypatch.setattr(snapshots, "legacy_cache_dir", tmp_path / "html_cache")
+    monkeypatch.delenv(snapshots.RUN_ENV_VAR, raising=False)
+    return tmp_path
+
+
+def store_page(store, text):
+    body = store / "body.html"
+    body.write_text(text, encoding="utf-8")
+    return store_blob_file(body)
+
+
+def blob_count(store):
+    return len(list((store / "blobs_dir").glob("*/*")))
+
+
+def test_identical_pages_share_a_blob(store):
+    first, second = store_page(store, "<p>same</p>"), store_page(store, "<p>same</p>")
+    assert first["sha256"] == second["sha256"]
+    assert blob_count(store) == 1
+
+
+def test_past_runs_stay_readable(store):
+    write_run_index("20260101_000000", {"page.html": store_page(store, "old")})
+    write_run_index("20260102_000000", {"page.html": store_page(store, "new")})
+    assert read_snapshot("page.html") == "new"
+    assert read_snapshot("page.html", run_id="20260101_000000") == "old"
+
+
+def test_prune_keeps_the_newest_runs_and_their_blobs(store):
+    for day in range(1, 5):
+        write_run_index(f"202601{day:02d}_000000", {"page.html": store_page(store, f"day {day}")})
+    assert prune(max_runs=2) == 2
+    assert list_runs() == ["20260103_000000", "20260104_000000"]
+    assert blob_count(store) == 2
+    assert read_snapshot("page.html", run_id="20260103_000000") == "day 3"
+    assert read_snapshot("page.html", run_id="20260101_000000") is None
+
+
+def test_prune_keeps_blobs_latest_points_at(store):
+    write_run_index("20260101_000000", {"only_once.html": store_page(store, "rarely fetched")})
+    write_run_index("20260102_000000", {"page.html": store_page(store, "daily")})
+    prune(max_runs=1)
+    assert read_snapshot("only_once.html") == "rarely fetched"